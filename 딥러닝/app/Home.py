@@ -1,5 +1,7 @@
 import streamlit as st
+import sys
 import time
+from pathlib import Path
 import plotly.graph_objects as go
 
 # ===================== 페이지 설정 (반드시 최상단) =====================
@@ -14,6 +16,17 @@ from utils.ui import apply_base_layout, hide_sidebar
 apply_base_layout()
 hide_sidebar()
 
+# ===== 모델 워밍업 (백그라운드 스레드, 프로세스당 한 번만 시작) =====
+# app.utils.* 모듈은 프로젝트 루트(딥러닝/) 기준으로 import하므로 루트를 sys.path에 추가
+# (streamlit run app/Home.py는 app/만 추가함)
+PROJECT_ROOT = str(Path(__file__).resolve().parents[1])
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.utils.warmup import start_warmup
+
+WARMUP = start_warmup()
+
 # ------------------ CSS ------------------
 st.markdown("""
 <style>
@@ -311,6 +324,7 @@ with main2:
         # st.markdown('<div class="progress-container">', unsafe_allow_html=True)
         progress_bar = st.progress(0)
         progress_text = st.empty()
+        warmup_text = st.empty()
         st.markdown('</div>', unsafe_allow_html=True)
 
     # KPI 영역 - 4개를 한 줄로
@@ -379,6 +393,9 @@ with main2:
             unsafe_allow_html=True
         )
 
+        # ---- 모델 워밍업 진행 상황 ----
+        warmup_text.caption(WARMUP.summary())
+
         # ---- m2 KPI ----
         m2_pct = min(MAX_M2, i * (MAX_M2 / 100))
         kpi_m2.markdown(f"""
@@ -423,3 +440,21 @@ with main2:
         donut_placeholder.plotly_chart(fig, use_container_width=False)
 
         time.sleep(0.05)
+
+    # 워밍업 결과 (모델별 상태 / 단계별 소요 시간)
+    if WARMUP.tasks:
+        warmup_text.caption(WARMUP.summary())
+        with st.expander("모델 워밍업 상태"):
+            st.dataframe(
+                [
+                    {
+                        "model": f"{t['model_name']}/{t['version']}",
+                        "status": t["status"],
+                        "seconds": None if t["seconds"] is None else round(t["seconds"], 2),
+                        **{k: round(v, 3) for k, v in t["steps"].items()},
+                        "error": t["error"],
+                    }
+                    for t in WARMUP.status()["tasks"]
+                ],
+                use_container_width=True,
+            )
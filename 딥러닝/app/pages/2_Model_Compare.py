@@ -12,6 +12,7 @@ st.set_page_config(page_title="Top-K 모델 성능 비교", page_icon="⚖️",
 try:
     # 툴팁 및 UI 함수들을 한 번만 Import
     from utils.ui import apply_base_layout, hide_sidebar, top_nav, apply_tooltip_style, model_tooltip, model_ui
+    from utils.metrics import topk_metrics_matrix
     
     apply_base_layout()    # 레이아웃 적용
     hide_sidebar()         # 사이드바 숨김
@@ -19,8 +20,8 @@ try:
     apply_tooltip_style()  # 툴팁 CSS 적용
     model_ui()             # 모델 UI 스타일 적용
 
-except ImportError:
-    st.error("utils/ui.py 파일을 찾을 수 없습니다.")
+except ImportError as e:
+    st.error(f"utils 모듈을 불러올 수 없습니다 (utils/ui.py, utils/metrics.py): {e}")
     st.stop()
 
 # ==============================================================================
@@ -99,23 +100,31 @@ MODEL_CATS = {
 }
 
 # ==============================================================================
-# 4. Top-K 지표 계산 로직
+# 4. Top-K 지표 계산 로직 (모델 x K 전체 그리드를 한 번만 계산)
 # ==============================================================================
-def calculate_metrics_at_k(df, model_col, k_percent):
-    df_sorted = df.sort_values(by=model_col, ascending=False)
-    top_k_count = int(len(df) * (k_percent / 100))
-    if top_k_count < 1: top_k_count = 1
-    
-    cutoff_score = df_sorted.iloc[top_k_count - 1][model_col]
-    target_group = df_sorted.head(top_k_count)
-    
-    precision = target_group['actual'].mean()
-    captured_churners = target_group['actual'].sum()
-    total_churners = df['actual'].sum()
-    recall = captured_churners / total_churners if total_churners > 0 else 0
-    lift = precision / BASE_CHURN_RATE if BASE_CHURN_RATE > 0 else 0
-    
-    return precision, recall, lift, cutoff_score
+K_OPTIONS = [5, 10, 15, 30]
+
+@st.cache_data
+def get_topk_grid(df, k_options):
+    model_cols = [c for c in df.columns if c != 'actual']
+    grid = topk_metrics_matrix(df['actual'].to_numpy(), df[model_cols].to_numpy(), k_options)
+
+    lookup = {}
+    for i, model in enumerate(model_cols):
+        for j, k in enumerate(k_options):
+            lookup[(model, k)] = (
+                float(grid['precision'][i, j]),
+                float(grid['recall'][i, j]),
+                float(grid['lift'][i, j]),
+                float(grid['cutoff'][i, j]),
+            )
+    return lookup
+
+TOPK_GRID = get_topk_grid(df, K_OPTIONS)
+
+def calculate_metrics_at_k(model_col, k_percent):
+    # 슬라이더/셀렉트박스 변경 시 재계산 없이 조회만
+    return TOPK_GRID[(model_col, k_percent)]
 
 # ==============================================================================
 # 5. 메인 화면 구성
@@ -170,14 +179,14 @@ with compare:
         with col_s1:
             k_percent = st.select_slider(
                 "🎯 Top-K 분석 범위 설정 (%)", 
-                options=[5, 10, 15, 30],
+                options=K_OPTIONS,
                 value=5,
                 help="전략적 타겟팅 구간(5%, 10%, 15%, 30%) 중 하나를 선택하세요."
             )
             
             # 지표 계산
-            prec_a, rec_a, lift_a, cut_a = calculate_metrics_at_k(df, model_a, k_percent)
-            prec_b, rec_b, lift_b, cut_b = calculate_metrics_at_k(df, model_b, k_percent)
+            prec_a, rec_a, lift_a, cut_a = calculate_metrics_at_k(model_a, k_percent)
+            prec_b, rec_b, lift_b, cut_b = calculate_metrics_at_k(model_b, k_percent)
             
             # Cutoff 정보 표시
             st.markdown(f"""
@@ -16,6 +16,8 @@ import numpy as np
 import time
 import plotly.graph_objects as go
 
+from utils.metrics import cumulative_gain, profit_curve, top_n_order
+
 # --------------------------------------------------------------------------------
 # 1. 페이지 설정 및 스타일
 # --------------------------------------------------------------------------------
@@ -73,19 +75,34 @@ st.markdown("""
 # 2. Mock Data (가짜 데이터 생성)
 # --------------------------------------------------------------------------------
 @st.cache_data
-def get_target_users(k_percent, total_users=100000):
-    """K%에 해당하는 타겟 유저 ID 생성"""
-    count = int(total_users * (k_percent / 100))
-    
-    # ID만 있는 심플한 데이터프레임
-    df = pd.DataFrame({
-        "User_ID": [f"USER_{i:06d}" for i in range(1, count + 1)],
-        "Risk_Score": np.random.uniform(0.7, 0.99, count) # 정렬용 점수
+def get_user_scores(total_users=100000):
+    """전체 유저 이탈 점수 + 실제 이탈 여부 (Mock)"""
+    rng = np.random.default_rng(42)
+    risk = rng.uniform(0.0, 0.99, total_users)
+    return pd.DataFrame({
+        "User_ID": [f"USER_{i:06d}" for i in range(1, total_users + 1)],
+        "Risk_Score": risk,
+        "Churned": (rng.random(total_users) < risk ** 3).astype(int),
     })
-    df = df.sort_values("Risk_Score", ascending=False)
+
+
+@st.cache_data
+def get_target_users(count, total_users=100000):
+    """상위 count명 타겟 유저 추출 (전체 정렬 없이 상위 구간만 부분 선택)"""
+    df_all = get_user_scores(total_users)
+
+    idx = top_n_order(df_all["Risk_Score"].to_numpy(), count)
+    df = df_all.iloc[idx].reset_index(drop=True)
     return df, count
 
 
+@st.cache_data
+def get_gain_curve(total_users=100000):
+    """모든 cutoff의 누적 이탈자 수 (정렬 1회, 비용 파라미터가 바뀌어도 재사용)"""
+    df_all = get_user_scores(total_users)
+    return cumulative_gain(df_all["Churned"].to_numpy(), df_all["Risk_Score"].to_numpy())
+
+
 # --------------------------------------------------------------------------------
 # 3. [수정됨] 상단 컨트롤 패널 (사이드바 대신 메인 화면에 배치)
 # --------------------------------------------------------------------------------
@@ -93,20 +110,35 @@ st.title("🚀 Marketing Action Dashboard")
 st.markdown("예측된 이탈 위험군 규모를 확인하고, **쿠폰 발송** 또는 **리스트 다운로드**를 수행하세요.")
 
 # 깔끔한 박스 안에 설정 기능을 넣습니다.
+gain = get_gain_curve()
+total_users = gain["n_total"]
+
 with st.container(border=True):
-    col_set1, col_set2 = st.columns([1, 2])
+    col_set1, col_set2, col_set3 = st.columns([1, 1.3, 2])
     
     # [왼쪽] 모델 정보 (고정)
     with col_set1:
         st.markdown("##### ⚙️ Model Setting")
         st.info("✅ 적용 모델: **LightGBM (Best)**")
+
+    # [가운데] 비용/가치 가정 → 기대 순이익 최대 K 계산
+    with col_set2:
+        st.markdown("##### 💰 Profit Setting")
+        coupon_cost = st.number_input("쿠폰 1인당 비용 (원)", min_value=0, value=3000, step=500)
+        retained_value = st.number_input("이탈 방어 고객 1명 가치 (원)", min_value=0, value=50000, step=5000)
+        save_rate = st.slider("쿠폰 방어율 (%)", min_value=1, max_value=100, value=15) / 100
+
+    profit = profit_curve(
+        coupon_cost=coupon_cost, retained_value=retained_value, save_rate=save_rate, gain=gain
+    )
         
     # [오른쪽] 타겟 범위 선택 (셀렉트 박스로 변경!)
-    with col_set2:
+    with col_set3:
         st.markdown("##### 🎯 Targeting Scope")
         
         # 슬라이더 대신 셀렉트 박스 사용 (옵션 미리 정의)
         target_options = {
+            "best": f"이익 최대 구간 (상위 {profit['best_k_pct']:.1f}% - 추천)",
             5:  "상위 5% (핵심 집중 관리 - 고효율)",
             10: "상위 10% (이탈 위험군 - 권장)",
             15: "상위 15% (잠재 위험군 - 적극 방어)",
@@ -114,29 +146,34 @@ with st.container(border=True):
             30: "상위 30% (최대 범위)"
         }
         
-        # 선택된 Key값(5, 10...)을 k_percent로 받음
-        k_percent = st.selectbox(
+        # 선택된 Key값("best", 5, 10...)을 받음
+        k_choice = st.selectbox(
             "이탈 위험군 타겟 범위를 선택하세요:",
-            options=list(target_options.keys()), # [5, 10, 15, 20, 30]
+            options=list(target_options.keys()), # ["best", 5, 10, 15, 20, 30]
             format_func=lambda x: target_options[x], # 화면에는 설명 텍스트 표시
-            index=1 # 기본값: 10%
+            index=0 # 기본값: 이익 최대 구간
         )
 
 # --------------------------------------------------------------------------------
 # 4. 메인 화면 (KPI Dashboard) - 로직은 그대로 연결됨
 # --------------------------------------------------------------------------------
 
-# 데이터 계산 (위에서 선택한 k_percent가 여기로 들어갑니다)
-target_df, target_count = get_target_users(k_percent)
-lift_value = 4.2 - (k_percent * 0.1) 
-
-st.write("") 
-
+# 데이터 계산 (위에서 선택한 구간이 여기로 들어갑니다)
+if k_choice == "best":
+    target_n = profit["best_n"]
+else:
+    target_n = max(int(total_users * (k_choice / 100)), 1)
+k_percent = round(target_n / total_users * 100, 1)
 
+target_df, target_count = get_target_users(target_n)
 
-# 데이터 계산
-target_df, target_count = get_target_users(k_percent)
-lift_value = 4.2 - (k_percent * 0.1) # 가짜 Lift (범위 넓어지면 효율 떨어짐)
+# 실제 누적 이탈자 수 기반 Lift / 방어 기대 인원 / 기대 순이익
+if target_count > 0:
+    captured = int(gain["tp"][target_count - 1])
+    lift_value = (captured / target_count) / gain["base_rate"] if gain["base_rate"] > 0 else 0.0
+    net_value = float(profit["net_value"][target_count - 1])
+else:
+    captured, lift_value, net_value = 0, 0.0, 0.0
 
 st.write("") 
 
@@ -149,7 +186,7 @@ with col1:
     <div class="kpi-card" style="border-left: 5px solid #dc2626;">
         <div class="kpi-title">🔥 집중 관리 대상 (Potential Churners)</div>
         <div class="kpi-value-big">{target_count:,} 명</div>
-        <div class="kpi-note">상위 {k_percent}% 위험군 추출 완료</div>
+        <div class="kpi-note">상위 {k_percent:g}% 위험군 추출 완료</div>
     </div>
     """, unsafe_allow_html=True)
 
@@ -163,15 +200,30 @@ with col2:
     """, unsafe_allow_html=True)
 
 with col3:
-    expected_save = int(target_count * 0.15) # 15% 방어 가정
+    expected_save = int(captured * save_rate) # 타겟 내 실제 이탈자 x 방어율
     st.markdown(f"""
     <div class="kpi-card">
         <div class="kpi-title">🛡️ 이탈 방어 기대 효과</div>
         <div class="kpi-value-sub">≈ {expected_save:,} 명</div>
-        <div class="kpi-note">방어율 15% 가정 시<br><br></div>
+        <div class="kpi-note">방어율 {save_rate:.0%} 가정 시<br>기대 순이익 {net_value:,.0f}원</div>
     </div>
     """, unsafe_allow_html=True)
 
+# === 기대 순이익 곡선 (모든 cutoff) ===
+with st.expander(f"📉 기대 순이익 곡선 - 최적: 상위 {profit['best_k_pct']:.1f}% ({profit['best_net_value']:,.0f}원)"):
+    step = max(total_users // 2000, 1)  # 차트용 다운샘플링 (계산은 전체 cutoff)
+    fig_profit = go.Figure(go.Scatter(
+        x=profit["k_pct"][::step], y=profit["net_value"][::step],
+        mode="lines", line_color="#16a34a", name="기대 순이익"
+    ))
+    if profit["best_n"] > 0:
+        fig_profit.add_vline(x=profit["best_k_pct"], line_dash="dash", line_color="#dc2626")
+    fig_profit.update_layout(
+        xaxis_title="타겟 범위 (상위 %)", yaxis_title="기대 순이익 (원)",
+        height=300, margin=dict(t=20, b=30)
+    )
+    st.plotly_chart(fig_profit, use_container_width=True)
+
 # ================================================================================
 # [섹션 2] 액션 실행 (Action Item)
 # ================================================================================
@@ -218,7 +270,7 @@ with col_action:
     st.download_button(
         label="📥 대상자 ID 리스트 다운로드 (.csv)",
         data=csv,
-        file_name=f"Target_Users_Top{k_percent}pct.csv",
+        file_name=f"Target_Users_Top{k_percent:g}pct.csv",
         mime="text/csv",
         use_container_width=True
     )
@@ -227,7 +279,7 @@ with col_action:
 # [섹션 3] 명단 미리보기 (Preview)
 # ================================================================================
 with col_preview:
-    st.markdown(f"#### 📋 타겟 리스트 미리보기 (Top {k_percent}%)")
+    st.markdown(f"#### 📋 타겟 리스트 미리보기 (Top {k_percent:g}%)")
     
     # 데이터프레임 표시 (ID만 깔끔하게)
     st.dataframe(
@@ -0,0 +1,260 @@
+# app/utils/artifact_store.py
+#
+# 내용 주소(SHA-256) 기반 산출물 저장소
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m app.utils.artifact_store stats
+#   python -m app.utils.artifact_store gc --dry-run   # 참조되지 않는 object 목록만 출력
+#   python -m app.utils.artifact_store gc             # 삭제
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import uuid
+from pathlib import Path
+
+from app.utils.file_lock import dir_lock
+from app.utils.paths import PATHS, PROJECT_ROOT
+
+# 버전 폴더마다 {파일명: {"sha256", "size"}}를 기록하는 포인터 파일
+POINTER_FILE = "artifacts.json"
+
+
+def sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ArtifactStore:
+    """
+    SHA-256 → blob 저장소 (models/store/objects/ab/abcdef...).
+
+    버전 폴더(models/dl/{name}/{version} 등)의 파일은 blob을 가리키는 하드링크이고,
+    같은 폴더의 artifacts.json이 파일명 → SHA-256을 기록합니다.
+      - 내용이 같은 파일은 blob 하나만 디스크에 남습니다 (버전 / 모델 간 중복 제거).
+      - 이미 같은 blob을 가리키는 파일은 다시 쓰지 않습니다 (unchanged).
+      - 기존 경로가 그대로 유지되므로 torch.load(mmap=True) / joblib.load 등 읽는 쪽 코드는 바뀌지 않습니다.
+        하드링크를 만들 수 없는 파일시스템에서는 복사로 대체합니다.
+      - 버전 파일이 지워져도 artifacts.json이 남아 있으면 resolve()가 blob 경로를 돌려줍니다.
+
+    blob은 항상 새 파일로 교체(os.replace)되어야 하며 제자리 수정하면 안 됩니다 (하드링크라 blob이 같이 바뀜).
+    그래서 blob은 읽기 전용(0444)으로 두어, 버전 파일을 경로로 덮어쓰려 하면 PermissionError가 납니다.
+    save_model_and_artifacts의 writer는 항상 temp 파일 → commit() 순서로 씁니다.
+
+    링크 교체와 artifacts.json 갱신은 버전 폴더의 프로세스 간 잠금(file_lock.dir_lock) 안에서 합니다.
+    (노트북 두 개가 같은 폴더에 저장해도 한쪽 항목이 사라지지 않음)
+
+    사용 예시:
+        >>> store = ArtifactStore()
+        >>> store.commit(tmp_path, MODEL_DIR / "model.pkl")   # {"sha256", "size", "status": "new" | "dedup" | "unchanged"}
+        >>> store.gc(dry_run=True)
+    """
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root or PATHS["artifact_store"])
+        self.objects = self.root / "objects"
+        self._lock = threading.Lock()
+
+    def object_path(self, sha: str) -> Path:
+        return self.objects / sha[:2] / sha
+
+    # ----------------------------
+    # 쓰기
+    # ----------------------------
+    def commit(self, tmp_path, path) -> dict:
+        """
+        temp 파일을 저장소에 넣고 path가 그 blob을 가리키게 합니다. tmp_path는 이동되거나 삭제됩니다.
+
+        status:
+          - "unchanged": path가 이미 같은 내용 → 아무것도 쓰지 않음
+          - "dedup": 같은 내용의 blob이 이미 있음 → 링크만 교체
+          - "new": 새 blob 저장
+        """
+        tmp_path, path = Path(tmp_path), Path(path)
+        sha = sha256_file(tmp_path)
+        size = tmp_path.stat().st_size
+        obj = self.object_path(sha)
+
+        with self._lock:
+            if obj.exists():
+                tmp_path.unlink()
+                status = "dedup"
+            else:
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, obj)
+                status = "new"
+            _make_readonly(obj)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with dir_lock(path.parent):
+            if status == "dedup" and self._points_to(path, obj, sha):
+                status = "unchanged"
+            else:
+                self._link(obj, path)
+            self._update_pointer(path, {"sha256": sha, "size": size})
+        return {"sha256": sha, "size": size, "status": status}
+
+    def _points_to(self, path: Path, obj: Path, sha: str) -> bool:
+        if not path.exists():
+            return False
+        if os.path.samefile(path, obj):
+            return True
+        # 복사로 대체된 경우: 포인터 기록 + 크기로 판단
+        entry = read_pointer(path.parent).get(path.name)
+        return entry is not None and entry["sha256"] == sha and path.stat().st_size == entry["size"]
+
+    def _link(self, obj: Path, path: Path) -> None:
+        # 같은 폴더 temp 링크 → os.replace (읽는 쪽은 이전 파일 또는 새 파일만 봄)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.link")
+        try:
+            os.link(obj, tmp)
+        except OSError:  # 하드링크 미지원 (다른 드라이브, 일부 네트워크 파일시스템 등)
+            shutil.copyfile(obj, tmp)  # 복사본은 blob과 공유하지 않음
+        try:
+            os.replace(tmp, path)
+        except PermissionError:  # Windows: 읽기 전용 파일은 덮어쓸 수 없음
+            if os.name != "nt" or not path.exists():
+                raise
+            # 읽기 전용 속성은 이전 blob과 공유되므로 교체 뒤 이전 blob을 다시 읽기 전용으로
+            old = read_pointer(path.parent).get(path.name)
+            os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+            os.replace(tmp, path)
+            if old is not None and self.object_path(old["sha256"]).exists():
+                _make_readonly(self.object_path(old["sha256"]))
+
+    def _update_pointer(self, path: Path, entry: dict) -> None:
+        pointer = path.parent / POINTER_FILE
+        index = read_pointer(path.parent)
+        if index.get(path.name) == entry:
+            return
+        index[path.name] = entry
+        tmp = pointer.with_name(f".{POINTER_FILE}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp, pointer)
+
+    # ----------------------------
+    # 읽기
+    # ----------------------------
+    def resolve(self, path) -> Path:
+        """path가 있으면 그대로, 없으면 artifacts.json이 가리키는 blob 경로. 둘 다 없으면 path 그대로 반환."""
+        path = Path(path)
+        if path.exists():
+            return path
+        entry = read_pointer(path.parent).get(path.name)
+        if entry is not None:
+            obj = self.object_path(entry["sha256"])
+            if obj.exists():
+                return obj
+        return path
+
+    # ----------------------------
+    # 관리
+    # ----------------------------
+    def referenced(self, roots: list[Path] | None = None) -> set[str]:
+        """roots 아래 모든 artifacts.json이 가리키는 SHA-256 (기본: models/ 전체 + assets/)"""
+        roots = roots or [PROJECT_ROOT / "models", PROJECT_ROOT / "assets"]
+        shas = set()
+        for root in roots:
+            if not Path(root).exists():
+                continue
+            for pointer in Path(root).rglob(POINTER_FILE):
+                if self.root in pointer.parents:
+                    continue
+                with open(pointer, "r", encoding="utf-8") as f:
+                    shas.update(e["sha256"] for e in json.load(f).values())
+        return shas
+
+    def gc(self, dry_run: bool = False, roots: list[Path] | None = None) -> dict:
+        """
+        어떤 artifacts.json에서도 참조하지 않는 blob을 삭제합니다.
+        commit()은 blob을 만든 뒤 포인터를 갱신하므로, 저장이 진행 중일 때는 실행하지 않습니다.
+        """
+        keep = self.referenced(roots)
+        removed, freed = [], 0
+        for obj in self.iter_objects():
+            if obj.name in keep:
+                continue
+            freed += obj.stat().st_size
+            removed.append(obj.name)
+            if not dry_run:
+                _unlink_readonly(obj)
+        return {"n_removed": len(removed), "freed_bytes": freed, "removed": removed, "dry_run": dry_run}
+
+    def iter_objects(self):
+        if self.objects.exists():
+            yield from (p for p in self.objects.glob("*/*") if p.is_file())
+
+    def stats(self) -> dict:
+        objects = list(self.iter_objects())
+        keep = self.referenced()
+        return {
+            "n_objects": len(objects),
+            "store_bytes": sum(p.stat().st_size for p in objects),
+            "n_referenced": sum(p.name in keep for p in objects),
+        }
+
+
+def _make_readonly(path: Path) -> None:
+    # blob(과 그 하드링크)을 읽기 전용으로: 경로로 제자리 수정하면 같은 blob을 쓰는 모든 버전이 바뀌므로
+    mode = path.stat().st_mode
+    if mode & 0o222:
+        os.chmod(path, mode & ~0o222)
+
+
+def _unlink_readonly(path: Path) -> None:
+    # Windows는 읽기 전용 파일을 지울 수 없으므로 쓰기 권한을 되돌린 뒤 삭제
+    try:
+        path.unlink()
+    except PermissionError:
+        if os.name != "nt":
+            raise
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        path.unlink()
+
+
+def read_pointer(directory) -> dict:
+    pointer = Path(directory) / POINTER_FILE
+    if not pointer.exists():
+        return {}
+    with open(pointer, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 프로세스 공용 저장소
+STORE = ArtifactStore()
+
+
+def resolve_artifact(path) -> Path:
+    """loaders용: 버전 폴더 파일 → (없으면) 저장소 blob 경로"""
+    return STORE.resolve(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Content-addressed artifact store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats")
+    gc_parser = sub.add_parser("gc")
+    gc_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        s = STORE.stats()
+        print(f"objects = {s['n_objects']} ({s['store_bytes'] / 1e6:.1f} MB), referenced = {s['n_referenced']}")
+    else:
+        r = STORE.gc(dry_run=args.dry_run)
+        verb = "삭제 예정" if r["dry_run"] else "삭제"
+        print(f"{verb}: {r['n_removed']} objects ({r['freed_bytes'] / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
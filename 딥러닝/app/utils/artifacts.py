@@ -1,9 +1,5 @@
 import os
 import json
-import torch
-import joblib
-import pandas as pd
-import matplotlib.pyplot as plt
 from app.utils.paths import PATHS
 
 
@@ -60,8 +56,12 @@ def save_model_and_artifacts(
     else:
         raise ValueError("model_type must be 'dl' or 'ml'")
 
-    # 1. Save Model
+    # 1. Save Model (torch / joblib은 저장할 때만 import)
+    import joblib
+
     if model_type == "dl":
+        import torch
+
         model_path = os.path.join(base_model_path, f"{model_name}.pt")
         clean_save_path(model_path)
         torch.save(model.state_dict(), model_path)
@@ -0,0 +1,477 @@
+# app/utils/export.py
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from app.utils.paths import PATHS
+from models.model_definitions import FusedMLP
+
+_ACTIVATION_NAMES = {
+    nn.ReLU: "relu",
+    nn.LeakyReLU: "leaky_relu",
+    nn.Tanh: "tanh",
+    nn.ELU: "elu",
+    nn.SELU: "selu",
+}
+
+# Linear(+BatchNorm) 체인으로 접을 수 있는 구조 (mlp_advanced = StackedMLPEnsemble은 bmm용 stacked 파라미터뿐)
+FUSABLE_ARCHS = ("mlp_base", "mlp_enhance")
+
+
+#
+# FUSION (Scaler + BatchNorm → Linear, Dropout 제거)
+#
+def _fold_scaler(W: torch.Tensor, b: torch.Tensor, scaler):
+    # W @ ((x - mean) / scale) + b = (W / scale) @ x + (b - (W / scale) @ mean)
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    if scale is not None:
+        W = W / torch.as_tensor(scale, dtype=W.dtype)[None, :]
+    if mean is not None:
+        b = b - W @ torch.as_tensor(mean, dtype=W.dtype)
+    return W, b
+
+
+def _fold_batchnorm(W: torch.Tensor, b: torch.Tensor, bn: nn.BatchNorm1d):
+    # eval 모드 BN: gamma * (z - running_mean) / sqrt(running_var + eps) + beta
+    s = bn.weight.double() / torch.sqrt(bn.running_var.double() + bn.eps)
+    W = W * s[:, None]
+    b = (b - bn.running_mean.double()) * s + bn.bias.double()
+    return W, b
+
+
+def fuse_for_inference(model: nn.Module, scaler=None) -> FusedMLP:
+    """
+    BasicMLP / MLP_enhance를 추론 전용 FusedMLP로 변환합니다.
+
+    - scaler(StandardScaler)는 첫 번째 Linear에 접어 넣음 → 원본 피처를 바로 입력
+    - Linear 뒤의 BatchNorm1d(eval 통계)는 해당 Linear에 접어 넣음
+    - Dropout은 제거 (eval 모드에서는 항등 함수)
+
+    계산은 float64로 한 뒤 float32로 저장하므로 원본(eval)과의 차이는 float32 반올림 수준입니다.
+    """
+    modules = list(model.net) if hasattr(model, "net") else list(model.children())
+    if not any(isinstance(m, nn.Linear) for m in modules):
+        raise ValueError(
+            f"{type(model).__name__}에는 접을 Linear 레이어가 없습니다 (fuse 대상: BasicMLP / MLP_enhance)."
+        )
+
+    weights: list[tuple[torch.Tensor, torch.Tensor]] = []
+    activation = "relu"
+    with torch.no_grad():
+        for m in modules:
+            if isinstance(m, nn.Linear):
+                W = m.weight.double().clone()
+                b = m.bias.double().clone() if m.bias is not None else torch.zeros(m.out_features, dtype=torch.float64)
+                if not weights and scaler is not None:
+                    W, b = _fold_scaler(W, b, scaler)
+                weights.append((W, b))
+            elif isinstance(m, nn.BatchNorm1d):
+                weights[-1] = _fold_batchnorm(*weights[-1], m)
+            elif type(m) in _ACTIVATION_NAMES:
+                activation = _ACTIVATION_NAMES[type(m)]
+            elif isinstance(m, nn.Dropout):
+                continue
+            else:
+                raise ValueError(f"fuse 할 수 없는 레이어입니다: {type(m).__name__}")
+
+    layer_dims = [weights[0][0].shape[1]] + [W.shape[0] for W, _ in weights]
+    fused = FusedMLP(layer_dims, activation=activation)
+
+    linears = [m for m in fused.net if isinstance(m, nn.Linear)]
+    with torch.no_grad():
+        for lin, (W, b) in zip(linears, weights):
+            lin.weight.copy_(W.float())
+            lin.bias.copy_(b.float())
+
+    return fused.eval()
+
+
+def _predict_unfused(model, scaler, X: np.ndarray) -> np.ndarray:
+    X_in = scaler.transform(X) if scaler is not None else X
+    with torch.no_grad():
+        return model(torch.as_tensor(X_in, dtype=torch.float32)).view(-1).numpy()
+
+
+def _predict_fused(fused, X: np.ndarray) -> np.ndarray:
+    with torch.no_grad():
+        return fused(torch.as_tensor(X, dtype=torch.float32)).view(-1).numpy()
+
+
+def _equivalence_inputs(X_check, input_dim: int, scaler, n: int = 1024, seed: int = 0) -> tuple[np.ndarray, str]:
+    # X_check가 없으면 원본 피처 공간의 임의 입력 (scaler가 있으면 mean_ / scale_ 기준)
+    if X_check is not None:
+        return np.asarray(X_check, dtype=np.float32), "X_check"
+    z = np.random.default_rng(seed).normal(size=(n, input_dim))
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    if scale is not None:
+        z = z * np.asarray(scale)
+    if mean is not None:
+        z = z + np.asarray(mean)
+    return z.astype(np.float32), "random"
+
+
+def check_fused_equivalence(model, fused, scaler, X, atol: float = 1e-4) -> dict:
+    """원본(scaler + model, eval)과 fused의 logit / 확률 최대 오차."""
+    model.eval()
+    X = np.asarray(X, dtype=np.float32)
+    z_ref = _predict_unfused(model, scaler, X)
+    z_fus = _predict_fused(fused, X)
+
+    p_ref = 1 / (1 + np.exp(-z_ref.astype(np.float64)))
+    p_fus = 1 / (1 + np.exp(-z_fus.astype(np.float64)))
+
+    result = {
+        "n": int(len(X)),
+        "max_abs_logit_diff": float(np.max(np.abs(z_ref - z_fus))) if len(X) else 0.0,
+        "max_abs_prob_diff": float(np.max(np.abs(p_ref - p_fus))) if len(X) else 0.0,
+    }
+    result["ok"] = result["max_abs_prob_diff"] <= atol
+    return result
+
+
+def benchmark_fused(model, fused, scaler, X, batch_sizes=(1, 256, 4096), repeat: int = 50) -> list[dict]:
+    """배치 크기별 평균 지연 시간(ms): 원본(scaler.transform + model) vs fused."""
+    model.eval()
+    X = np.asarray(X, dtype=np.float32)
+
+    def _time(fn, xb) -> float:
+        fn(xb)  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn(xb)
+        return (time.perf_counter() - t0) / repeat * 1000
+
+    rows = []
+    for bs in batch_sizes:
+        xb = X[:bs]
+        t_unfused = _time(lambda a: _predict_unfused(model, scaler, a), xb)
+        t_fused = _time(lambda a: _predict_fused(fused, a), xb)
+        rows.append({
+            "batch_size": int(len(xb)),
+            "unfused_ms": t_unfused,
+            "fused_ms": t_fused,
+            "speedup": t_unfused / t_fused if t_fused > 0 else float("inf"),
+        })
+    return rows
+
+
+#
+# 저장 / 로드 (models/dl/{model_name}/{version}/model_fused.pt)
+#
+def save_fused_model(fused: FusedMLP, model_name: str, version: str | None = "baseline") -> str:
+    v = (version or "baseline").strip() or "baseline"
+    path = Path(PATHS["models_dl"]) / model_name / v / "model_fused.pt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(
+        {
+            "arch": "fused_mlp",
+            "layer_dims": fused.layer_dims,
+            "activation": fused.activation_name,
+            "state_dict": fused.state_dict(),
+        },
+        path,
+    )
+    return str(path)
+
+
+def load_fused_model(model_name: str, version: str | None = "baseline", device: str = "cpu") -> FusedMLP:
+    """
+    FusedMLP 로드. 입력은 scaler를 적용하지 않은 원본 피처입니다.
+    """
+    v = (version or "baseline").strip() or "baseline"
+    path = Path(PATHS["models_dl"]) / model_name / v / "model_fused.pt"
+    if not path.exists():
+        raise FileNotFoundError(f"Fused 모델 파일이 없습니다: {path}")
+
+    ckpt = torch.load(path, map_location=device)
+    fused = FusedMLP(ckpt["layer_dims"], activation=ckpt["activation"])
+    fused.load_state_dict(ckpt["state_dict"], strict=True)
+    return fused.to(device).eval()
+
+
+def export_fused_model(
+    model_name: str,
+    version: str | None,
+    input_dim: int,
+    X_check=None,
+    atol: float = 1e-4,
+) -> dict:
+    """
+    저장된 모델 + scaler를 불러와 fuse → 동등성 확인/지연 시간 비교 → 저장.
+    mlp_base / mlp_enhance만 지원합니다 (mlp_advanced는 ValueError).
+
+    동등성 확인은 항상 수행합니다. X_check가 없으면 임의 입력(scaler의 mean_ / scale_ 기준)으로 확인하며,
+    실패하면 저장하지 않고 ValueError를 냅니다.
+
+    사용 예시:
+        >>> report = export_fused_model("mlp_enhance", "baseline", input_dim=40, X_check=X_val)
+        >>> report["equivalence"], report["latency"]
+    """
+    from app.utils.load_model import load_dl_model, load_scaler
+
+    model, actual_name, _ = load_dl_model(model_name, version, input_dim)
+    if actual_name not in FUSABLE_ARCHS:
+        raise ValueError(f"fused export는 {' / '.join(FUSABLE_ARCHS)}만 지원합니다: {actual_name}")
+    try:
+        scaler = load_scaler(model_name, version)
+    except FileNotFoundError:
+        scaler = None
+
+    fused = fuse_for_inference(model, scaler)
+
+    report: dict = {"model_name": model_name, "arch": actual_name, "scaler_folded": scaler is not None}
+    X, source = _equivalence_inputs(X_check, input_dim, scaler)
+    report["equivalence"] = {**check_fused_equivalence(model, fused, scaler, X, atol=atol), "inputs": source}
+    if not report["equivalence"]["ok"]:
+        raise ValueError(f"fused 모델이 원본과 다릅니다: {report['equivalence']}")
+    report["latency"] = benchmark_fused(model, fused, scaler, X)
+
+    report["path"] = save_fused_model(fused, model_name, version)
+    return report
+
+
+#
+# NUMPY EXPORT (models/dl/{model_name}/{version}/model_numpy.npz)
+#
+def save_numpy_model(fused: FusedMLP, model_name: str, version: str | None = "baseline") -> str:
+    """FusedMLP의 Linear 가중치를 압축 .npz로 저장 (inference.NumpyMLP로 로드)"""
+    from app.utils.inference import NUMPY_MODEL_FILE
+
+    v = (version or "baseline").strip() or "baseline"
+    path = Path(PATHS["models_dl"]) / model_name / v / NUMPY_MODEL_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    linears = [m for m in fused.net if isinstance(m, nn.Linear)]
+    arrays = {"n_layers": np.array(len(linears)), "activation": np.array(fused.activation_name)}
+    for i, lin in enumerate(linears):
+        arrays[f"W{i}"] = lin.weight.detach().cpu().numpy().astype(np.float32)
+        arrays[f"b{i}"] = lin.bias.detach().cpu().numpy().astype(np.float32)
+    np.savez_compressed(path, **arrays)
+    return str(path)
+
+
+def check_numpy_equivalence(model, np_model, scaler, X, atol: float = 1e-5) -> dict:
+    """원본(scaler + model, eval, torch)과 NumpyMLP(fused 가중치)의 확률 최대 오차."""
+    model.eval()
+    X = np.asarray(X, dtype=np.float32)
+    ref = 1.0 / (1.0 + np.exp(-_predict_unfused(model, scaler, X).astype(float)))
+    diff = float(np.max(np.abs(np_model.predict_proba(X) - ref))) if len(X) else 0.0
+    return {"n": int(len(X)), "max_abs_diff": diff, "atol": atol, "ok": diff <= atol}
+
+
+def numpy_model_from_fused(fused: FusedMLP):
+    """FusedMLP → inference.NumpyMLP (저장 없이 메모리에서 변환)"""
+    from app.utils.inference import NumpyMLP
+
+    linears = [m for m in fused.net if isinstance(m, nn.Linear)]
+    return NumpyMLP(
+        [lin.weight.detach().cpu().numpy() for lin in linears],
+        [lin.bias.detach().cpu().numpy() for lin in linears],
+        fused.activation_name,
+    )
+
+
+def export_numpy_model(
+    model_name: str,
+    version: str | None,
+    input_dim: int,
+    X_check=None,
+    atol: float = 1e-5,
+) -> dict:
+    """
+    BasicMLP / MLP_enhance를 fuse(scaler + BatchNorm 접기)한 뒤 NumPy 백엔드용 .npz로 저장합니다.
+    저장 전에 항상 torch 원본과 확률을 비교하고(X_check가 없으면 임의 입력), atol을 넘으면 저장하지 않고 ValueError를 냅니다.
+
+    사용 예시:
+        >>> report = export_numpy_model("mlp_enhance", "baseline", input_dim=40, X_check=X_val)
+        >>> report["equivalence"]["max_abs_diff"]
+    """
+    from app.utils.load_model import load_dl_model, load_scaler
+
+    model, actual_name, _ = load_dl_model(model_name, version, input_dim)
+    if actual_name not in FUSABLE_ARCHS:
+        raise ValueError(f"NumPy 백엔드는 {' / '.join(FUSABLE_ARCHS)}만 지원합니다: {actual_name}")
+    try:
+        scaler = load_scaler(model_name, version)
+    except FileNotFoundError:
+        scaler = None
+
+    fused = fuse_for_inference(model, scaler)
+    report: dict = {"model_name": model_name, "arch": actual_name, "scaler_folded": scaler is not None}
+
+    X, source = _equivalence_inputs(X_check, input_dim, scaler)
+    report["equivalence"] = {
+        **check_numpy_equivalence(model, numpy_model_from_fused(fused), scaler, X, atol=atol),
+        "inputs": source,
+    }
+    if not report["equivalence"]["ok"]:
+        raise ValueError(f"NumPy 모델이 원본과 다릅니다: {report['equivalence']}")
+
+    report["path"] = save_numpy_model(fused, model_name, version)
+    return report
+
+
+#
+# DYNAMIC INT8 QUANTIZATION (models/dl/{model_name}/{version}_int8/)
+#
+def _serialized_size_mb(model) -> float:
+    import io
+
+    buf = io.BytesIO()
+    torch.save(model.state_dict(), buf)
+    return buf.tell() / (1024 * 1024)
+
+
+def _mean_latency_ms(model, X: np.ndarray, repeat: int = 50) -> float:
+    xb = torch.as_tensor(X, dtype=torch.float32)
+    with torch.no_grad():
+        model(xb)  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            model(xb)
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def export_quantized_model(
+    model_name: str,
+    version: str | None,
+    input_dim: int,
+    X_val,
+    y_val,
+    scaler="auto",
+    k_pcts=None,
+) -> dict:
+    """
+    fp32 모델을 dynamic int8로 양자화해 별도 버전({version}_int8)으로 저장하고,
+    검증 데이터에서 PR-AUC / Top-K 변화량, 지연 시간, 모델 크기를 함께 기록합니다.
+
+    저장:
+        models/dl/{model_name}/{version}_int8/model_int8.pt
+        models/dl/{model_name}/{version}_int8/quant_report.json
+
+    Args:
+        X_val: scaler 적용 전 원본 검증 피처.
+        y_val: 검증 라벨.
+        scaler: "auto"면 load_scaler로 로드, None이면 적용하지 않음.
+
+    Raises:
+        ValueError: nn.Linear가 없는 모델 (mlp_advanced / StackedMLPEnsemble).
+
+    사용 예시:
+        >>> report = export_quantized_model("mlp_enhance", "baseline", 40, X_val, y_val)
+        >>> report["delta"]["pr_auc"], report["size_mb"], report["latency_ms"]
+    """
+    import os
+
+    from sklearn.metrics import average_precision_score
+
+    from app.utils.artifact_store import STORE, sha256_file
+    from app.utils.load_model import (
+        QUANT_REPORT_FILE,
+        QUANT_WEIGHT_FILE,
+        load_dl_model,
+        load_scaler,
+        quant_source,
+        quantize_dl_model,
+        quantized_model_dir,
+    )
+    from app.utils.metrics import EVAL_K_PCTS, topk_metrics
+    from app.utils.save import _json_writer, _tmp_path
+
+    k_pcts = EVAL_K_PCTS if k_pcts is None else k_pcts
+    model, actual_name, weight_path = load_dl_model(model_name, version, input_dim)
+    if isinstance(scaler, str) and scaler == "auto":
+        try:
+            scaler = load_scaler(model_name, version)
+        except FileNotFoundError:
+            scaler = None
+
+    X = np.asarray(X_val, dtype=np.float32)
+    if scaler is not None:
+        X = scaler.transform(X).astype(np.float32)
+    y = np.asarray(y_val).astype(int)
+
+    q_model = quantize_dl_model(model)
+
+    def _probs(m):
+        with torch.no_grad():
+            return torch.sigmoid(m(torch.as_tensor(X)).view(-1)).numpy().astype(float)
+
+    p_fp32 = _probs(model)
+    p_int8 = _probs(q_model)
+
+    def _summary(p):
+        topk = topk_metrics(y, p, k_pcts)
+        return {
+            "pr_auc": float(average_precision_score(y, p)),
+            "metrics_by_k": [
+                {
+                    "k_pct": float(k),
+                    "precision_at_k": float(topk["precision"][i]),
+                    "recall_at_k": float(topk["recall"][i]),
+                    "lift_at_k": float(topk["lift"][i]),
+                }
+                for i, k in enumerate(k_pcts)
+            ],
+        }
+
+    fp32 = _summary(p_fp32)
+    int8 = _summary(p_int8)
+
+    report = {
+        "model_name": model_name,
+        "arch": actual_name,
+        "version": version,
+        "quantization": "dynamic_int8_linear",
+        "source": quant_source(weight_path),
+        "n_val": int(len(y)),
+        "fp32": fp32,
+        "int8": int8,
+        "delta": {
+            "pr_auc": int8["pr_auc"] - fp32["pr_auc"],
+            "max_abs_prob_diff": float(np.max(np.abs(p_int8 - p_fp32))) if len(y) else 0.0,
+            "metrics_by_k": [
+                {
+                    "k_pct": a["k_pct"],
+                    "precision_at_k": b["precision_at_k"] - a["precision_at_k"],
+                    "recall_at_k": b["recall_at_k"] - a["recall_at_k"],
+                    "lift_at_k": b["lift_at_k"] - a["lift_at_k"],
+                }
+                for a, b in zip(fp32["metrics_by_k"], int8["metrics_by_k"])
+            ],
+        },
+        "size_mb": {"fp32": _serialized_size_mb(model), "int8": _serialized_size_mb(q_model)},
+        "latency_ms": {
+            f"batch_{bs}": {"fp32": _mean_latency_ms(model, X[:bs]), "int8": _mean_latency_ms(q_model, X[:bs])}
+            for bs in (1, 256)
+        },
+    }
+
+    # 가중치(저장소 commit) → report(temp + os.replace) 순서: 중간에 멈춰도 report의 source / int8_sha256이
+    # 실제 파일과 맞지 않으면 load_dl_model이 int8 가중치를 쓰지 않음
+    out_dir = quantized_model_dir(model_name, version)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    q_path = out_dir / QUANT_WEIGHT_FILE
+    tmp = _tmp_path(q_path)
+    try:
+        with open(tmp, "wb") as f:  # 파일 객체로 저장 (zip 내부 폴더명 고정 → 같은 가중치는 같은 blob)
+            torch.save(q_model.state_dict(), f)
+        report["int8_sha256"] = STORE.commit(tmp, q_path)["sha256"]
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    report_path = out_dir / QUANT_REPORT_FILE
+    tmp = _tmp_path(report_path)
+    _json_writer(report)(tmp)
+    os.replace(tmp, report_path)
+
+    report["path"] = str(q_path)
+    return report
@@ -0,0 +1,88 @@
+# app/utils/file_lock.py
+#
+# 프로세스 간 폴더 잠금 (save.py의 eval 폴더 / artifact_store.py의 artifacts.json 갱신)
+
+from __future__ import annotations
+
+import os
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def _lock_owner_alive(lock: Path) -> bool | None:
+    # 잠금 파일의 "host:pid" → 같은 호스트면 프로세스 생존 여부, 판단할 수 없으면 None
+    # (Windows의 os.kill은 프로세스를 종료시키므로 확인하지 않음)
+    try:
+        host, pid = lock.read_text(encoding="utf-8").rsplit(":", 1)
+        pid = int(pid)
+    except (OSError, ValueError):
+        return None
+    if os.name == "nt" or host != socket.gethostname():
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+
+def _break_stale_lock(lock: Path, st: os.stat_result) -> None:
+    # unlink 대신 고유한 이름으로 rename: 여러 대기자가 동시에 같은 잠금을 오래됐다고 판단해도 한 명만 성공
+    grave = lock.with_name(f"{lock.name}.{uuid.uuid4().hex[:8]}.stale")
+    try:
+        os.rename(lock, grave)
+    except FileNotFoundError:
+        return
+    try:
+        if os.stat(grave).st_ino != st.st_ino:
+            # 판단한 뒤 다른 프로세스가 새로 잡은 잠금을 옮긴 경우 → 되돌림
+            try:
+                os.link(grave, lock)
+            except FileExistsError:
+                pass
+    finally:
+        grave.unlink(missing_ok=True)
+
+
+@contextmanager
+def dir_lock(directory: Path, timeout: float = 120.0, stale_after: float = 600.0):
+    """
+    프로세스 간 잠금: {directory}.lock 파일을 O_EXCL로 만들 수 있을 때까지 대기합니다.
+    (노트북 두 개가 같은 model_id를 동시에 저장하는 경우 대비)
+
+    잠금 파일에는 "host:pid"를 기록합니다. 같은 호스트에서 그 프로세스가 이미 종료됐으면 바로,
+    확인할 수 없으면(다른 호스트 / Windows / pid 기록 전) stale_after초가 지났을 때 비정상 종료로 남은 잠금으로 보고
+    rename으로 원자적으로 치웁니다.
+    """
+    directory = Path(directory)
+    lock = directory.with_name(directory.name + ".lock")
+    t0 = time.monotonic()
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, f"{socket.gethostname()}:{os.getpid()}".encode())
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                st = lock.stat()
+            except FileNotFoundError:
+                continue
+            alive = _lock_owner_alive(lock)
+            if alive is False or (alive is None and time.time() - st.st_mtime > stale_after):
+                _break_stale_lock(lock, st)
+                continue
+            if time.monotonic() - t0 > timeout:
+                raise TimeoutError(f"폴더 잠금 대기 시간 초과: {lock}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        lock.unlink(missing_ok=True)
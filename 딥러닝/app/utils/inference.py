@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from pathlib import Path
 import json
+import re
+import sys
+import time
 import numpy as np
-import torch
 
 from app.utils.paths import PATHS
 
+# torch는 DL 경로에서만 필요하므로 함수 안에서 import합니다 (NumPy 백엔드는 torch 없이 동작).
+
 
 def predict_proba_ml(model, X: np.ndarray) -> np.ndarray:
     if hasattr(model, "predict_proba"):
@@ -22,6 +26,8 @@ def predict_proba_ml(model, X: np.ndarray) -> np.ndarray:
 
 
 def predict_proba_dl(model, X: np.ndarray, device: str = "cpu") -> np.ndarray:
+    import torch
+
     model.eval()
     with torch.no_grad():
         X_tensor = torch.tensor(X, dtype=torch.float32, device=device)
@@ -30,6 +36,288 @@ def predict_proba_dl(model, X: np.ndarray, device: str = "cpu") -> np.ndarray:
     return np.asarray(probs, dtype=float).reshape(-1)
 
 
+def predict_proba_ensemble(model, X: np.ndarray, device: str = "cpu") -> tuple[np.ndarray, np.ndarray]:
+    """
+    StackedMLPEnsemble 한 번의 forward로 구성원 확률의 (평균, 표준편차)를 반환합니다.
+    표준편차는 구성원 간 불확실성 지표로 사용할 수 있습니다.
+    """
+    import torch
+
+    model.eval()
+    with torch.no_grad():
+        X_tensor = torch.tensor(X, dtype=torch.float32, device=device)
+        mean, std = model.predict_proba_stats(X_tensor)
+    return mean.cpu().numpy().astype(float), std.cpu().numpy().astype(float)
+
+
+#
+# NUMPY BACKEND (torch 없이 추론)
+#
+NUMPY_MODEL_FILE = "model_numpy.npz"
+
+_SELU_ALPHA = 1.6732632423543772
+_SELU_SCALE = 1.0507009873554805
+
+_NP_ACTIVATIONS = {
+    "relu": lambda z: np.maximum(z, 0, out=z),
+    "leaky_relu": lambda z: np.where(z > 0, z, z * np.float32(0.01)),
+    "tanh": lambda z: np.tanh(z, out=z),
+    "elu": lambda z: np.where(z > 0, z, np.expm1(np.minimum(z, 0))),
+    "selu": lambda z: np.float32(_SELU_SCALE)
+    * np.where(z > 0, z, np.float32(_SELU_ALPHA) * np.expm1(np.minimum(z, 0))),
+}
+
+
+class NumpyMLP:
+    """
+    FusedMLP(scaler/BatchNorm이 접힌 Linear 스택)를 NumPy로만 계산하는 추론 모델.
+    입력은 scaler를 적용하지 않은 원본 피처이며, 가중치는 export.export_numpy_model()로 만든 .npz입니다.
+
+    torch를 import하지 않으므로 단건 what-if 스코어링의 콜드 스타트와 호출당 오버헤드가 작습니다.
+
+    사용 예시:
+        >>> model = load_numpy_model("mlp_enhance", "baseline")
+        >>> model.predict_proba(X_raw)
+    """
+
+    def __init__(self, weights: list[np.ndarray], biases: list[np.ndarray], activation: str = "relu"):
+        # x @ W.T 대신 x @ W_t를 쓰도록 미리 전치/연속 배열로 보관
+        self.weights_t = [np.ascontiguousarray(np.asarray(W, dtype=np.float32).T) for W in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activation_name = activation
+        self._act = _NP_ACTIVATIONS.get(activation, _NP_ACTIVATIONS["relu"])
+
+    @property
+    def input_dim(self) -> int:
+        return self.weights_t[0].shape[0]
+
+    @classmethod
+    def load(cls, path) -> "NumpyMLP":
+        with np.load(path, allow_pickle=False) as z:
+            n_layers = int(z["n_layers"])
+            return cls(
+                [z[f"W{i}"] for i in range(n_layers)],
+                [z[f"b{i}"] for i in range(n_layers)],
+                str(z["activation"]),
+            )
+
+    def predict_logits(self, X) -> np.ndarray:
+        z = np.asarray(X, dtype=np.float32)
+        if z.ndim == 1:
+            z = z[None, :]
+        last = len(self.weights_t) - 1
+        for i, (W_t, b) in enumerate(zip(self.weights_t, self.biases)):
+            z = z @ W_t
+            z += b
+            if i < last:
+                z = self._act(z)
+        return z.reshape(-1)
+
+    def predict_proba(self, X) -> np.ndarray:
+        z = self.predict_logits(X).astype(float)
+        return np.exp(-np.logaddexp(0.0, -z))  # 안정적인 sigmoid
+
+
+def load_numpy_model(model_name: str, version: str | None = "baseline") -> NumpyMLP:
+    """models/dl/{model_name}/{version}/model_numpy.npz → NumpyMLP"""
+    v = (version or "baseline").strip() or "baseline"
+    path = Path(PATHS["models_dl"]) / model_name / v / NUMPY_MODEL_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"NumPy 모델 파일이 없습니다: {path} (export_numpy_model로 생성)")
+    return NumpyMLP.load(path)
+
+
+#
+# BATCH SCORING (parquet → parquet, 고정 메모리)
+#
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _scale_inplace(scaler, X: np.ndarray) -> np.ndarray:
+    # StandardScaler면 새 배열 할당 없이 버퍼에서 바로 변환
+    if hasattr(scaler, "mean_") and hasattr(scaler, "scale_"):
+        if scaler.mean_ is not None:
+            X -= scaler.mean_.astype(X.dtype, copy=False)
+        if scaler.scale_ is not None:
+            X /= scaler.scale_.astype(X.dtype, copy=False)
+        return X
+    X[:] = scaler.transform(X)
+    return X
+
+
+def _expected_n_features(model, model_type: str, scaler) -> int | None:
+    # 모델/scaler가 기대하는 입력 피처 수 (알 수 없으면 None)
+    n = getattr(scaler, "n_features_in_", None)
+    if n is not None:
+        return int(n)
+    if model_type == "ml":
+        n = getattr(model, "n_features_in_", None)
+        return int(n) if n is not None else None
+    weight = next((p for p in model.parameters() if p.ndim >= 2), None)
+    return int(weight.shape[-1]) if weight is not None else None
+
+
+def score_parquet(
+    input_path,
+    output_path,
+    model,
+    model_type: str,
+    scaler=None,
+    *,
+    feature_cols: list[str],
+    id_cols: tuple[str, ...] = ("user_id", "anchor_time"),
+    chunk_size: int = 65_536,
+    device: str = "cpu",
+    verbose: bool = False,
+    cache=None,
+) -> dict:
+    """
+    parquet을 row group 단위로 스트리밍하며 청크별로 스코어링하고, 결과를 parquet에 바로 씁니다.
+
+    전체 X를 한 번에 텐서/행렬로 만들지 않으므로 peak 메모리는 chunk_size에만 비례합니다.
+    입력 버퍼(chunk_size x n_features, float32)와 출력 버퍼는 한 번만 할당해 재사용하고,
+    저장된 scaler(StandardScaler)는 버퍼 위에서 in-place로 적용합니다.
+    결측치는 학습 노트북과 같이 0으로 채웁니다.
+
+    Args:
+        input_path: 입력 parquet (예: features_ml_clean.parquet).
+        output_path: 출력 parquet (id_cols + y_prob).
+        model: load_dl_model / load_ml_model로 불러온 모델.
+        model_type (str): "dl" | "ml".
+        scaler (optional): load_scaler로 불러온 스케일러.
+        feature_cols (list[str]): 학습 때와 같은 순서의 피처 컬럼 (필수).
+            parquet에 label / target 등 다른 컬럼이 있어도 모델 입력에 섞이지 않도록 명시합니다.
+        id_cols (tuple[str]): 결과에 함께 저장할 키 컬럼.
+        chunk_size (int): 한 번에 스코어링할 행 수.
+        device (str): DL 모델 device.
+        verbose (bool): True면 summary를 출력합니다.
+        cache (ScoreCache, optional): 스케일링된 행 해시로 이전 점수를 조회하고 miss만 스코어링합니다.
+
+    Returns:
+        dict: n_rows, n_chunks, seconds, rows_per_sec, peak_rss_mb, output_path, summary(한 줄 요약)
+              (+ cache 사용 시 cache_hits, cache_hit_rate).
+
+    사용 예시:
+        >>> model, _, _ = load_dl_model("mlp_enhance", "baseline", input_dim=len(cols))
+        >>> score_parquet("features_ml_clean.parquet", "scores.parquet", model, "dl",
+        ...               scaler=load_scaler("mlp_enhance", "baseline"), feature_cols=cols)
+    """
+    assert model_type in {"ml", "dl"}, "model_type must be 'ml' or 'dl'"
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    t0 = time.perf_counter()
+
+    pf = pq.ParquetFile(input_path)
+    schema_names = pf.schema_arrow.names
+    id_cols = [c for c in id_cols if c in schema_names]
+    feature_cols = list(feature_cols)
+    missing = [c for c in feature_cols if c not in schema_names]
+    if missing:
+        raise ValueError(f"parquet에 없는 피처 컬럼: {missing}")
+
+    n_features = len(feature_cols)
+    expected = _expected_n_features(model, model_type, scaler)
+    if expected is not None and expected != n_features:
+        raise ValueError(f"feature_cols가 {n_features}개입니다 (모델/scaler 입력: {expected}개).")
+    X_buf = np.empty((chunk_size, n_features), dtype=np.float32)
+    prob_buf = np.empty(chunk_size, dtype=np.float64)
+
+    if model_type == "dl":
+        model.eval()
+        model.to(device)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _predict_chunk(X: np.ndarray) -> np.ndarray:
+        if model_type == "dl":
+            import torch
+
+            with torch.no_grad():
+                logits = model(torch.from_numpy(np.ascontiguousarray(X)).to(device)).view(-1)
+                return torch.sigmoid(logits).cpu().numpy()
+        return predict_proba_ml(model, X)
+
+    if cache is not None:
+        from app.utils.score_cache import hash_rows
+
+    writer = None
+    n_rows = 0
+    n_chunks = 0
+    n_hits = 0
+    try:
+        for batch in pf.iter_batches(batch_size=chunk_size, columns=id_cols + feature_cols):
+            m = batch.num_rows
+            X = X_buf[:m]
+            for j, col in enumerate(feature_cols):
+                X[:, j] = batch.column(col).to_numpy(zero_copy_only=False)
+            np.nan_to_num(X, copy=False, nan=0.0)
+
+            if scaler is not None:
+                _scale_inplace(scaler, X)
+
+            if cache is None:
+                prob_buf[:m] = _predict_chunk(X)
+            else:
+                keys = hash_rows(X)
+                hit, cached = cache.lookup(keys)
+                prob_buf[:m][hit] = cached[hit]
+                if not hit.all():
+                    miss = ~hit
+                    probs = _predict_chunk(X[miss])
+                    prob_buf[:m][miss] = probs
+                    cache.put(keys[miss], probs)
+                n_hits += int(hit.sum())
+
+            out = pa.table(
+                [batch.column(c) for c in id_cols] + [pa.array(prob_buf[:m])],
+                names=id_cols + ["y_prob"],
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, out.schema)
+            writer.write_table(out)
+
+            n_rows += m
+            n_chunks += 1
+    finally:
+        if writer is not None:
+            writer.close()
+        if cache is not None:
+            cache.save()
+
+    seconds = time.perf_counter() - t0
+    report = {
+        "n_rows": n_rows,
+        "n_chunks": n_chunks,
+        "seconds": seconds,
+        "rows_per_sec": n_rows / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "output_path": str(output_path),
+    }
+    if cache is not None:
+        report["cache_hits"] = n_hits
+        report["cache_hit_rate"] = n_hits / n_rows if n_rows else 0.0
+    peak = report["peak_rss_mb"]
+    peak_s = f"{peak:,.0f}MB" if peak is not None else "n/a"
+    report["summary"] = (
+        f"[score_parquet] {n_rows:,} rows / {n_chunks} chunks, "
+        f"{seconds:.1f}s ({report['rows_per_sec']:,.0f} rows/s), peak RSS {peak_s}"
+        + (f", cache hit {report['cache_hit_rate']:.1%}" if cache is not None else "")
+    )
+    if verbose:
+        print(report["summary"])
+    return report
+
+
 def load_score_percentiles(model_name: str) -> dict:
     metrics_dir = PATHS.get("models_metrics")
     if metrics_dir is None:
@@ -46,46 +334,149 @@ def load_score_percentiles(model_name: str) -> dict:
         return json.load(f)
 
 
-def interpret_percentile_with_gap(y_prob: float, percentiles: list[dict]):
-    rows = sorted(percentiles, key=lambda x: int(x["pct"]))
-    for row in rows:
-        pct = int(row["pct"])
-        cutoff = float(row["score"])
-        if float(y_prob) >= cutoff:
-            return f"상위 {pct}% 이내", float(y_prob) - cutoff, pct, cutoff
+#
+# PERCENTILE / RISK 해석 (벡터화)
+#
+# risk_tier: 0 = 낮음, 1 = 주의, 2 = 높음, 3 = 매우 높음
+RISK_LEVEL_LABELS = [
+    "🟢 낮음 (Low Risk)",
+    "🟡 주의 (Medium)",
+    "🟠 높음 (Medium-High)",
+    "🔴 매우 높음 (High Risk)",
+]
 
-    # 50% 컷도 못 넘으면
-    if rows:
-        last = rows[-1]
-        return "상위 50% 밖", None, int(last["pct"]), float(last["score"])
+# 상위 pct% 경계 → 등급 (pct <= 5: 3, <= 20: 2, <= 30: 1, 그 외 0)
+_RISK_PCT_EDGES = np.array([5, 20, 30])
 
-    return "상위 50% 밖", None, None, None
 
+def prepare_percentile_table(percentiles) -> dict:
+    """
+    percentile 테이블을 pct 오름차순 배열로 한 번만 정리합니다.
+
+    지원 형식:
+      - 배열형 (save_model_and_artifacts가 쓰는 형식): {"pct": [0.1, 0.2, ...], "score": [...]}
+        pct 오름차순 / score 내림차순으로 저장되어 있어 정렬 없이 그대로 사용합니다.
+      - 리스트형 (이전 형식): [{"pct": 1, "score": 0.83}, ...] 또는 {"percentiles": [...]}
+
+    interpret_* 함수는 원본과 이 결과를 모두 받으며,
+    반복 호출 시에는 미리 준비한 테이블을 넘기면 다시 변환하지 않습니다.
+    """
+    if isinstance(percentiles, dict) and "min_cutoff" in percentiles:
+        return percentiles
+    if isinstance(percentiles, dict) and "pct" in percentiles and "score" in percentiles:
+        pct = np.asarray(percentiles["pct"], dtype=float)
+        cutoff = np.asarray(percentiles["score"], dtype=float)
+        min_cutoff = np.minimum.accumulate(cutoff) if len(cutoff) else cutoff
+        return {"pct": pct, "cutoff": cutoff, "min_cutoff": min_cutoff}
+    if isinstance(percentiles, dict):  # score_percentiles.json 전체를 넘긴 경우
+        percentiles = percentiles.get("percentiles", [])
+
+    rows = sorted(percentiles, key=lambda x: float(x["pct"]))
+    pct = np.array([float(r["pct"]) for r in rows], dtype=float)
+    cutoff = np.array([float(r["score"]) for r in rows], dtype=float)
+
+    # "pct 오름차순으로 처음 cutoff 이상이 되는 행"을 searchsorted로 찾기 위한 누적 최소값
+    # (보통 cutoff는 pct가 커질수록 작아지므로 cutoff와 같음)
+    min_cutoff = np.minimum.accumulate(cutoff) if len(cutoff) else cutoff
 
-def interpret_percentile(y_prob: float, percentiles: list[dict]) -> str:
+    return {"pct": pct, "cutoff": cutoff, "min_cutoff": min_cutoff}
+
+
+def risk_tier_from_pct(pct) -> np.ndarray:
+    pct = np.asarray(pct)
+    return (len(_RISK_PCT_EDGES) - np.searchsorted(_RISK_PCT_EDGES, pct, side="left")).astype(np.int8)
+
+
+def interpret_percentiles_array(y_prob, percentiles) -> dict:
+    """
+    점수 벡터를 백분위 구간 / cutoff까지의 차이 / 위험 등급으로 한 번에 변환합니다.
+
+    np.searchsorted 한 번으로 처리하므로 수백만 건도 문자열 생성 없이 빠르게 계산하며,
+    결과는 interpret_percentile_with_gap을 원소마다 호출한 것과 같습니다.
+    라벨 문자열은 화면 표시용으로 필요할 때만 percentile_labels / risk_level_labels로 만듭니다.
+
+    Returns:
+        dict:
+            inside (bool): 가장 넓은 구간(예: 상위 50%) 안에 드는지
+            pct (float): 해당 구간 pct (구간 밖이면 가장 넓은 구간 pct, 테이블이 비었으면 -1)
+            cutoff (float): 해당 구간 cutoff (구간 밖이면 가장 넓은 구간 cutoff)
+            gap (float): y_prob - cutoff (구간 밖이면 NaN)
+            risk_tier (int8): 0~3 (RISK_LEVEL_LABELS 인덱스)
+    """
+    table = prepare_percentile_table(percentiles)
+    y = np.asarray(y_prob, dtype=float).reshape(-1)
+    n_rows = len(table["pct"])
+
+    if n_rows == 0:
+        return {
+            "inside": np.zeros(len(y), dtype=bool),
+            "pct": np.full(len(y), -1.0),
+            "cutoff": np.full(len(y), np.nan),
+            "gap": np.full(len(y), np.nan),
+            "risk_tier": np.zeros(len(y), dtype=np.int8),
+        }
+
+    # min_cutoff는 감소 수열 → 뒤집어서 오름차순 searchsorted
+    # idx = y보다 큰 min_cutoff 개수 = 처음으로 cutoff <= y 가 되는 행
+    idx = n_rows - np.searchsorted(table["min_cutoff"][::-1], y, side="right")
+    inside = idx < n_rows
+    row = np.minimum(idx, n_rows - 1)
+
+    pct = table["pct"][row]
+    cutoff = table["cutoff"][row]
+    gap = np.where(inside, y - cutoff, np.nan)
+    risk_tier = np.where(inside, risk_tier_from_pct(pct), 0).astype(np.int8)
+
+    return {"inside": inside, "pct": pct, "cutoff": cutoff, "gap": gap, "risk_tier": risk_tier}
+
+
+def _outside_label(widest_pct: float) -> str:
+    # 테이블의 가장 넓은 구간도 못 넘는 점수 (테이블이 비었으면 기존 기본 경계 50%)
+    return f"상위 {widest_pct:g}% 밖" if widest_pct > 0 else "상위 50% 밖"
+
+
+def percentile_labels(result: dict) -> list[str]:
+    """interpret_percentiles_array 결과 → 표시용 라벨 ("상위 5% 이내" / "상위 50% 밖", 경계는 테이블의 최대 pct)."""
+    return [
+        f"상위 {p:g}% 이내" if ok else _outside_label(p)
+        for ok, p in zip(result["inside"].tolist(), result["pct"].tolist())
+    ]
+
+
+def risk_level_labels(risk_tier) -> list[str]:
+    return [RISK_LEVEL_LABELS[t] for t in np.asarray(risk_tier).tolist()]
+
+
+def interpret_percentile_with_gap(y_prob: float, percentiles):
+    res = interpret_percentiles_array([y_prob], percentiles)
+    if res["pct"][0] < 0:
+        return _outside_label(-1), None, None, None
+
+    pct = float(res["pct"][0])
+    cutoff = float(res["cutoff"][0])
+    if res["inside"][0]:
+        return f"상위 {pct:g}% 이내", float(res["gap"][0]), pct, cutoff
+
+    # 가장 넓은 구간 컷도 못 넘으면 (pct = 테이블의 최대 pct)
+    return _outside_label(pct), None, pct, cutoff
+
+
+def interpret_percentile(y_prob: float, percentiles) -> str:
     label, _, _, _ = interpret_percentile_with_gap(y_prob, percentiles)
     return label
 
 
-
 def interpret_risk_level(percentile_label: str) -> str:
     """
     percentile_label 예:
       - "상위 1% 이내"
       - "상위 5% 이내"
       - "상위 50% 밖"
+
+    (점수 배열은 interpret_percentiles_array의 risk_tier를 쓰면 문자열 파싱이 필요 없습니다.)
     """
-    m = re.search(r"상위\s*(\d+)\s*%", percentile_label)
-    if not m:
-        return "🟢 낮음 (Low Risk)"
-
-    pct = int(m.group(1))
-
-    if pct <= 5:
-        return "🔴 매우 높음 (High Risk)"
-    elif pct <= 20:
-        return "🟠 높음 (Medium-High)"
-    elif pct <= 30:
-        return "🟡 주의 (Medium)"
-    else:
-        return "🟢 낮음 (Low Risk)"
\ No newline at end of file
+    m = re.search(r"상위\s*(\d+(?:\.\d+)?)\s*%", percentile_label)
+    if not m or "밖" in percentile_label:
+        return RISK_LEVEL_LABELS[0]
+
+    return RISK_LEVEL_LABELS[int(risk_tier_from_pct(float(m.group(1))))]
@@ -1,6 +1,11 @@
 import json
 from app.utils.paths import PATHS
 
+# save_model_and_artifacts가 eval 폴더에 함께 쓰는 통합 파일 / models/eval 전체 목록
+EVAL_BUNDLE_FILE = "eval_bundle.json"
+EVAL_CATALOG_FILE = "catalog.json"
+EVAL_PARTS = ("model_card", "pr_metrics", "topk_metrics", "topk_cutoffs")
+
 
 def load_runtime_metrics(model_name: str, version: str):
     """
@@ -20,12 +25,20 @@ def load_eval_metrics(model_id: str):
     """
     eval 단계 팀 공통 규칙 metrics 로드
     models/eval/<model_id>/
+
+    eval_bundle.json이 있으면 한 번만 읽고, 없으면(이전에 저장된 폴더) 파일 4개를 각각 읽습니다.
     """
     eval_dir = PATHS["models_eval"] / model_id
 
     if not eval_dir.exists():
         raise FileNotFoundError(f"eval 폴더가 없습니다: {eval_dir}")
 
+    bundle_path = eval_dir / EVAL_BUNDLE_FILE
+    if bundle_path.exists():
+        with open(bundle_path, "r", encoding="utf-8") as f:
+            bundle = json.load(f)
+        return {k: bundle[k] for k in EVAL_PARTS}
+
     with open(eval_dir / "model_card.json") as f:
         model_card = json.load(f)
 
@@ -43,4 +56,104 @@ def load_eval_metrics(model_id: str):
         "pr_metrics": pr_metrics,
         "topk_metrics": topk_metrics,
         "topk_cutoffs": topk_cutoffs,
-    }
\ No newline at end of file
+    }
+
+
+def eval_catalog_entry(bundle: dict) -> dict:
+    """eval 결과(load_eval_metrics 형식) → 카탈로그용 대표 지표"""
+    card, pr, topk = bundle["model_card"], bundle["pr_metrics"], bundle["topk_metrics"]
+    return {
+        "display_name": card.get("display_name"),
+        "category": card.get("category"),
+        "split": card.get("split"),
+        "version": card.get("version"),
+        "pr_auc": pr.get("pr_auc"),
+        "pr_auc_ci": pr.get("pr_auc_ci"),
+        "base_rate": topk.get("base_rate"),
+        "topk": {
+            str(m["k_pct"]): {
+                "precision": m["precision_at_k"],
+                "recall": m["recall_at_k"],
+                "lift": m["lift_at_k"],
+            }
+            for m in topk.get("metrics_by_k", [])
+        },
+    }
+
+
+def _eval_dirs() -> dict:
+    # eval 결과가 들어 있는 models/eval/* 폴더 → 기준 파일 (eval_bundle.json, 이전 형식이면 model_card.json)
+    root = PATHS["models_eval"]
+    dirs = {}
+    if root.exists():
+        for eval_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            for name in (EVAL_BUNDLE_FILE, "model_card.json"):
+                if (eval_dir / name).exists():
+                    dirs[eval_dir.name] = eval_dir / name
+                    break
+    return dirs
+
+
+def _catalog_model(eval_folder: str):
+    # eval 폴더 하나 → 카탈로그 항목 (읽을 수 없으면 None)
+    try:
+        bundle = load_eval_metrics(eval_folder)
+    except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        return None
+    entry = eval_catalog_entry(bundle)
+    return {
+        "model_id": bundle["model_card"].get("model_id", eval_folder),
+        "latest": entry["version"],
+        "versions": {entry["version"]: entry},
+    }
+
+
+def build_eval_catalog() -> dict:
+    """models/eval/* 폴더를 모두 읽어 카탈로그를 구성합니다 (파일은 쓰지 않음)."""
+    models = {}
+    for eval_folder in _eval_dirs():
+        model = _catalog_model(eval_folder)
+        if model is not None:
+            models[eval_folder] = model
+    return {"format_version": 1, "models": models}
+
+
+def load_eval_catalog() -> dict:
+    """
+    모든 eval 모델 / 버전의 대표 지표(PR-AUC, Top-K precision / recall / lift)를 한 번에 로드합니다.
+    models/eval/catalog.json (save_model_and_artifacts가 갱신)
+
+    {"format_version": 1, "models": {<eval 폴더>: {"model_id", "latest", "versions": {<version>: {...}}}}}
+    카탈로그가 아직 없으면 폴더를 스캔해 같은 형식으로 만들어 반환합니다.
+
+    카탈로그가 있어도 폴더 목록과 eval 파일 수정 시각을 비교해(stat만, 내용은 읽지 않음)
+    새로 생기거나 카탈로그보다 나중에 바뀐 폴더는 다시 읽고, 사라진 폴더는 뺍니다 (파일은 쓰지 않음).
+
+    사용 예시:
+        >>> catalog = load_eval_catalog()
+        >>> {k: m["versions"][m["latest"]]["pr_auc"] for k, m in catalog["models"].items()}
+    """
+    path = PATHS["models_eval"] / EVAL_CATALOG_FILE
+    if not path.exists():
+        return build_eval_catalog()
+    catalog_mtime = path.stat().st_mtime
+    with open(path, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+
+    dirs = _eval_dirs()
+    models = catalog.setdefault("models", {})
+    for eval_folder in set(models) - set(dirs):
+        del models[eval_folder]
+    for eval_folder, marker in dirs.items():
+        if eval_folder in models and marker.stat().st_mtime <= catalog_mtime:
+            continue
+        fresh = _catalog_model(eval_folder)
+        if fresh is None:
+            models.pop(eval_folder, None)
+        elif eval_folder in models:
+            models[eval_folder]["model_id"] = fresh["model_id"]
+            models[eval_folder]["latest"] = fresh["latest"]
+            models[eval_folder]["versions"].update(fresh["versions"])
+        else:
+            models[eval_folder] = fresh
+    return catalog
@@ -1,10 +1,14 @@
+import collections
 import json
-import joblib
-import torch
+import os
+import pickle
 from pathlib import Path
 
+from app.utils.artifact_store import resolve_artifact
 from app.utils.paths import PATHS
-from models.model_definitions import MLP_base, MLP_enhance, MLP_advanced
+
+# joblib / torch / models.model_definitions는 로드 함수 안에서 import합니다.
+# (경로 확인, config 로드만 하는 곳에서는 torch를 불러오지 않도록)
 
 
 #
@@ -20,11 +24,13 @@ def load_ml_model(model_name: str, version: str | None):
     v = (version or "baseline").strip() or "baseline"
 
     # PATHS["models_ml"] == {PROJECT_ROOT}/models/ml 라고 가정
-    model_path = Path(PATHS["models_ml"]) / model_name / v / "model.pkl"
+    model_path = resolve_artifact(Path(PATHS["models_ml"]) / model_name / v / "model.pkl")
 
     if not model_path.exists():
         raise FileNotFoundError(f"ML 모델 파일이 없습니다: {model_path}")
 
+    import joblib
+
     return joblib.load(model_path)
 
 
@@ -45,6 +51,9 @@ def _unwrap_state_dict(obj: object) -> dict:
 def _infer_arch_from_state_dict(sd: dict) -> str:
     keys = list(sd.keys())
 
+    if any(k.startswith("stacked_") for k in keys):
+        return "mlp_advanced"
+
     if any(k.startswith("input_layer.") for k in keys) or any(k.startswith("blocks.") for k in keys):
         return "mlp_advanced"
 
@@ -54,16 +63,299 @@ def _infer_arch_from_state_dict(sd: dict) -> str:
     return "mlp_base"
 
 
+def _infer_arch_kwargs(sd: dict, model_name: str, version: str | None) -> dict:
+    # hidden_dim(/n_members)은 첫 Linear 가중치 shape에서, activation은 config.json에 있으면 사용
+    kwargs = {}
+    if "stacked_w1" in sd:
+        kwargs["n_members"], kwargs["hidden_dim"] = (int(d) for d in sd["stacked_w1"].shape[:2])
+    else:
+        first_w = next((v for k, v in sd.items() if k.endswith("weight") and v.dim() == 2), None)
+        if first_w is not None:
+            kwargs["hidden_dim"] = int(first_w.shape[0])
+    try:
+        cfg = load_config(model_name, version)
+    except FileNotFoundError:
+        cfg = {}
+    activation = cfg.get("activation", (cfg.get("best_params") or {}).get("activation"))
+    if isinstance(sd.get("_extra_state"), dict):  # StackedMLPEnsemble은 가중치 안에 기록
+        activation = sd["_extra_state"].get("activation", activation)
+    if activation is not None:
+        kwargs["activation"] = activation
+    return kwargs
+
+
+#
+# CHECKPOINT MANIFEST (가중치를 읽지 않고 구조 확인 + mmap 로드)
+#
+MANIFEST_SUFFIX = ".manifest.json"
+
+_ACTIVATION_CLASS_NAMES = {
+    "ReLU": "relu",
+    "LeakyReLU": "leaky_relu",
+    "Tanh": "tanh",
+    "ELU": "elu",
+    "SELU": "selu",
+}
+
+
+def manifest_path(weight_path) -> Path:
+    """model.pt → model.manifest.json"""
+    return Path(weight_path).with_suffix(MANIFEST_SUFFIX)
+
+
+def _describe_model(model) -> dict:
+    # 모델 객체 → manifest의 구조 정보 (arch + 생성자 인자)
+    from models.model_definitions import BasicMLP, MLP_enhance, StackedMLPEnsemble
+
+    if isinstance(model, StackedMLPEnsemble):
+        m, h, d = model.stacked_w1.shape
+        return {"arch": "mlp_advanced", "input_dim": int(d), "hidden_dim": int(h),
+                "n_members": int(m), "activation": model.activation_name}
+    if isinstance(model, MLP_enhance):
+        return {"arch": "mlp_enhance", "input_dim": model.net[0].in_features, "hidden_dim": model.net[0].out_features,
+                "activation": _ACTIVATION_CLASS_NAMES.get(type(model.activation).__name__, "relu"),
+                "dropout_rate": float(model.net[3].p)}
+    if isinstance(model, BasicMLP):
+        return {"arch": "mlp_base", "input_dim": model.net[0].in_features, "hidden_dim": model.net[0].out_features}
+    return {"arch": type(model).__name__}
+
+
+class _StorageRef:
+    # data.pkl 안의 tensor 자리: (zip의 data/{key} 멤버, storage 안 원소 오프셋)
+    __slots__ = ("key", "storage_offset")
+
+    def __init__(self, key: str, storage_offset: int):
+        self.key = key
+        self.storage_offset = storage_offset
+
+
+class _Opaque:
+    # tensor가 아닌 값(_extra_state 등)은 내용 없이 자리만 차지
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __setstate__(self, state):
+        pass
+
+
+class _StorageRefUnpickler(pickle.Unpickler):
+    # torch.save의 data.pkl을 tensor를 만들지 않고 읽어 tensor → _StorageRef로 바꿉니다 (임의 클래스는 로드하지 않음)
+    def persistent_load(self, pid):
+        return str(pid[2])  # ("storage", storage_type, key, location, numel)
+
+    def find_class(self, module, name):
+        if module == "torch._utils" and name.startswith("_rebuild_tensor"):
+            return lambda storage, storage_offset, *args: _StorageRef(storage, int(storage_offset))
+        if module == "torch._utils" and name.startswith("_rebuild_parameter"):
+            return lambda data, *args: data
+        if (module, name) == ("collections", "OrderedDict"):
+            return collections.OrderedDict
+        return _Opaque
+
+
+def _zip_tensor_offsets(weight_path: Path, sd: dict) -> dict:
+    # torch.save(zip) 안에서 각 tensor 데이터가 시작하는 파일 오프셋
+    # data.pkl의 storage key → zip 멤버 {prefix}/data/{key}의 데이터 시작 위치 + storage_offset * 원소 크기
+    # (내용 비교가 아니므로 값이 같은 tensor끼리도 각자의 위치를 가짐)
+    import struct
+    import zipfile
+
+    import torch
+
+    with zipfile.ZipFile(weight_path) as zf, open(weight_path, "rb") as f:
+        pkl_name = next(n for n in zf.namelist() if n.endswith("/data.pkl"))
+        prefix = pkl_name[: -len("data.pkl")]
+        with zf.open(pkl_name) as pkl:
+            refs = _unwrap_state_dict(_StorageRefUnpickler(pkl).load())
+
+        data_start = {}
+        for info in zf.infolist():
+            if not info.filename.startswith(prefix + "data/") or info.compress_type != zipfile.ZIP_STORED:
+                continue
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack("<HH", f.read(30)[26:30])
+            data_start[info.filename[len(prefix + "data/"):]] = info.header_offset + 30 + name_len + extra_len
+
+    offsets = {}
+    for name, t in sd.items():
+        ref = refs.get(name)
+        if not torch.is_tensor(t) or not isinstance(ref, _StorageRef) or ref.key not in data_start:
+            continue
+        offsets[name] = data_start[ref.key] + ref.storage_offset * t.element_size()
+    return offsets
+
+
+def write_checkpoint_manifest(weight_path, model) -> str:
+    """
+    torch.save(model.state_dict())로 저장한 가중치 옆에 manifest(JSON)를 씁니다.
+
+    담는 정보: arch / input_dim / hidden_dim / activation (+ n_members, dropout_rate),
+    dtype, 파일 크기, SHA-256, tensor별 dtype / shape / 파일 내 오프셋.
+    load_dl_model은 manifest만 읽고 구조를 정한 뒤 가중치를 mmap으로 불러옵니다.
+    """
+    weight_path = Path(weight_path)
+    sd = model.state_dict()
+    offsets = _zip_tensor_offsets(weight_path, sd)
+    tensors = {
+        name: {"dtype": str(t.dtype).replace("torch.", ""), "shape": list(t.shape), "offset": offsets.get(name)}
+        for name, t in sd.items()
+        if hasattr(t, "dtype")
+    }
+    dtypes = {v["dtype"] for k, v in tensors.items() if not k.endswith("num_batches_tracked")}
+
+    manifest = {
+        "format_version": 1,
+        "file": weight_path.name,
+        **_describe_model(model),
+        "dtype": dtypes.pop() if len(dtypes) == 1 else "mixed",
+        "nbytes": weight_path.stat().st_size,
+        "zip_digest": _zip_directory_digest(weight_path),
+        "sha256": _weight_sha256(weight_path),
+        "tensors": tensors,
+    }
+    path = manifest_path(weight_path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    return str(path)
+
+
+# (inode, 크기, mtime) → SHA-256: 같은 파일을 다시 로드할 때는 해시를 다시 계산하지 않음
+_SHA256_CACHE: dict[tuple, str] = {}
+
+
+def _weight_sha256(weight_path: Path) -> str:
+    from app.utils.artifact_store import sha256_file
+
+    st = Path(weight_path).stat()
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    if key not in _SHA256_CACHE:
+        _SHA256_CACHE[key] = sha256_file(weight_path)
+    return _SHA256_CACHE[key]
+
+
+def _zip_directory_digest(weight_path: Path) -> str | None:
+    # zip 중앙 디렉터리(멤버 이름 / CRC-32 / 크기 / 오프셋)의 해시: 파일 끝의 목록만 읽고 tensor 데이터는 읽지 않음
+    # 멤버마다 CRC-32가 있으므로 크기가 같은 재저장도 대부분 구분됨 (zip이 아니면 None)
+    import hashlib
+    import zipfile
+
+    if not zipfile.is_zipfile(weight_path):
+        return None
+    h = hashlib.sha256()
+    with zipfile.ZipFile(weight_path) as zf:
+        for info in zf.infolist():
+            h.update(f"{info.filename}\0{info.CRC}\0{info.file_size}\0{info.header_offset}\n".encode())
+    return h.hexdigest()
+
+
+def read_checkpoint_manifest(weight_path, verify: bool = False) -> dict | None:
+    """
+    manifest가 있고 가중치 파일이 기록과 맞으면 반환합니다.
+    가중치만 따로 다시 저장되어 내용이 달라졌으면 None → 기존 방식(state_dict 키로 추론)으로 로드.
+
+    기본 확인은 파일 크기 + zip 중앙 디렉터리 해시(zip_digest)로, tensor 데이터는 읽지 않습니다.
+    verify=True면 파일 전체 SHA-256까지 비교합니다 (프로세스 안에서 (inode, 크기, mtime)별로 한 번만 계산).
+    """
+    path = manifest_path(weight_path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    weight_path = Path(weight_path)
+    if manifest.get("nbytes") != weight_path.stat().st_size:
+        return None
+    if "zip_digest" not in manifest or manifest["zip_digest"] != _zip_directory_digest(weight_path):
+        return None
+    if verify and manifest.get("sha256") != _weight_sha256(weight_path):
+        return None
+    return manifest
+
+
+def inspect_dl_model(model_name: str, version: str | None, verify: bool = False) -> dict:
+    """
+    가중치 tensor를 읽지 않고 저장된 DL 모델의 구조 정보(manifest)를 반환합니다. 없으면 FileNotFoundError.
+    verify=True면 파일 전체 SHA-256까지 확인합니다 (가중치를 한 번 끝까지 읽음).
+    """
+    weight_path = dl_weight_path(model_name, version)
+    manifest = read_checkpoint_manifest(weight_path, verify=verify)
+    if manifest is None:
+        raise FileNotFoundError(f"manifest가 없거나 가중치와 맞지 않습니다: {manifest_path(weight_path)}")
+    return manifest
+
+
+def _load_state_dict_mmap(weight_path: Path) -> dict:
+    # zip 형식(torch>=1.6 기본)은 mmap으로: 가중치 페이지는 접근할 때 읽히고 프로세스 간 page cache를 공유
+    import zipfile
+
+    import torch
+
+    if zipfile.is_zipfile(weight_path):
+        return _unwrap_state_dict(torch.load(weight_path, map_location="cpu", mmap=True))
+    return _unwrap_state_dict(torch.load(weight_path, map_location="cpu"))
+
+
+QUANT_SUFFIX = "_int8"
+QUANT_WEIGHT_FILE = "model_int8.pt"
+QUANT_REPORT_FILE = "quant_report.json"
+
+
+def quantize_dl_model(model):
+    """
+    Linear 레이어만 dynamic int8 양자화 (CPU 추론 전용).
+    가중치는 int8로 저장되고, 활성값은 실행 시점에 동적으로 양자화됩니다.
+
+    nn.Linear가 없는 모델(StackedMLPEnsemble은 bmm용 stacked 파라미터만 가짐)은 바뀌는 것이 없으므로 ValueError.
+    """
+    import torch
+
+    if not any(isinstance(m, torch.nn.Linear) for m in model.modules()):
+        raise ValueError(f"{type(model).__name__}에는 양자화할 nn.Linear가 없습니다 (dynamic int8은 Linear 전용).")
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model.cpu(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def quantized_model_dir(model_name: str, version: str | None) -> Path:
+    """양자화 모델 버전 폴더: models/dl/{model_name}/{version}_int8/"""
+    v = (version or "baseline").strip() or "baseline"
+    return Path(PATHS["models_dl"]) / model_name / f"{v}{QUANT_SUFFIX}"
+
+
+def quant_source(weight_path) -> dict:
+    """
+    int8 가중치를 만든 fp32 가중치의 식별 정보 (quant_report.json의 "source").
+    manifest가 맞으면 기록된 SHA-256을 쓰고, 없을 때만 파일 전체를 해시합니다.
+    """
+    weight_path = Path(weight_path)
+    manifest = read_checkpoint_manifest(weight_path)
+    sha = manifest["sha256"] if manifest and manifest.get("sha256") else _weight_sha256(weight_path)
+    return {"file": weight_path.name, "size": weight_path.stat().st_size, "sha256": sha}
+
+
+def _stale_int8_reason(q_dir: Path, weight_path: Path) -> str | None:
+    # 저장된 int8 가중치가 현재 fp32 가중치 / 자기 자신과 맞지 않으면 그 이유, 맞으면 None
+    from app.utils.artifact_store import sha256_file
+
+    report_path = q_dir / QUANT_REPORT_FILE
+    if not report_path.exists():
+        return f"{QUANT_REPORT_FILE}가 없음"
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    source = report.get("source") or {}
+    current = quant_source(weight_path)
+    if (source.get("size"), source.get("sha256")) != (current["size"], current["sha256"]):
+        return "fp32 가중치가 양자화 이후 바뀜"
+    if report.get("int8_sha256") != sha256_file(resolve_artifact(q_dir / QUANT_WEIGHT_FILE)):
+        return f"{QUANT_WEIGHT_FILE}가 {QUANT_REPORT_FILE}와 맞지 않음"
+    return None
+
+
 #
 # DL MODEL
 #
-def load_dl_model(
-    model_name: str,
-    version: str | None,
-    input_dim: int,
-    device: str = "cpu",
-    auto_fix_arch: bool = True,
-):
+def dl_weight_path(model_name: str, version: str | None) -> Path:
+    """models/dl/{model_name}/{version}/ 아래 가중치 파일 (model.pt > weights.pt > {model_name}.pt)"""
     if version:
         weight_dir = PATHS["models_dl"] / model_name / version
     else:
@@ -74,13 +366,53 @@ def load_dl_model(
         weight_dir / "weights.pt",
         weight_dir / f"{model_name}.pt",
     ]
-    weight_path = next((p for p in candidates if p.exists()), None)
+    weight_path = next((p for p in map(resolve_artifact, candidates) if p.exists()), None)
     if weight_path is None:
         raise FileNotFoundError(f"DL 모델 파일이 없습니다. 탐색 후보: {candidates}")
+    return weight_path
+
+
+def load_dl_model(
+    model_name: str,
+    version: str | None,
+    input_dim: int,
+    device: str = "cpu",
+    auto_fix_arch: bool = True,
+    quantize: bool = False,
+    verify: bool = False,
+):
+    """
+    DL 모델 로드 (.pt)
+
+    가중치 옆에 manifest(model.manifest.json, save_model_and_artifacts가 작성)가 있으면
+    구조는 manifest에서 정하고, 가중치는 torch.load(mmap=True)로 연결합니다.
+    여러 프로세스가 같은 모델을 불러도 가중치 페이지는 OS page cache 하나를 공유합니다.
+    manifest 확인은 크기 + zip 목록 해시만 보며, verify=True면 파일 전체 SHA-256까지 비교합니다.
+
+    quantize=True면 Linear 레이어를 dynamic int8로 양자화한 CPU 추론 모델을 반환합니다
+    (nn.Linear가 없는 mlp_advanced는 ValueError).
+    models/dl/{model_name}/{version}_int8/model_int8.pt가 있으면 그 가중치를 사용합니다
+    (export.export_quantized_model로 생성). quant_report.json에 기록된 원본(fp32) SHA-256 / 크기가
+    현재 model.pt와 다르면(같은 버전으로 다시 학습) 오래된 int8 가중치는 쓰지 않고 fp32에서 다시 양자화합니다.
+    """
+    import torch
+
+    from models.model_definitions import BasicMLP as MLP_base, MLP_enhance, StackedMLPEnsemble
 
-    ckpt = torch.load(weight_path, map_location=device)
-    sd = _unwrap_state_dict(ckpt)
-    arch = _infer_arch_from_state_dict(sd)
+    weight_path = dl_weight_path(model_name, version)
+    manifest = read_checkpoint_manifest(weight_path, verify=verify)
+
+    if manifest is not None:
+        # manifest만으로 구조 결정 (가중치는 모델 껍데기를 만든 뒤 mmap으로 연결)
+        sd = None
+        arch = manifest["arch"]
+        arch_kwargs = {k: manifest[k] for k in ("hidden_dim", "activation", "n_members", "dropout_rate") if k in manifest}
+    else:
+        sd = _load_state_dict_mmap(weight_path)
+        arch = _infer_arch_from_state_dict(sd)
+        arch_kwargs = _infer_arch_kwargs(sd, model_name, version)
+        if arch == "mlp_advanced" and "stacked_w1" not in sd:
+            raise ValueError("mlp_advanced는 StackedMLPEnsemble.from_members()로 저장한 가중치만 지원합니다.")
 
     # 저장된 가중치 구조가 다른 모델이면 자동으로 맞춰 로드
     actual_name = model_name
@@ -88,19 +420,37 @@ def load_dl_model(
         actual_name = arch
         print(f"[WARN] weight file seems '{arch}' but requested '{model_name}'. path={weight_path}")
 
-    if actual_name == "mlp_base":
-        model = MLP_base(input_dim)
-    elif actual_name == "mlp_enhance":
-        model = MLP_enhance(input_dim)
-    elif actual_name == "mlp_advanced":
-        model = MLP_advanced(input_dim)
-    else:
-        raise ValueError(f"Unknown DL model: {actual_name}")
-
-    model.load_state_dict(sd, strict=True)
+    # meta device에서 껍데기만 만들고 assign=True로 mmap된 tensor를 그대로 연결 (초기화/복사 없음)
+    with torch.device("meta"):
+        if actual_name == "mlp_base":
+            model = MLP_base(input_dim, hidden_dim=arch_kwargs.get("hidden_dim", 128))
+        elif actual_name == "mlp_enhance":
+            model = MLP_enhance(input_dim, **arch_kwargs)
+        elif actual_name == "mlp_advanced":
+            model = StackedMLPEnsemble(input_dim, **arch_kwargs)
+        else:
+            raise ValueError(f"Unknown DL model: {actual_name}")
+
+    if sd is None:
+        sd = _load_state_dict_mmap(weight_path)
+    model.load_state_dict(sd, strict=True, assign=True)
     model.to(device)
     model.eval()
 
+    if quantize:
+        if device != "cpu":
+            raise ValueError("quantize=True는 CPU 추론 전용입니다.")
+        model = quantize_dl_model(model)
+        q_dir = quantized_model_dir(model_name, version)
+        q_path = resolve_artifact(q_dir / QUANT_WEIGHT_FILE)
+        if q_path.exists():
+            stale = _stale_int8_reason(q_dir, weight_path)
+            if stale is None:
+                model.load_state_dict(torch.load(q_path, map_location="cpu", weights_only=True))
+                weight_path = q_path
+            else:
+                print(f"[WARN] int8 weights ignored ({stale}); re-quantized from fp32. path={q_path}")
+
     # ✅ 핵심: model + 실제 모델명 + weight 경로를 같이 리턴
     return model, actual_name, str(weight_path)
 
@@ -119,11 +469,13 @@ def load_scaler(model_name: str, version: str | None):
     v = (version or "baseline").strip() or "baseline"
 
     base = Path(PATHS["models_preprocessing"])  # == {PROJECT_ROOT}/models/preprocessing
-    scaler_path = base / model_name / v / "scaler.pkl"
+    scaler_path = resolve_artifact(base / model_name / v / "scaler.pkl")
 
     if not scaler_path.exists():
         raise FileNotFoundError(f"Scaler 파일이 없습니다: {scaler_path}")
 
+    import joblib
+
     return joblib.load(scaler_path)
 
 #
@@ -1,9 +1,123 @@
-from sklearn.metrics import roc_auc_score, average_precision_score, brier_score_loss
-from scipy.stats import ks_2samp
+# sklearn은 evaluate_churn_metrics 안에서만 import합니다 (대시보드 페이지 시작 시간 단축).
+from concurrent.futures import ProcessPoolExecutor
+import os
+
 import pandas as pd
 import numpy as np
 
 
+# Top-K 구간 (evaluate_churn_metrics 랭킹 테이블 / save eval JSON)
+RANKING_K_PCTS = [5, 10, 15, 20, 25, 30]
+EVAL_K_PCTS = [5, 10, 15, 30]
+
+# 0.1% 단위 전체 구간 (0.1, 0.2, ..., 100.0)
+DENSE_K_PCTS = np.arange(1, 1001) / 10
+
+# score_percentiles.json 구간 (0.1% 단위, 상위 50%까지 — 그보다 낮은 점수는 "상위 50% 밖")
+PERCENTILE_K_PCTS = DENSE_K_PCTS[DENSE_K_PCTS <= 50]
+
+
+def n_selected_at_k(n: int, k_pcts) -> np.ndarray:
+    """
+    상위 K%에 해당하는 선택 인원 수 (팀 규칙: floor, 최소 1명).
+
+    k_pcts는 0.1% 같은 소수 구간도 허용합니다.
+    (부동소수 오차로 floor가 한 칸 내려가지 않도록 1e-9 보정)
+    """
+    k = np.asarray(k_pcts, dtype=float).reshape(-1)
+    n_sel = np.floor(n * k / 100 + 1e-9).astype(np.int64)
+    return np.clip(n_sel, 1, max(int(n), 1))
+
+
+# 최대 K가 전체의 이 비율 이하이면 전체 정렬 대신 부분 선택(O(n)) 경로 사용
+# (benchmarks/bench_topk.py, n=1M 기준: 5% 약 10배, 30% 약 3.5배, 60% 약 1.2배 빠름)
+PARTIAL_SORT_MAX_FRAC = 0.5
+
+
+def top_n_order(y_prob, n_top: int) -> np.ndarray:
+    """
+    점수 상위 n_top개의 인덱스를 내림차순으로 반환합니다.
+
+    np.argsort(-y_prob, kind="stable")[:n_top]과 결과가 완전히 같습니다
+    (tie_policy = "sort_and_take_top_n": 경계 동점은 입력 순서가 앞선 샘플부터).
+    np.partition으로 n_top번째 점수(t)를 O(n)에 찾고,
+    선택된 n_top개만 정렬하므로 O(n + n_top log n_top)입니다.
+    """
+    y_prob = np.asarray(y_prob, dtype=float).reshape(-1)
+    n = len(y_prob)
+    n_top = int(min(max(n_top, 0), n))
+    if n_top == 0:
+        return np.zeros(0, dtype=np.int64)
+    if n_top == n:
+        return np.argsort(-y_prob, kind="stable")
+
+    t = -np.partition(-y_prob, n_top - 1)[n_top - 1]
+
+    above = np.flatnonzero(y_prob > t)
+    ties = np.flatnonzero(y_prob == t)[: n_top - len(above)]
+    sel = np.sort(np.concatenate([above, ties]))
+
+    return sel[np.argsort(-y_prob[sel], kind="stable")]
+
+
+def topk_metrics(y_true, y_prob, k_pcts=EVAL_K_PCTS) -> dict:
+    """
+    한 번의 정렬 + 누적 양성 수(cumsum)로 여러 K%의 Top-K 지표를 한꺼번에 계산합니다.
+
+    정렬은 점수 내림차순 stable sort (동점이면 입력 순서 유지,
+    tie_policy = "sort_and_take_top_n")이며, K 개수와 무관하게 정렬은 1회입니다.
+    최대 K가 PARTIAL_SORT_MAX_FRAC 이하이면 상위 구간만 부분 선택(top_n_order)합니다.
+
+    Args:
+        y_true (array-like): 실제값 (0 또는 1).
+        y_prob (array-like): 예측 확률.
+        k_pcts (array-like): K% 목록 (예: [5, 10, 15, 30] 또는 DENSE_K_PCTS).
+
+    Returns:
+        dict: k_pct, n_selected, tp, precision, recall, lift, cutoff (K 순서의 np.ndarray)
+              + base_rate, n_total, n_positive (스칼라).
+
+    사용 예시:
+        >>> res = topk_metrics(y_test, y_prob, DENSE_K_PCTS)
+        >>> res["lift"][49]  # 상위 5.0%
+    """
+    y_true = np.asarray(y_true).astype(np.int64).reshape(-1)
+    y_prob = np.asarray(y_prob, dtype=float).reshape(-1)
+    k = np.asarray(k_pcts, dtype=float).reshape(-1)
+
+    n = len(y_prob)
+    n_sel = n_selected_at_k(n, k)
+
+    n_top = int(n_sel.max()) if n > 0 else 0
+    if n_top <= PARTIAL_SORT_MAX_FRAC * n:
+        order = top_n_order(y_prob, n_top)
+    else:
+        order = np.argsort(-y_prob, kind="stable")
+    cum_pos = np.cumsum(y_true[order])
+
+    n_pos = int(y_true.sum())
+    base_rate = n_pos / n if n > 0 else 0.0
+
+    tp = cum_pos[n_sel - 1]
+    precision = tp / n_sel
+    recall = tp / max(n_pos, 1)
+    lift = precision / base_rate if base_rate > 0 else np.zeros_like(precision)
+    cutoff = y_prob[order[n_sel - 1]]
+
+    return {
+        "k_pct": k,
+        "n_selected": n_sel,
+        "tp": tp,
+        "precision": precision,
+        "recall": recall,
+        "lift": lift,
+        "cutoff": cutoff,
+        "base_rate": float(base_rate),
+        "n_total": int(n),
+        "n_positive": n_pos,
+    }
+
+
 def evaluate_churn_metrics(y_true, y_prob):
     """
     이탈 예측(Churn Prediction) 모델의 성능을 평가합니다.
@@ -21,6 +135,8 @@ def evaluate_churn_metrics(y_true, y_prob):
         >>> print(metrics['상위 5% 리프트 (Lift)'])
     """
 
+    from sklearn.metrics import average_precision_score
+
     # Ensure inputs are numpy arrays
     y_true = np.array(y_true)
     y_prob = np.array(y_prob)
@@ -28,62 +144,631 @@ def evaluate_churn_metrics(y_true, y_prob):
     # 1. PR-AUC (Average Precision)
     pr_auc = average_precision_score(y_true, y_prob)
 
-    # 2. Ranking Performance (Focus on Top 5%)
-    base_rate = y_true.mean()
-    df_res = pd.DataFrame({"label": y_true, "prob": y_prob})
-    df_res = df_res.sort_values(by="prob", ascending=False)
-
-    # Calculate for Top 5%
-    k = 5
-    count = int(len(df_res) * (k / 100))
-    if count == 0:
-        count = 1
-
-    top_k_subset = df_res.iloc[:count]
-
-    # Precision@5%
-    top_5_precision = top_k_subset["label"].mean()
-
-    # Recall@5% (Capture Rate)
-    total_positives = df_res["label"].sum()
-    captured_positives = top_k_subset["label"].sum()
-    top_5_recall = captured_positives / total_positives if total_positives > 0 else 0.0
-
-    # Lift@5%
-    lift_5 = top_5_precision / base_rate if base_rate > 0 else 0.0
+    # 2. Ranking Performance (한 번의 정렬로 모든 K 계산)
+    topk = topk_metrics(y_true, y_prob, RANKING_K_PCTS)
 
     # 3. Detailed Ranking Table (Lift by Decile/Percentile)
     ranking_list = []
-    for k in [5, 10, 15, 20, 25, 30]:
-        count_k = int(len(df_res) * (k / 100))
-        if count_k == 0:
-            count_k = 1
-
-        subset_k = df_res.iloc[:count_k]
-        prec_k = subset_k["label"].mean()
-
-        # Captured Positives
-        captured_k = subset_k["label"].sum()
-        recall_k = captured_k / total_positives if total_positives > 0 else 0.0
-
-        lift_k = prec_k / base_rate if base_rate > 0 else 0.0
-
+    for i, k in enumerate(RANKING_K_PCTS):
         ranking_list.append(
             {
                 "Top_K": f"{k}%",
-                "Precision": float(prec_k),
-                "Recall": float(recall_k),
-                "Lift": float(lift_k),
+                "Precision": float(topk["precision"][i]),
+                "Recall": float(topk["recall"][i]),
+                "Lift": float(topk["lift"][i]),
             }
         )
 
+    # Top 5% = ranking 첫 행
+    top_5 = ranking_list[0]
+
     # Summary Dictionary with Korean Keys
     metrics_result = {
         "PR-AUC (Average Precision)": float(pr_auc),
-        "상위 5% 정밀도 (Precision)": float(top_5_precision),
-        "상위 5% 재현율 (Recall)": float(top_5_recall),
-        "상위 5% 리프트 (Lift)": float(lift_5),
+        "상위 5% 정밀도 (Precision)": top_5["Precision"],
+        "상위 5% 재현율 (Recall)": top_5["Recall"],
+        "상위 5% 리프트 (Lift)": top_5["Lift"],
         "ranking": ranking_list,
     }
 
     return metrics_result
+
+
+def topk_metrics_matrix(y_true, scores, k_pcts=EVAL_K_PCTS) -> dict:
+    """
+    여러 모델의 점수 행렬(n 유저 x m 모델)에 대해 모든 모델 x 모든 K의 Top-K 지표를 한 번에 계산합니다.
+
+    열(모델)별 stable argsort 1회 + 열별 누적 양성 수로 계산하며,
+    각 열의 결과는 topk_metrics(y_true, scores[:, j], k_pcts)와 같습니다.
+
+    Args:
+        y_true (array-like): 실제값 (n,).
+        scores (array-like): 예측 확률 행렬 (n, m).
+        k_pcts (array-like): K% 목록.
+
+    Returns:
+        dict: precision, recall, lift, cutoff, tp → (m, K) np.ndarray
+              + k_pct, n_selected (K,), base_rate, n_total, n_positive.
+
+    사용 예시:
+        >>> grid = topk_metrics_matrix(df["actual"], df[model_cols].to_numpy(), [5, 10, 15, 30])
+        >>> grid["lift"][model_cols.index("XGBoost"), 0]
+    """
+    y_true = np.asarray(y_true).astype(np.int64).reshape(-1)
+    scores = np.asarray(scores, dtype=float)
+    if scores.ndim == 1:
+        scores = scores[:, None]
+    k = np.asarray(k_pcts, dtype=float).reshape(-1)
+
+    n = scores.shape[0]
+    n_sel = n_selected_at_k(n, k)
+    n_pos = int(y_true.sum())
+    base_rate = n_pos / n if n > 0 else 0.0
+
+    order = np.argsort(-scores, axis=0, kind="stable")
+    cum_pos = np.cumsum(y_true[order], axis=0)
+
+    tp = cum_pos[n_sel - 1].T                        # (m, K)
+    precision = tp / n_sel
+    recall = tp / max(n_pos, 1)
+    lift = precision / base_rate if base_rate > 0 else np.zeros_like(precision)
+    cutoff = np.take_along_axis(scores, order[n_sel - 1], axis=0).T
+
+    return {
+        "k_pct": k,
+        "n_selected": n_sel,
+        "tp": tp,
+        "precision": precision,
+        "recall": recall,
+        "lift": lift,
+        "cutoff": cutoff,
+        "base_rate": float(base_rate),
+        "n_total": int(n),
+        "n_positive": n_pos,
+    }
+
+
+def segmented_topk_metrics(y_true, y_prob, segments, k_pcts=EVAL_K_PCTS) -> pd.DataFrame:
+    """
+    세그먼트(가입 월, 디바이스 등 범주형 컬럼)별 Top-K 지표를 한 번에 계산합니다.
+
+    세그먼트별로 evaluate_churn_metrics를 반복하지 않고,
+    (세그먼트, 점수 내림차순) lexsort 1회 + 전체 누적합에서 세그먼트 시작점을 빼는
+    그룹 누적합으로 모든 세그먼트 x K를 벡터 연산으로 계산합니다.
+    세그먼트 내부 동점 처리/선택 규칙은 topk_metrics와 같습니다 (floor, 최소 1명, stable).
+
+    Args:
+        y_true (array-like): 실제값 (0 또는 1).
+        y_prob (array-like): 예측 확률.
+        segments (array-like | pd.Series | pd.DataFrame): 세그먼트 값.
+            DataFrame이면 여러 컬럼 조합을 하나의 세그먼트로 봅니다.
+        k_pcts (array-like): K% 목록.
+
+    Returns:
+        pd.DataFrame: 세그먼트 컬럼 + k_pct, n_total, n_positive, base_rate, n_selected,
+                      precision, recall, lift(세그먼트 base rate 대비),
+                      lift_vs_overall(전체 base rate 대비), cutoff.
+
+    사용 예시:
+        >>> seg = segmented_topk_metrics(y_test, y_prob, test_df[["signup_month", "device"]])
+        >>> seg.query("k_pct == 5").sort_values("lift", ascending=False)
+    """
+    y_true = np.asarray(y_true).astype(np.int64).reshape(-1)
+    y_prob = np.asarray(y_prob, dtype=float).reshape(-1)
+    k = np.asarray(k_pcts, dtype=float).reshape(-1)
+
+    if isinstance(segments, pd.DataFrame):
+        codes, uniques = pd.MultiIndex.from_frame(segments).factorize(sort=True)
+        seg_frame = uniques.set_names(list(segments.columns)).to_frame(index=False)
+    else:
+        name = segments.name if isinstance(segments, pd.Series) and segments.name else "segment"
+        codes, uniques = pd.factorize(np.asarray(segments), sort=True, use_na_sentinel=False)
+        seg_frame = pd.DataFrame({name: uniques})
+
+    # 세그먼트 오름차순, 세그먼트 안에서는 점수 내림차순 (lexsort는 stable)
+    order = np.lexsort((-y_prob, codes))
+    y_sorted = y_true[order]
+    cum_pos = np.concatenate([[0], np.cumsum(y_sorted)])
+
+    n_groups = len(seg_frame)
+    n_g = np.bincount(codes, minlength=n_groups)
+    start = np.concatenate([[0], np.cumsum(n_g)[:-1]])
+    pos_g = cum_pos[start + n_g] - cum_pos[start]
+
+    # (G, K) 그리드
+    n_sel = np.floor(n_g[:, None] * k[None, :] / 100 + 1e-9).astype(np.int64)
+    n_sel = np.clip(n_sel, 1, np.maximum(n_g, 1)[:, None])
+    end = start[:, None] + n_sel                      # 선택 구간 [start, end)
+
+    tp = cum_pos[end] - cum_pos[start][:, None]
+    base_rate = pos_g / np.maximum(n_g, 1)
+    overall_rate = y_true.mean() if len(y_true) > 0 else 0.0
+
+    precision = tp / n_sel
+    recall = tp / np.maximum(pos_g, 1)[:, None]
+    lift = np.divide(
+        precision, base_rate[:, None],
+        out=np.zeros_like(precision), where=base_rate[:, None] > 0,
+    )
+    lift_vs_overall = precision / overall_rate if overall_rate > 0 else np.zeros_like(precision)
+    cutoff = y_prob[order[end - 1]]
+
+    out = seg_frame.loc[np.repeat(np.arange(n_groups), len(k))].reset_index(drop=True)
+    out["k_pct"] = np.tile(k, n_groups)
+    out["n_total"] = np.repeat(n_g, len(k))
+    out["n_positive"] = np.repeat(pos_g, len(k))
+    out["base_rate"] = np.repeat(base_rate, len(k))
+    out["n_selected"] = n_sel.ravel()
+    out["precision"] = precision.ravel()
+    out["recall"] = recall.ravel()
+    out["lift"] = lift.ravel()
+    out["lift_vs_overall"] = lift_vs_overall.ravel()
+    out["cutoff"] = cutoff.ravel()
+    return out
+
+
+def cumulative_gain(y_true, y_prob) -> dict:
+    """
+    모든 cutoff(상위 1명 ~ n명)의 누적 양성 수.
+
+    profit_curve()의 입력으로 쓰며, 비용 파라미터가 바뀌어도 다시 정렬할 필요가 없도록
+    정렬 결과만 분리해 둔 함수입니다 (대시보드에서는 이 결과를 캐시).
+
+    Returns:
+        dict: n_selected (1..n), tp (누적 양성 수), cutoff (n번째 점수) + n_total, n_positive, base_rate.
+    """
+    y_true = np.asarray(y_true).astype(np.int64).reshape(-1)
+    y_prob = np.asarray(y_prob, dtype=float).reshape(-1)
+
+    n = len(y_prob)
+    order = np.argsort(-y_prob, kind="stable")
+    tp = np.cumsum(y_true[order])
+    n_pos = int(tp[-1]) if n > 0 else 0
+
+    return {
+        "n_selected": np.arange(1, n + 1),
+        "tp": tp,
+        "cutoff": y_prob[order],
+        "n_total": int(n),
+        "n_positive": n_pos,
+        "base_rate": n_pos / n if n > 0 else 0.0,
+    }
+
+
+def profit_curve(
+    y_true=None,
+    y_prob=None,
+    *,
+    coupon_cost: float,
+    retained_value: float,
+    save_rate: float = 0.15,
+    gain: dict | None = None,
+) -> dict:
+    """
+    상위 n명에게 쿠폰을 보낼 때의 기대 순이익 곡선과 이익 최대 K를 계산합니다.
+
+        기대 순이익(n) = save_rate * retained_value * TP(n) - coupon_cost * n
+
+    TP(n)은 누적합 한 번으로 모든 n에 대해 구하므로 수백만 명도 벡터 연산 1회입니다.
+    gain=cumulative_gain(...)을 넘기면 정렬 없이 비용 파라미터만 바꿔 다시 계산합니다.
+
+    Args:
+        y_true, y_prob (array-like): 실제값, 예측 확률 (gain이 없을 때 필요).
+        coupon_cost (float): 1인당 쿠폰 비용.
+        retained_value (float): 이탈을 막은 고객 1명의 가치.
+        save_rate (float): 쿠폰을 받은 이탈 예정 고객이 남을 확률.
+        gain (dict, optional): cumulative_gain() 결과.
+
+    Returns:
+        dict: k_pct, n_selected, net_value (n개 곡선)
+              + best_n, best_k_pct, best_net_value, best_cutoff, best_precision, best_lift, expected_saved.
+              (모든 n에서 손해면 best_n = 0: 발송하지 않는 것이 최적)
+
+    사용 예시:
+        >>> res = profit_curve(y_test, y_prob, coupon_cost=3000, retained_value=50000)
+        >>> res["best_k_pct"], res["best_net_value"]
+    """
+    if gain is None:
+        gain = cumulative_gain(y_true, y_prob)
+
+    n = gain["n_total"]
+    n_sel = gain["n_selected"]
+    tp = gain["tp"]
+
+    net_value = save_rate * retained_value * tp - coupon_cost * n_sel
+
+    best = int(np.argmax(net_value)) if n > 0 else 0
+    has_profit = n > 0 and net_value[best] > 0
+
+    result = {
+        "k_pct": n_sel / max(n, 1) * 100,
+        "n_selected": n_sel,
+        "net_value": net_value,
+        "best_n": 0,
+        "best_k_pct": 0.0,
+        "best_net_value": 0.0,
+        "best_cutoff": None,
+        "best_precision": 0.0,
+        "best_lift": 0.0,
+        "expected_saved": 0.0,
+    }
+    if has_profit:
+        precision = tp[best] / n_sel[best]
+        base_rate = gain["base_rate"]
+        result.update({
+            "best_n": int(n_sel[best]),
+            "best_k_pct": float(n_sel[best] / n * 100),
+            "best_net_value": float(net_value[best]),
+            "best_cutoff": float(gain["cutoff"][best]),
+            "best_precision": float(precision),
+            "best_lift": float(precision / base_rate) if base_rate > 0 else 0.0,
+            "expected_saved": float(save_rate * tp[best]),
+        })
+    return result
+
+
+class ScoreHistogram:
+    """
+    (label, score) 배치를 고정 메모리 히스토그램으로 누적하는 스트리밍 평가기.
+
+    전체 y_true / y_prob 배열을 메모리에 올리지 않고, 청크 단위 스코어링과
+    나란히 PR-AUC / base rate / Top-K 지표를 계산합니다.
+    bin별 양성/음성 카운트만 보관하므로 메모리는 n_bins에만 비례하고(기본 약 1.6MB),
+    샤드/프로세스별 히스토그램은 merge()로 합칠 수 있습니다(덧셈이라 순서 무관).
+
+    오차 범위 (bin 내부 순서만 알 수 없으므로 그 범위 안에서 최악/최선을 계산):
+        - PR-AUC: pr_auc_bounds()가 [하한, 상한]을 반환 (정확한 AP는 항상 이 구간 안)
+        - Top-K: 경계 bin의 TP를 선형 보간으로 추정, tp_lo/tp_hi로 구간 제공
+        - cutoff: bin 하한 경계값 (오차 ≤ bin 폭 = (hi - lo) / n_bins)
+
+    사용 예시:
+        >>> hist = ScoreHistogram()
+        >>> for X_chunk, y_chunk in chunks:
+        ...     hist.update(y_chunk, predict_proba_dl(model, X_chunk))
+        >>> hist.merge(other_shard_hist)
+        >>> hist.pr_auc(), hist.topk([5, 10])["lift"]
+    """
+
+    def __init__(self, n_bins: int = 100_000, lo: float = 0.0, hi: float = 1.0):
+        if n_bins < 1 or not hi > lo:
+            raise ValueError("n_bins >= 1, hi > lo 이어야 합니다.")
+        self.n_bins = int(n_bins)
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.pos = np.zeros(self.n_bins, dtype=np.int64)
+        self.neg = np.zeros(self.n_bins, dtype=np.int64)
+
+    # ----------------------------
+    # 누적 / 병합
+    # ----------------------------
+    def _bin_index(self, y_prob: np.ndarray) -> np.ndarray:
+        scaled = (y_prob - self.lo) / (self.hi - self.lo) * self.n_bins
+        return np.clip(np.floor(scaled), 0, self.n_bins - 1).astype(np.int64)
+
+    def update(self, y_true, y_prob) -> "ScoreHistogram":
+        y_true = np.asarray(y_true).astype(bool).reshape(-1)
+        y_prob = np.asarray(y_prob, dtype=float).reshape(-1)
+        if len(y_true) != len(y_prob):
+            raise ValueError("y_true와 y_prob 길이가 다릅니다.")
+
+        idx = self._bin_index(y_prob)
+        self.pos += np.bincount(idx[y_true], minlength=self.n_bins)
+        self.neg += np.bincount(idx[~y_true], minlength=self.n_bins)
+        return self
+
+    def merge(self, other: "ScoreHistogram") -> "ScoreHistogram":
+        if (self.n_bins, self.lo, self.hi) != (other.n_bins, other.lo, other.hi):
+            raise ValueError("bin 설정(n_bins, lo, hi)이 다른 히스토그램은 병합할 수 없습니다.")
+        self.pos += other.pos
+        self.neg += other.neg
+        return self
+
+    def save(self, path) -> None:
+        np.savez_compressed(
+            path, pos=self.pos, neg=self.neg,
+            bins=np.array([self.n_bins, self.lo, self.hi], dtype=float),
+        )
+
+    @classmethod
+    def load(cls, path) -> "ScoreHistogram":
+        with np.load(path) as z:
+            n_bins, lo, hi = z["bins"]
+            hist = cls(int(n_bins), float(lo), float(hi))
+            hist.pos[:] = z["pos"]
+            hist.neg[:] = z["neg"]
+        return hist
+
+    # ----------------------------
+    # 지표
+    # ----------------------------
+    @property
+    def n_total(self) -> int:
+        return int(self.pos.sum() + self.neg.sum())
+
+    @property
+    def n_positive(self) -> int:
+        return int(self.pos.sum())
+
+    @property
+    def base_rate(self) -> float:
+        n = self.n_total
+        return self.n_positive / n if n > 0 else 0.0
+
+    @property
+    def bin_width(self) -> float:
+        return (self.hi - self.lo) / self.n_bins
+
+    def _descending(self):
+        # 점수 내림차순 bin 순서의 (양성, 전체, 이전까지 누적 양성, 이전까지 누적 전체)
+        pos = self.pos[::-1]
+        cnt = pos + self.neg[::-1]
+        cum_pos = np.cumsum(pos)
+        cum_cnt = np.cumsum(cnt)
+        return pos, cnt, cum_pos - pos, cum_cnt - cnt
+
+    def pr_auc(self) -> float:
+        """bin 하나를 동점 그룹으로 보는 AP (sklearn average_precision_score와 같은 정의)."""
+        n_pos = self.n_positive
+        if n_pos == 0:
+            return 0.0
+        pos, cnt, prev_pos, prev_cnt = self._descending()
+        m = pos > 0
+        precision = (prev_pos[m] + pos[m]) / (prev_cnt[m] + cnt[m])
+        return float(np.sum(pos[m] * precision) / n_pos)
+
+    def pr_auc_bounds(self) -> tuple[float, float]:
+        """bin 내부 순서가 최악/최선일 때의 AP (정확한 PR-AUC는 이 구간 안에 있음)."""
+        n_pos = self.n_positive
+        if n_pos == 0:
+            return 0.0, 0.0
+        pos, cnt, prev_pos, prev_cnt = self._descending()
+        m = pos > 0
+        neg = cnt[m] - pos[m]
+        # bin 안의 양성 precision은 (음성이 모두 앞) ~ (양성이 모두 앞) 사이
+        lo = (prev_pos[m] + 1) / (prev_cnt[m] + neg + 1)
+        hi = (prev_pos[m] + pos[m]) / (prev_cnt[m] + pos[m])
+        return (
+            float(np.sum(pos[m] * lo) / n_pos),
+            float(np.sum(pos[m] * hi) / n_pos),
+        )
+
+    def topk(self, k_pcts=EVAL_K_PCTS) -> dict:
+        """
+        topk_metrics()와 같은 키의 근사 Top-K 지표.
+
+        경계 bin 안에서는 양성이 균일하게 섞여 있다고 보고 TP를 보간하며,
+        tp_lo / tp_hi(경계 bin 내부 순서 최악/최선)로 오차 구간을 함께 반환합니다.
+        """
+        k = np.asarray(k_pcts, dtype=float).reshape(-1)
+        n = self.n_total
+        n_pos = self.n_positive
+        base_rate = self.base_rate
+        n_sel = n_selected_at_k(n, k)
+
+        pos, cnt, prev_pos, prev_cnt = self._descending()
+        # n_sel번째 샘플이 들어있는 bin
+        b = np.searchsorted(prev_cnt + cnt, n_sel, side="left")
+        b = np.minimum(b, self.n_bins - 1)
+
+        take = n_sel - prev_cnt[b]
+        bin_cnt = np.maximum(cnt[b], 1)
+        tp = prev_pos[b] + take * pos[b] / bin_cnt
+        tp_lo = prev_pos[b] + np.maximum(take - (cnt[b] - pos[b]), 0)
+        tp_hi = prev_pos[b] + np.minimum(take, pos[b])
+
+        precision = tp / n_sel
+        recall = tp / max(n_pos, 1)
+        lift = precision / base_rate if base_rate > 0 else np.zeros_like(precision)
+        # 내림차순 b번째 bin == 오름차순 (n_bins - 1 - b)번째 bin의 하한 경계
+        cutoff = self.lo + (self.n_bins - 1 - b) * self.bin_width
+
+        return {
+            "k_pct": k,
+            "n_selected": n_sel,
+            "tp": tp,
+            "tp_lo": tp_lo,
+            "tp_hi": tp_hi,
+            "precision": precision,
+            "recall": recall,
+            "lift": lift,
+            "cutoff": cutoff,
+            "cutoff_err": self.bin_width,
+            "base_rate": float(base_rate),
+            "n_total": int(n),
+            "n_positive": n_pos,
+        }
+
+    def percentile_table(self, pcts=PERCENTILE_K_PCTS) -> dict:
+        """
+        상위 pct% cutoff 테이블 (score_percentiles.json 형식, 기본 0.1% 단위 / 상위 50%까지).
+
+        테이블의 가장 넓은 pct가 "밖" 경계가 됩니다 (inference.percentile_labels: "상위 50% 밖").
+        100%까지 만들면 모든 점수가 어떤 구간 "이내"가 되므로 기본값은 50%에서 끊습니다.
+
+        cutoff는 Top-K 규칙(floor(n * pct / 100)번째 점수)이 들어있는 bin의 하한 경계입니다.
+        오차 범위:
+            - score: 정확한 cutoff보다 최대 bin 폭만큼 낮음 (0 ≤ 정확값 - cutoff < bin_width)
+            - rank: cutoff 이상으로 분류되는 비율이 정확한 pct보다 최대 경계 bin 비율만큼 큼
+                    (rank_err_pct = 경계 bin 샘플 수 / n * 100의 최댓값)
+
+        pct 오름차순 / score 내림차순이라 inference.prepare_percentile_table이
+        정렬 없이 바로 searchsorted에 사용합니다.
+        """
+        topk = self.topk(pcts)
+        n = max(topk["n_total"], 1)
+
+        pos, cnt, prev_pos, prev_cnt = self._descending()
+        b = np.minimum(np.searchsorted(prev_cnt + cnt, topk["n_selected"], side="left"), self.n_bins - 1)
+        rank_err = float(np.max(cnt[b]) / n * 100) if len(b) else 0.0
+
+        return {
+            "n_total": topk["n_total"],
+            "pct": [float(p) for p in np.round(topk["k_pct"], 6)],
+            "score": [float(c) for c in np.round(topk["cutoff"], 8)],
+            "error_bound": {"score": self.bin_width, "rank_pct": rank_err},
+            "sketch": {"type": "ScoreHistogram", "n_bins": self.n_bins, "lo": self.lo, "hi": self.hi},
+        }
+
+
+# ============================
+# Bootstrap 신뢰구간
+# ============================
+BOOTSTRAP_METHODS = ("poisson", "multinomial")
+
+# 한 배치에서 (replicate x n) 배열 원소 수 상한 (float32 기준 약 128MB)
+_BOOTSTRAP_BATCH_ELEMS = 2 ** 25
+
+
+def _poisson1_table(bits: int = 16) -> np.ndarray:
+    # Poisson(1) 역CDF 룩업 테이블: uint16 난수 → 가중치
+    # (CDF 양자화 오차 ≤ 2^-16, P(X > 8) ≈ 1e-6 꼬리는 8로 절단)
+    k = np.arange(20)
+    pmf = np.exp(-1.0) / np.cumprod(np.maximum(k, 1))
+    u = (np.arange(2 ** bits) + 0.5) / 2 ** bits
+    return np.searchsorted(np.cumsum(pmf), u).astype(np.float32)
+
+
+_POISSON1_TABLE = _poisson1_table()
+
+
+def _bootstrap_weights(rng, method: str, b: int, n: int) -> np.ndarray:
+    if method == "poisson":
+        # rng.poisson보다 약 5배 빠름
+        return _POISSON1_TABLE[rng.integers(0, 2 ** 16, size=(b, n), dtype=np.uint16)]
+    # multinomial: n개 복원추출 → 각 샘플이 뽑힌 횟수
+    draws = rng.integers(0, n, size=(b, n)) + (np.arange(b) * n)[:, None]
+    return np.bincount(draws.ravel(), minlength=b * n).reshape(b, n).astype(np.float32)
+
+
+def _bootstrap_worker(args) -> dict:
+    y_sorted, group_end, k_pcts, n_rep, method, seed = args
+    rng = np.random.default_rng(seed)
+    n = len(y_sorted)
+    pos_idx = np.flatnonzero(y_sorted)
+    pos_end = group_end[pos_idx]
+    k = np.asarray(k_pcts, dtype=float)
+
+    batch = max(1, _BOOTSTRAP_BATCH_ELEMS // max(n, 1))
+    out = {
+        "pr_auc": np.zeros(n_rep),
+        "precision": np.zeros((n_rep, len(k))),
+        "recall": np.zeros((n_rep, len(k))),
+        "lift": np.zeros((n_rep, len(k))),
+    }
+
+    for start in range(0, n_rep, batch):
+        b = min(batch, n_rep - start)
+        rows = slice(start, start + b)
+        w = _bootstrap_weights(rng, method, b, n)
+
+        # 점수 내림차순으로 이미 정렬된 상태 → 가중 누적합 한 번으로 모든 지표 계산
+        cw = np.cumsum(w, axis=1)
+        ctp = np.cumsum(w * y_sorted, axis=1)
+        w_total = cw[:, -1]
+        p_total = ctp[:, -1]
+        safe_p = np.maximum(p_total, 1)
+
+        # PR-AUC: 양성 샘플마다 (동점 그룹 끝) precision을 가중 평균
+        prec_at_pos = ctp[:, pos_end] / np.maximum(cw[:, pos_end], 1)
+        out["pr_auc"][rows] = np.sum(w[:, pos_idx] * prec_at_pos, axis=1) / safe_p
+
+        # Top-K: replicate별 표본 크기 기준 floor(n * k / 100)
+        base_rate = p_total / np.maximum(w_total, 1)
+        r = np.arange(b)
+        n_sel = np.maximum(np.floor(w_total[:, None] * k / 100 + 1e-9), 1)
+        # cw는 행마다 단조 증가 → 행별 searchsorted로 K 경계 위치
+        idx_all = np.stack([np.searchsorted(cw[i], n_sel[i]) for i in range(b)])
+        idx_all = np.minimum(idx_all, n - 1)
+        for j in range(len(k)):
+            idx = idx_all[:, j]
+            tp = ctp[r, idx]
+            prec = tp / np.maximum(cw[r, idx], 1)
+            out["precision"][rows, j] = prec
+            out["recall"][rows, j] = tp / safe_p
+            out["lift"][rows, j] = np.divide(prec, base_rate, out=np.zeros(b), where=base_rate > 0)
+
+    return out
+
+
+def bootstrap_ci(
+    y_true,
+    y_prob,
+    k_pcts=EVAL_K_PCTS,
+    n_boot: int = 1000,
+    method: str = "poisson",
+    alpha: float = 0.05,
+    n_jobs: int | None = None,
+    seed: int = 42,
+) -> dict:
+    """
+    PR-AUC와 Top-K Precision/Recall/Lift의 bootstrap 신뢰구간(percentile 방식).
+
+    점수는 한 번만 정렬하고, replicate는 원본을 다시 뽑는 대신
+    샘플 가중치(poisson: Poisson(1), multinomial: n개 복원추출 횟수) 행렬로 표현합니다.
+    (replicate x n) 가중치 배치에 누적합을 한 번 적용해 모든 지표를 얻고,
+    replicate는 프로세스 풀(n_jobs, 기본 CPU 수)에 나눠서 계산합니다.
+
+    Args:
+        y_true (array-like): 실제값 (0 또는 1).
+        y_prob (array-like): 예측 확률.
+        k_pcts (array-like): Top-K% 목록.
+        n_boot (int): replicate 수.
+        method (str): "poisson" | "multinomial".
+        alpha (float): 1 - 신뢰수준 (0.05 → 95% CI).
+        n_jobs (int, optional): 워커 프로세스 수 (1이면 현재 프로세스에서 계산).
+        seed (int): 재현용 시드.
+
+    Returns:
+        dict: pr_auc_ci [lo, hi], precision_at_k_ci / recall_at_k_ci / lift_at_k_ci (K x 2)
+              + n_boot, method, alpha, k_pct.
+
+    사용 예시:
+        >>> ci = bootstrap_ci(y_test, y_prob, n_boot=2000)
+        >>> ci["pr_auc_ci"]
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"method must be one of {BOOTSTRAP_METHODS}")
+
+    y_true = np.asarray(y_true).astype(np.int64).reshape(-1)
+    y_prob = np.asarray(y_prob, dtype=float).reshape(-1)
+    k = np.asarray(k_pcts, dtype=float).reshape(-1)
+
+    order = np.argsort(-y_prob, kind="stable")
+    y_sorted = y_true[order].astype(np.float32)
+    s_sorted = y_prob[order]
+
+    # 동점 그룹의 마지막 위치 (sklearn AP와 같은 동점 처리)
+    n = len(s_sorted)
+    change = s_sorted[1:] != s_sorted[:-1]
+    group_id = np.concatenate([[0], np.cumsum(change)])
+    group_end = np.append(np.flatnonzero(change), n - 1)[group_id]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_tasks = max(1, min(n_jobs, n_boot))
+    reps = np.full(n_tasks, n_boot // n_tasks)
+    reps[: n_boot % n_tasks] += 1
+    seeds = np.random.SeedSequence(seed).spawn(n_tasks)
+    tasks = [(y_sorted, group_end, k, int(r), method, sd) for r, sd in zip(reps, seeds)]
+
+    if n_tasks == 1:
+        parts = [_bootstrap_worker(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_tasks) as ex:
+            parts = list(ex.map(_bootstrap_worker, tasks))
+
+    q = [alpha / 2, 1 - alpha / 2]
+
+    def _ci(name):
+        values = np.concatenate([p[name] for p in parts], axis=0)
+        return np.quantile(values, q, axis=0).T
+
+    return {
+        "n_boot": int(n_boot),
+        "method": method,
+        "alpha": float(alpha),
+        "k_pct": k,
+        "pr_auc_ci": _ci("pr_auc"),
+        "precision_at_k_ci": _ci("precision"),
+        "recall_at_k_ci": _ci("recall"),
+        "lift_at_k_ci": _ci("lift"),
+    }
@@ -0,0 +1,263 @@
+# app/utils/model_registry.py
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from app.utils.paths import PATHS
+
+
+def _file_signature(path: Path) -> tuple | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _file_sha256(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _estimate_nbytes(obj, files: list[Path]) -> int:
+    # torch 모듈은 파라미터/버퍼 크기, 그 외(joblib/json)는 파일 크기로 근사
+    module = obj[0] if isinstance(obj, tuple) else obj
+    if hasattr(module, "state_dict"):
+        try:
+            return int(sum(t.numel() * t.element_size() for t in module.state_dict().values() if hasattr(t, "numel")))
+        except Exception:
+            pass
+    return int(sum(p.stat().st_size for p in files if p.exists()))
+
+
+class _Entry:
+    __slots__ = ("value", "files", "signatures", "hashes", "nbytes", "load_seconds")
+
+    def __init__(self, value, files, signatures, hashes, nbytes, load_seconds):
+        self.value = value
+        self.files = files
+        self.signatures = signatures
+        self.hashes = hashes
+        self.nbytes = nbytes
+        self.load_seconds = load_seconds
+
+
+class ModelRegistry:
+    """
+    (model_name, version, kind) → 로드된 객체를 프로세스 안에 캐시하는 레지스트리.
+
+    Streamlit rerun마다 torch.load / joblib.load를 다시 하지 않도록 load_dl_model / load_ml_model /
+    load_scaler / load_config 결과를 재사용합니다.
+
+    - 무효화: 조회 때마다 원본 파일의 (mtime, size)를 확인하고, 바뀌었으면 SHA-256까지 비교해
+      내용이 실제로 달라진 경우에만 다시 로드합니다 (touch만 된 경우는 재사용).
+    - 메모리 예산(max_bytes): 넘으면 가장 오래 사용하지 않은 항목부터 제거(LRU).
+      DL 모델은 파라미터/버퍼 크기, 그 외는 파일 크기로 추정합니다.
+    - 스레드 안전: 동시 세션이 같은 키를 요청해도 로드는 한 번만 일어나고(키별 lock),
+      다른 키의 조회는 막지 않습니다.
+    - 통계: stats()가 hits / misses / loads / reloads / evictions / load_seconds를 반환합니다.
+
+    반환된 모델은 여러 세션이 공유하므로 eval 모드 추론(no_grad)에만 사용해야 합니다.
+
+    사용 예시:
+        >>> from app.utils.model_registry import REGISTRY
+        >>> model, name, path = REGISTRY.dl_model("mlp_enhance", "baseline", input_dim=40)
+        >>> scaler = REGISTRY.scaler("mlp_enhance", "baseline")
+        >>> REGISTRY.stats()
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024 ** 3):
+        self.max_bytes = int(max_bytes)
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.RLock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+        self._counters = {"hits": 0, "misses": 0, "loads": 0, "reloads": 0, "evictions": 0, "load_seconds": 0.0}
+
+    # ----------------------------
+    # 공통 조회
+    # ----------------------------
+    def get(self, key: tuple, files: list[Path], loader):
+        """
+        key로 캐시된 객체를 반환하고, 없거나 files가 바뀌었으면 loader()로 다시 불러옵니다.
+
+        Args:
+            key: (model_name, version, kind, ...) 캐시 키.
+            files: 무효화 기준이 되는 원본 파일 목록 (없는 파일도 허용).
+            loader: 인자 없는 로드 함수.
+        """
+        files = [Path(p) for p in files]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+
+            if entry is not None and self._is_fresh(entry):
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                return entry.value
+
+            with self._lock:
+                self._counters["misses"] += 1
+                if entry is not None:
+                    self._counters["reloads"] += 1
+
+            t0 = time.perf_counter()
+            value = loader()
+            seconds = time.perf_counter() - t0
+
+            new_entry = _Entry(
+                value,
+                files,
+                [_file_signature(p) for p in files],
+                [_file_sha256(p) for p in files],
+                _estimate_nbytes(value, files),
+                seconds,
+            )
+            with self._lock:
+                self._entries[key] = new_entry
+                self._entries.move_to_end(key)
+                self._counters["loads"] += 1
+                self._counters["load_seconds"] += seconds
+                self._evict(keep=key)
+            return value
+
+    def _is_fresh(self, entry: _Entry) -> bool:
+        for i, p in enumerate(entry.files):
+            sig = _file_signature(p)
+            if sig == entry.signatures[i]:
+                continue
+            # mtime/size가 달라도 내용이 같으면 서명만 갱신하고 재사용
+            if _file_sha256(p) != entry.hashes[i]:
+                return False
+            entry.signatures[i] = sig
+        return True
+
+    def _evict(self, keep: tuple) -> None:
+        total = sum(e.nbytes for e in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entries.pop(key).nbytes
+            self._counters["evictions"] += 1
+
+    # ----------------------------
+    # 관리 / 통계
+    # ----------------------------
+    def invalidate(self, model_name: str | None = None, version: str | None = None) -> int:
+        """model_name(/version)에 해당하는 항목을 제거합니다 (None이면 전체). 제거한 개수 반환."""
+        with self._lock:
+            keys = [
+                k for k in self._entries
+                if (model_name is None or k[0] == model_name) and (version is None or k[1] == version)
+            ]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "n_entries": len(self._entries),
+                "nbytes": sum(e.nbytes for e in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "entries": [
+                    {"key": list(k), "nbytes": e.nbytes, "load_seconds": e.load_seconds}
+                    for k, e in self._entries.items()
+                ],
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ----------------------------
+    # load_model.py 래퍼
+    # ----------------------------
+    def dl_model(
+        self,
+        model_name: str,
+        version: str | None,
+        input_dim: int,
+        device: str = "cpu",
+        quantize: bool = False,
+    ):
+        """load_dl_model과 같은 (model, actual_name, weight_path)를 반환합니다."""
+        from app.utils.load_model import (
+            QUANT_REPORT_FILE,
+            QUANT_WEIGHT_FILE,
+            dl_weight_path,
+            load_dl_model,
+            manifest_path,
+            quantized_model_dir,
+        )
+
+        v = (version or "baseline").strip() or "baseline"
+        weight_path = dl_weight_path(model_name, v)
+        files = [weight_path, manifest_path(weight_path), _config_path(model_name, v)]
+        if quantize:
+            q_dir = quantized_model_dir(model_name, v)
+            files += [q_dir / QUANT_WEIGHT_FILE, q_dir / QUANT_REPORT_FILE]
+        return self.get(
+            (model_name, v, "dl", int(input_dim), device, bool(quantize)),
+            files,
+            lambda: load_dl_model(model_name, v, input_dim, device=device, quantize=quantize),
+        )
+
+    def ml_model(self, model_name: str, version: str | None):
+        from app.utils.load_model import load_ml_model
+
+        v = (version or "baseline").strip() or "baseline"
+        path = Path(PATHS["models_ml"]) / model_name / v / "model.pkl"
+        return self.get((model_name, v, "ml"), [path], lambda: load_ml_model(model_name, v))
+
+    def scaler(self, model_name: str, version: str | None):
+        from app.utils.load_model import load_scaler
+
+        v = (version or "baseline").strip() or "baseline"
+        path = Path(PATHS["models_preprocessing"]) / model_name / v / "scaler.pkl"
+        return self.get((model_name, v, "scaler"), [path], lambda: load_scaler(model_name, v))
+
+    def config(self, model_name: str, version: str | None):
+        from app.utils.load_model import load_config
+
+        v = (version or "baseline").strip() or "baseline"
+        return self.get((model_name, v, "config"), [_config_path(model_name, v)], lambda: load_config(model_name, v))
+
+    def percentiles(self, model_name: str) -> dict:
+        """prepare_percentile_table(load_score_percentiles(model_name)) 결과 (점수 → 상위 % 해석용)."""
+        from app.utils.inference import load_score_percentiles, prepare_percentile_table
+
+        path = Path(PATHS["models_metrics"]) / f"{model_name}_score_percentiles.json"
+        return self.get(
+            (model_name, None, "percentiles"),
+            [path],
+            lambda: prepare_percentile_table(load_score_percentiles(model_name)),
+        )
+
+
+def _config_path(model_name: str, version: str) -> Path:
+    return Path(PATHS["models_configs"]) / model_name / version / "config.json"
+
+
+# 프로세스 공용 레지스트리 (Streamlit 세션 / 서빙에서 공유)
+REGISTRY = ModelRegistry()
@@ -4,6 +4,8 @@ from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
+# import 시점에는 폴더를 만들지 않습니다. 저장 함수(save / export / score_cache / artifact_store / timeline)가
+# 쓰기 직전에 필요한 폴더를 직접 만들고, 읽기 전용 페이지/함수는 폴더를 만들지 않습니다.
 PATHS = {
     # ✅ 데이터
     "data_processed": PROJECT_ROOT / "data/processed",
@@ -22,10 +24,13 @@ PATHS = {
     # 1단계 평가 결과 (팀 공통 규칙)
     "models_eval": PROJECT_ROOT / "models/eval",
 
+    # 내용 주소(SHA-256) 산출물 저장소 (artifact_store.py)
+    "artifact_store": PROJECT_ROOT / "models/store",
+
+    # 배치 스코어링 점수 캐시 (score_cache.py)
+    "score_cache": PROJECT_ROOT / "models/cache/scores",
+
     # 시각화 / 리포트
     "assets_training": PROJECT_ROOT / "assets/training",
     "reports_training": PROJECT_ROOT / "reports/training",
 }
-
-for p in PATHS.values():
-    p.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
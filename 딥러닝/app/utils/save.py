@@ -4,14 +4,26 @@ from __future__ import annotations
 
 import json
 import math
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-import joblib
 import numpy as np
-import torch
-from sklearn.metrics import average_precision_score, confusion_matrix
 
+# joblib / torch / sklearn은 실제로 저장할 때만 import합니다.
+from app.utils.file_lock import dir_lock
+from app.utils.load_metrics import (
+    EVAL_BUNDLE_FILE,
+    EVAL_CATALOG_FILE,
+    eval_catalog_entry,
+    load_eval_catalog,
+    load_eval_metrics,
+)
+from app.utils.metrics import EVAL_K_PCTS, ScoreHistogram, bootstrap_ci, topk_metrics
 from app.utils.paths import PATHS
 
 N_DECIMALS = 5
@@ -30,27 +42,130 @@ def _safe_filename(name: str) -> str:
     return name
 
 
-def _metrics_at_k(
-    y_true: np.ndarray,
-    y_prob: np.ndarray,
-    k_pct: int,
-    base_rate: float,
-) -> tuple[float, float, float, int, float]:
-    n = len(y_prob)
-    n_sel = int(np.floor(n * k_pct / 100))
-    n_sel = max(n_sel, 1)
-
-    order = np.argsort(-y_prob)
-    sel = order[:n_sel]
-
-    tp = int(y_true[sel].sum())
-    precision_at_k = tp / n_sel
-    recall_at_k = tp / max(int(y_true.sum()), 1)
-    lift_at_k = (precision_at_k / base_rate) if base_rate > 0 else 0.0
-
-    # cutoff (raw)
-    t_k = float(y_prob[sel[-1]])
-    return precision_at_k, recall_at_k, lift_at_k, n_sel, t_k
+#
+# 원자적 / 병렬 쓰기
+#
+def _tmp_path(path: Path) -> Path:
+    # 같은 폴더의 숨김 temp 파일 (os.replace가 원자적이려면 같은 파일시스템이어야 함)
+    return path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _json_writer(payload, indent: int | None = 2):
+    def write(path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=indent, ensure_ascii=False)
+    return write
+
+
+class _ArtifactWriter:
+    """
+    독립적인 산출물을 스레드 풀에서 동시에 쓰고 artifact별 소요 시간(초)을 기록합니다.
+
+    - write(): temp 파일에 쓴 뒤 os.replace → 읽는 쪽은 이전 파일 또는 완성된 새 파일만 봅니다.
+    - stage(): temp 파일까지만 쓰고, commit()에서 잠금을 잡은 채 한꺼번에 os.replace 합니다.
+    - write(..., store=True): os.replace 대신 ArtifactStore.commit → 내용이 같으면 다시 쓰지 않음 (store_status에 기록).
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer")
+        self._futures: dict[str, Any] = {}
+        self._staged: list[tuple[Path, Path]] = []
+        self._lock = threading.Lock()
+        self.timings: dict[str, float] = {}
+        self.store_status: dict[str, str] = {}
+
+    def _run(self, key: str, path: Path, write_fn, stage: bool, store: bool = False) -> str:
+        t0 = time.perf_counter()
+        tmp = _tmp_path(path)
+        try:
+            write_fn(tmp)
+            if stage:
+                with self._lock:
+                    self._staged.append((tmp, path))
+            elif store:
+                from app.utils.artifact_store import STORE
+
+                self.store_status[key] = STORE.commit(tmp, path)["status"]
+            else:
+                os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        finally:
+            self.timings[key] = round(time.perf_counter() - t0, 4)
+        return str(path)
+
+    def write(self, key: str, path: Path, write_fn, store: bool = False) -> None:
+        self._futures[key] = self._pool.submit(self._run, key, Path(path), write_fn, False, store)
+
+    def stage(self, key: str, path: Path, write_fn) -> None:
+        self._futures[key] = self._pool.submit(self._run, key, Path(path), write_fn, True)
+
+    def submit(self, key: str, fn) -> None:
+        # 여러 파일을 순서대로 써야 하는 작업 (예: 가중치 → manifest)
+        def timed():
+            t0 = time.perf_counter()
+            try:
+                return fn()
+            finally:
+                self.timings[key] = round(time.perf_counter() - t0, 4)
+        self._futures[key] = self._pool.submit(timed)
+
+    def results(self) -> dict[str, Any]:
+        """모든 작업을 기다린 뒤 결과 반환. 하나라도 실패하면 staged temp 파일을 지우고 예외를 다시 올립니다."""
+        out, error = {}, None
+        for key, fut in self._futures.items():
+            try:
+                out[key] = fut.result()
+            except BaseException as e:
+                error = error or e
+        self._pool.shutdown()
+        if error is not None:
+            self.close()
+            raise error
+        return out
+
+    def close(self) -> None:
+        """풀을 닫고(진행 중인 작업은 끝까지 기다림) commit되지 않은 staged temp 파일을 지웁니다. 여러 번 호출해도 됩니다."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        for tmp, _ in self._staged:
+            tmp.unlink(missing_ok=True)
+        self._staged = []
+
+    def commit(self, directory: Path, after=None) -> float:
+        """
+        staged 파일을 directory 잠금 안에서 한꺼번에 교체합니다. 잠금 대기 포함 소요 시간 반환.
+        after가 있으면 교체 직후 같은 잠금 안에서 호출합니다 (다른 저장이 끼어들기 전의 디스크 상태를 봄).
+        """
+        t0 = time.perf_counter()
+        with dir_lock(directory):
+            for tmp, path in self._staged:
+                os.replace(tmp, path)
+            self._staged = []
+            if after is not None:
+                after()
+        return round(time.perf_counter() - t0, 4)
+
+
+def _update_eval_catalog(eval_folder: str, model_id: str) -> None:
+    # models/eval/catalog.json의 해당 모델/버전 항목만 갱신 (models/eval.lock 안에서 읽고 → 고치고 → 교체)
+    # eval 폴더 잠금을 잡은 채 호출되므로, 방금 commit된 디스크의 eval_bundle.json을 기준으로 기록합니다.
+    # 잠금 순서는 항상 eval 폴더 → models/eval 입니다.
+    root = Path(PATHS["models_eval"])
+    path = root / EVAL_CATALOG_FILE
+    bundle = load_eval_metrics(eval_folder)
+    with dir_lock(root):
+        catalog = load_eval_catalog()  # 없으면 기존 폴더를 스캔해 시작
+        entry = eval_catalog_entry(bundle)
+        entry["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        model = catalog["models"].setdefault(eval_folder, {"model_id": model_id, "versions": {}})
+        model["model_id"] = model_id
+        model["latest"] = entry["version"]
+        model["versions"][entry["version"]] = entry
+
+        tmp = _tmp_path(path)
+        _json_writer(catalog)(tmp)
+        os.replace(tmp, path)
 
 
 def save_model_and_artifacts(
@@ -67,7 +182,25 @@ def save_model_and_artifacts(
     scaler=None,
     figures: dict | None = None,
     config: dict | None = None,
-) -> dict[str, str]:
+    bootstrap_n: int = 0,            # > 0 이면 pr/topk JSON에 bootstrap CI 추가
+    bootstrap_method: str = "poisson",
+    score_sketch: ScoreHistogram | None = None,  # 전체 모집단 점수 sketch (없으면 이 split의 y_prob만으로 계산)
+    max_workers: int = 4,            # 모델 / scaler / figure / JSON을 동시에 쓰는 스레드 수
+    verbose: bool = False,           # True면 artifact별 소요 시간 출력
+) -> dict[str, Any]:
+    """
+    모델 / scaler / metrics / config / figure와 eval JSON 5종을 저장합니다.
+
+    - 독립적인 산출물은 스레드 풀에서 동시에 렌더링/저장하고(figure savefig 포함),
+      모든 파일은 temp 파일에 쓴 뒤 os.replace로 원자적으로 교체합니다.
+    - models/eval/<id>의 JSON 5종 + eval_bundle.json은 temp로 먼저 써 두고 {eval_dir}.lock 잠금 안에서
+      한꺼번에 교체하므로, 같은 model_id를 동시에 저장해도 두 실행의 파일이 섞이지 않습니다.
+    - 같은 잠금 안에서 models/eval/catalog.json의 해당 모델/버전 항목을 갱신합니다 (load_eval_catalog).
+    - 모델 / scaler / figure는 내용 주소 저장소(artifact_store.py)를 거쳐 저장합니다.
+      내용이 이전과 같으면 다시 쓰지 않고, 같은 내용은 blob 하나만 남깁니다.
+    - 반환값의 "timings"에 artifact별 소요 시간(초)이 들어 있습니다 (eval_commit = 잠금 대기 + 교체).
+      "store"에는 저장소를 거친 artifact별 상태(new / dedup / unchanged)가 들어 있습니다.
+    """
     assert model_type in {"ml", "dl"}, "model_type must be 'ml' or 'dl'"
 
     # ----------------------------
@@ -92,144 +225,236 @@ def save_model_and_artifacts(
     y_true = np.asarray(y_true).astype(int)
     y_prob = np.asarray(y_prob).astype(float)
 
-    saved: dict[str, str] = {}
-
-    # ----------------------------
-    # 1) 모델 저장
-    # ----------------------------
-    if model_type == "ml":
-        model_path = MODEL_DIR / "model.pkl"
-        joblib.dump(model, model_path)
-    else:
-        model_path = MODEL_DIR / "model.pt"
-        torch.save(model.state_dict(), model_path)
-    saved["model"] = str(model_path)
-
-    # ----------------------------
-    # 2) scaler 저장
-    # ----------------------------
-    if scaler is not None:
-        scaler_path = PREP_DIR / "scaler.pkl"
-        joblib.dump(scaler, scaler_path)
-        saved["scaler"] = str(scaler_path)
-
-    # ----------------------------
-    # 3) metrics 저장(원본 그대로)
-    # ----------------------------
-    metrics_path = METRICS_DIR / "metrics.json"
-    with open(metrics_path, "w", encoding="utf-8") as f:
-        json.dump(metrics, f, indent=2, ensure_ascii=False)
-    saved["metrics"] = str(metrics_path)
-
-    # ----------------------------
-    # 4) figures 저장(넘긴 것만)
-    # ----------------------------
-    if figures:
-        for name, fig in figures.items():
-            if fig is None or not hasattr(fig, "savefig"):
-                continue
-            safe = _safe_filename(name)
-            img_path = FIG_DIR / f"{safe}.png"
-            fig.savefig(img_path, dpi=150, bbox_inches="tight")
-            saved[f"figure_{safe}"] = str(img_path)
-
-    # ----------------------------
-    # 5) config 저장 (✅ feature_cols 저장 안 함)
-    # ----------------------------
-    config_payload = config or {
-        "model_name": model_name,
-        "model_type": model_type,
-        "version": version,
-        "feature_source": "features_ml_clean.parquet",
-    }
-    config_path = CFG_DIR / "config.json"
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config_payload, f, indent=2, ensure_ascii=False)
-    saved["config"] = str(config_path)
-
-    # ============================
-    # ✅ EVAL 산출물 저장 (팀 규칙)
-    # ============================
-
-    # 1) model_card.json
-    model_card = {
-        "model_id": model_id,
-        "display_name": f"{model_name} ({model_type.upper()})",
-        "category": model_type.upper(),
-        "split": split,
-        "version": version,
-    }
-    with open(EVAL_DIR / "model_card.json", "w", encoding="utf-8") as f:
-        json.dump(model_card, f, indent=2, ensure_ascii=False)
-
-    # 2) pr_metrics.json
-    pr_auc = metrics.get("PR-AUC (Average Precision)")
-    if pr_auc is None:
-        pr_auc = float(average_precision_score(y_true, y_prob))
-    pr_auc = trunc_n(pr_auc)
-
-    pr_metrics = {"model_id": model_id, "split": split, "pr_auc": pr_auc}
-    with open(EVAL_DIR / "pr_metrics.json", "w", encoding="utf-8") as f:
-        json.dump(pr_metrics, f, indent=2, ensure_ascii=False)
-
-    # 3) topk_metrics.json + topk_cutoffs.json
-    base_rate = float(y_true.mean())
-    base_rate_s = trunc_n(base_rate)
-
-    k_list = [5, 10, 15, 30]
-
-    topk_metrics = {
-        "model_id": model_id,
-        "split": split,
-        "base_rate": base_rate_s,
-        "metrics_by_k": [],
-    }
-    topk_cutoffs = {
-        "model_id": model_id,
-        "split": split,
-        "n_total": int(len(y_prob)),
-        "n_selected_rule": "floor",
-        "tie_policy": "sort_and_take_top_n",
-        "cutoffs_by_k": [],
-    }
-
-    cutoffs_raw: list[float] = []
-    for k in k_list:
-        p_at_k, r_at_k, lift, n_sel, t_k_raw = _metrics_at_k(y_true, y_prob, k, base_rate)
-
-        topk_metrics["metrics_by_k"].append({
-            "k_pct": int(k),
-            "precision_at_k": trunc_n(p_at_k),
-            "recall_at_k": trunc_n(r_at_k),
-            "lift_at_k": trunc_n(lift),
-        })
-        topk_cutoffs["cutoffs_by_k"].append({
-            "k_pct": int(k),
-            "n_selected": int(n_sel),
-            "t_k": trunc_n(t_k_raw),  # 저장은 절삭
-        })
-        cutoffs_raw.append(t_k_raw)
-
-    with open(EVAL_DIR / "topk_metrics.json", "w", encoding="utf-8") as f:
-        json.dump(topk_metrics, f, indent=2, ensure_ascii=False)
-
-    with open(EVAL_DIR / "topk_cutoffs.json", "w", encoding="utf-8") as f:
-        json.dump(topk_cutoffs, f, indent=2, ensure_ascii=False)
-
-    # 4) confusion_matrix.json (Top 5% 기준)
-    thr_raw = float(cutoffs_raw[0])  # 예측은 raw 기준
-    y_pred_5 = (y_prob >= thr_raw).astype(int)
-    cm = confusion_matrix(y_true, y_pred_5)
-
-    confusion_payload = {
-        "model_id": model_id,
-        "split": split,
-        "threshold": trunc_n(thr_raw),
-        "labels": ["non_m2", "m2"],
-        "matrix": cm.tolist(),
-    }
-    with open(EVAL_DIR / "confusion_matrix.json", "w", encoding="utf-8") as f:
-        json.dump(confusion_payload, f, indent=2, ensure_ascii=False)
+    saved: dict[str, Any] = {}
+    writer = _ArtifactWriter(max_workers=max_workers)
+    try:
+        # ----------------------------
+        # 1) 모델 저장
+        # ----------------------------
+        import joblib
+
+        if model_type == "ml":
+            model_path = MODEL_DIR / "model.pkl"
+            writer.write("model", model_path, lambda p: joblib.dump(model, p), store=True)
+        else:
+            import torch
+
+            from app.utils.artifact_store import STORE
+            from app.utils.load_model import manifest_path, write_checkpoint_manifest
+
+            model_path = MODEL_DIR / "model.pt"
+
+            def save_dl_model():
+                # 가중치 교체 후 manifest 작성 (manifest가 최종 파일 크기/해시를 기록하도록)
+                tmp = _tmp_path(model_path)
+                try:
+                    # 파일 객체로 저장해야 zip 내부 폴더명이 "archive"로 고정됨 (경로로 저장하면 temp 파일명이 들어가
+                    # 같은 가중치도 매번 내용이 달라지고 저장소 중복 제거가 되지 않음)
+                    with open(tmp, "wb") as f:
+                        torch.save(model.state_dict(), f)
+                    writer.store_status["model"] = STORE.commit(tmp, model_path)["status"]
+                except BaseException:
+                    tmp.unlink(missing_ok=True)
+                    raise
+                return write_checkpoint_manifest(model_path, model)
+
+            writer.submit("model", save_dl_model)
+            saved["manifest"] = str(manifest_path(model_path))
+        saved["model"] = str(model_path)
+
+        # ----------------------------
+        # 2) scaler 저장
+        # ----------------------------
+        if scaler is not None:
+            scaler_path = PREP_DIR / "scaler.pkl"
+            writer.write("scaler", scaler_path, lambda p: joblib.dump(scaler, p), store=True)
+            saved["scaler"] = str(scaler_path)
+
+        # ----------------------------
+        # 3) metrics 저장(원본 그대로)
+        # ----------------------------
+        metrics_path = METRICS_DIR / "metrics.json"
+        writer.write("metrics", metrics_path, _json_writer(metrics))
+        saved["metrics"] = str(metrics_path)
+
+        # ----------------------------
+        # 3-1) score_percentiles.json (실시간 예측 백분위 해석용, 0.1% 단위)
+        #      cutoff 오차 ≤ bin 폭(1e-5), 자세한 범위는 ScoreHistogram.percentile_table 참고
+        #      score_sketch를 넘기지 않으면 저장하는 split(y_prob)의 분포 기준입니다.
+        #      실서비스 모집단 기준 백분위가 필요하면 전체 점수를 누적한 sketch를 넘기세요.
+        # ----------------------------
+        sketch = score_sketch if score_sketch is not None else ScoreHistogram().update(y_true, y_prob)
+        percentiles_payload = {
+            "model_name": model_name,
+            "version": version,
+            "population": "score_sketch" if score_sketch is not None else f"split:{split}",
+            **sketch.percentile_table(),
+        }
+        percentiles_path = Path(PATHS["models_metrics"]) / f"{model_name}_score_percentiles.json"
+        writer.write("score_percentiles", percentiles_path, _json_writer(percentiles_payload, indent=None))
+        saved["score_percentiles"] = str(percentiles_path)
+
+        # ----------------------------
+        # 4) figures 저장(넘긴 것만)
+        # ----------------------------
+        if figures:
+            for name, fig in figures.items():
+                if fig is None or not hasattr(fig, "savefig"):
+                    continue
+                safe = _safe_filename(name)
+                img_path = FIG_DIR / f"{safe}.png"
+                # temp 이름에는 .png 확장자가 없으므로 format을 명시
+                writer.write(
+                    f"figure_{safe}",
+                    img_path,
+                    lambda p, fig=fig: fig.savefig(p, dpi=150, bbox_inches="tight", format="png"),
+                    store=True,
+                )
+                saved[f"figure_{safe}"] = str(img_path)
+
+        # ----------------------------
+        # 5) config 저장 (✅ feature_cols 저장 안 함)
+        # ----------------------------
+        config_payload = config or {
+            "model_name": model_name,
+            "model_type": model_type,
+            "version": version,
+            "feature_source": "features_ml_clean.parquet",
+        }
+        config_path = CFG_DIR / "config.json"
+        writer.write("config", config_path, _json_writer(config_payload))
+        saved["config"] = str(config_path)
+
+        # ============================
+        # ✅ EVAL 산출물 저장 (팀 규칙)
+        # ============================
+
+        # 1) model_card.json
+        model_card = {
+            "model_id": model_id,
+            "display_name": f"{model_name} ({model_type.upper()})",
+            "category": model_type.upper(),
+            "split": split,
+            "version": version,
+        }
+        writer.stage("eval_model_card", EVAL_DIR / "model_card.json", _json_writer(model_card))
+
+        # 2) pr_metrics.json
+        from sklearn.metrics import average_precision_score, confusion_matrix
+
+        pr_auc = metrics.get("PR-AUC (Average Precision)")
+        if pr_auc is None:
+            pr_auc = float(average_precision_score(y_true, y_prob))
+        pr_auc = trunc_n(pr_auc)
+
+        pr_metrics = {"model_id": model_id, "split": split, "pr_auc": pr_auc}
+
+        ci = None
+        if bootstrap_n > 0:
+            ci = bootstrap_ci(y_true, y_prob, EVAL_K_PCTS, n_boot=bootstrap_n, method=bootstrap_method)
+            pr_metrics["pr_auc_ci"] = [trunc_n(v) for v in ci["pr_auc_ci"]]
+            pr_metrics["bootstrap"] = {
+                "n_boot": ci["n_boot"],
+                "method": ci["method"],
+                "ci_level": 1 - ci["alpha"],
+            }
+
+        writer.stage("eval_pr_metrics", EVAL_DIR / "pr_metrics.json", _json_writer(pr_metrics))
+
+        # 3) topk_metrics.json + topk_cutoffs.json
+        base_rate = float(y_true.mean())
+        base_rate_s = trunc_n(base_rate)
+
+        k_list = EVAL_K_PCTS
+        topk = topk_metrics(y_true, y_prob, k_list)
+
+        topk_metrics_payload = {
+            "model_id": model_id,
+            "split": split,
+            "base_rate": base_rate_s,
+            "metrics_by_k": [],
+        }
+        if ci is not None:
+            topk_metrics_payload["bootstrap"] = pr_metrics["bootstrap"]
+        topk_cutoffs = {
+            "model_id": model_id,
+            "split": split,
+            "n_total": int(len(y_prob)),
+            "n_selected_rule": "floor",
+            "tie_policy": "sort_and_take_top_n",
+            "cutoffs_by_k": [],
+        }
+
+        cutoffs_raw: list[float] = []
+        for i, k in enumerate(k_list):
+            t_k_raw = float(topk["cutoff"][i])
+
+            topk_metrics_payload["metrics_by_k"].append({
+                "k_pct": int(k),
+                "precision_at_k": trunc_n(topk["precision"][i]),
+                "recall_at_k": trunc_n(topk["recall"][i]),
+                "lift_at_k": trunc_n(topk["lift"][i]),
+            })
+            if ci is not None:
+                topk_metrics_payload["metrics_by_k"][-1].update({
+                    "precision_at_k_ci": [trunc_n(v) for v in ci["precision_at_k_ci"][i]],
+                    "recall_at_k_ci": [trunc_n(v) for v in ci["recall_at_k_ci"][i]],
+                    "lift_at_k_ci": [trunc_n(v) for v in ci["lift_at_k_ci"][i]],
+                })
+            topk_cutoffs["cutoffs_by_k"].append({
+                "k_pct": int(k),
+                "n_selected": int(topk["n_selected"][i]),
+                "t_k": trunc_n(t_k_raw),  # 저장은 절삭
+            })
+            cutoffs_raw.append(t_k_raw)
+
+        writer.stage("eval_topk_metrics", EVAL_DIR / "topk_metrics.json", _json_writer(topk_metrics_payload))
+        writer.stage("eval_topk_cutoffs", EVAL_DIR / "topk_cutoffs.json", _json_writer(topk_cutoffs))
+
+        # 4) confusion_matrix.json (Top 5% 기준)
+        thr_raw = float(cutoffs_raw[0])  # 예측은 raw 기준
+        y_pred_5 = (y_prob >= thr_raw).astype(int)
+        cm = confusion_matrix(y_true, y_pred_5)
+
+        confusion_payload = {
+            "model_id": model_id,
+            "split": split,
+            "threshold": trunc_n(thr_raw),
+            "labels": ["non_m2", "m2"],
+            "matrix": cm.tolist(),
+        }
+        writer.stage("eval_confusion_matrix", EVAL_DIR / "confusion_matrix.json", _json_writer(confusion_payload))
+
+        # 5) eval_bundle.json (위 5종을 한 파일로, load_eval_metrics가 한 번에 읽음)
+        bundle = {
+            "model_card": model_card,
+            "pr_metrics": pr_metrics,
+            "topk_metrics": topk_metrics_payload,
+            "topk_cutoffs": topk_cutoffs,
+            "confusion_matrix": confusion_payload,
+        }
+        writer.stage("eval_bundle", EVAL_DIR / EVAL_BUNDLE_FILE, _json_writer(bundle, indent=None))
+
+        # ----------------------------
+        # 쓰기 완료 대기 → eval 세트 일괄 교체
+        # ----------------------------
+        writer.results()
+
+        # 6) models/eval/catalog.json (전체 모델 / 버전 목록 + 대표 지표): eval 폴더 잠금 안에서 갱신
+        def update_catalog():
+            t0 = time.perf_counter()
+            _update_eval_catalog(eval_folder, model_id)
+            writer.timings["eval_catalog"] = round(time.perf_counter() - t0, 4)
+
+        writer.timings["eval_commit"] = writer.commit(EVAL_DIR, after=update_catalog)
+    finally:
+        # 도중에 예외가 나도 풀을 닫고 commit되지 않은 staged temp 파일을 지움
+        writer.close()
 
     saved["eval_dir"] = str(EVAL_DIR)
+    saved["timings"] = dict(writer.timings)
+    saved["store"] = dict(writer.store_status)
+    if verbose:
+        for key, sec in sorted(saved["timings"].items(), key=lambda x: -x[1]):
+            print(f"  - {key:<28} {sec * 1000:8.1f} ms")
     return saved
\ No newline at end of file
@@ -0,0 +1,200 @@
+# app/utils/score_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.utils.paths import PATHS
+
+
+def file_fingerprint(*paths) -> str:
+    """
+    파일 내용의 SHA-256 (여러 파일이면 순서대로 이어서). 없는 파일은 "-"로 기록합니다.
+    모델 가중치나 scaler가 바뀌면 값이 바뀌므로 캐시 무효화 키로 사용합니다.
+    """
+    h = hashlib.sha256()
+    for p in paths:
+        p = Path(p) if p is not None else None
+        if p is None or not p.exists():
+            h.update(b"-")
+            continue
+        with open(p, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def hash_rows(X: np.ndarray) -> np.ndarray:
+    """
+    (스케일링된) 피처 행 → 64-bit 해시 (uint64).
+
+    pandas hash_pandas_object는 고정 시드라 실행/프로세스와 무관하게 같은 값을 줍니다.
+    64-bit 충돌 확률은 n행에서 약 n² / 2^65 (1,000만 행 ≈ 3e-6)입니다.
+    """
+    X = np.ascontiguousarray(X)
+    if X.ndim == 1:
+        X = X[None, :]
+    return pd.util.hash_pandas_object(pd.DataFrame(X, copy=False), index=False).to_numpy()
+
+
+class ScoreCache:
+    """
+    (model_id, version, 스케일링된 피처 행 해시) → 점수 캐시.
+
+    일일 배치에서 피처가 바뀌지 않은 사용자는 모델을 다시 돌리지 않고 이전 점수를 씁니다.
+
+    저장 형식: models/cache/scores/{model_id}/{version}/scores.npz
+      - keys (uint64, 정렬) / values (float64) / last_used (int32, 실행 번호)
+      - fingerprint: 모델 가중치 + scaler 파일 해시 → 다르면 로드 시 캐시 전체를 버립니다(자동 무효화)
+    조회는 정렬된 keys에 대한 searchsorted라 청크 단위로 벡터화됩니다.
+
+    용량 제한(max_bytes)을 넘으면 저장 시 가장 오래 사용되지 않은 항목부터 제거합니다.
+
+    사용 예시:
+        >>> cache = ScoreCache.for_model("mlp_enhance", "baseline", model_type="dl")
+        >>> score_parquet(..., feature_cols=cols, cache=cache)   # 청크마다 조회 → miss만 스코어링 → 저장
+        >>> cache.hit_rate
+    """
+
+    ENTRY_BYTES = 8 + 8 + 4  # key + value + last_used
+
+    def __init__(
+        self,
+        model_id: str,
+        version: str | None = "baseline",
+        fingerprint: str = "",
+        cache_dir: str | Path | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        v = (version or "baseline").strip() or "baseline"
+        if cache_dir is None:
+            cache_dir = Path(PATHS["score_cache"]) / model_id / v
+        self.path = Path(cache_dir) / "scores.npz"
+        self.model_id = model_id
+        self.version = v
+        self.fingerprint = fingerprint
+        self.max_entries = max(int(max_bytes) // self.ENTRY_BYTES, 1)
+
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.values = np.empty(0, dtype=np.float64)
+        self.last_used = np.empty(0, dtype=np.int32)
+        self.run = 0
+        self.invalidated = False
+
+        if self.path.exists():
+            with np.load(self.path, allow_pickle=False) as z:
+                if str(z["fingerprint"]) == fingerprint:
+                    self.keys = z["keys"]
+                    self.values = z["values"]
+                    self.last_used = z["last_used"]
+                    self.run = int(z["run"])
+                else:
+                    self.invalidated = True
+        self.run += 1
+
+        self._new_keys: list[np.ndarray] = []
+        self._new_values: list[np.ndarray] = []
+        self.n_lookups = 0
+        self.n_hits = 0
+
+    @classmethod
+    def for_model(
+        cls,
+        model_name: str,
+        version: str | None = "baseline",
+        model_type: str = "dl",
+        **kwargs,
+    ) -> "ScoreCache":
+        """저장된 모델/scaler 파일로 fingerprint를 계산해 캐시를 엽니다."""
+        assert model_type in {"ml", "dl"}, "model_type must be 'ml' or 'dl'"
+        v = (version or "baseline").strip() or "baseline"
+        if model_type == "dl":
+            from app.utils.load_model import dl_weight_path
+
+            model_path = dl_weight_path(model_name, v)
+        else:
+            model_path = Path(PATHS["models_ml"]) / model_name / v / "model.pkl"
+            if not model_path.exists():
+                raise FileNotFoundError(f"ML 모델 파일이 없습니다: {model_path}")
+
+        scaler_path = Path(PATHS["models_preprocessing"]) / model_name / v / "scaler.pkl"
+        return cls(model_name, v, file_fingerprint(model_path, scaler_path), **kwargs)
+
+    # ----------------------------
+    # 조회 / 추가
+    # ----------------------------
+    @property
+    def hit_rate(self) -> float:
+        return self.n_hits / self.n_lookups if self.n_lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (hit, values): hit은 bool 마스크, values는 hit 위치에만 유효한 점수.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        values = np.full(len(keys), np.nan)
+        if len(self.keys) == 0:
+            hit = np.zeros(len(keys), dtype=bool)
+        else:
+            pos = np.searchsorted(self.keys, keys)
+            pos_c = np.minimum(pos, len(self.keys) - 1)
+            hit = self.keys[pos_c] == keys
+            values[hit] = self.values[pos_c[hit]]
+            self.last_used[pos_c[hit]] = self.run
+
+        self.n_lookups += len(keys)
+        self.n_hits += int(hit.sum())
+        return hit, values
+
+    def put(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """새 점수 추가 (save() 시 병합)"""
+        self._new_keys.append(np.asarray(keys, dtype=np.uint64))
+        self._new_values.append(np.asarray(values, dtype=np.float64))
+
+    # ----------------------------
+    # 저장 (병합 + 용량 제한)
+    # ----------------------------
+    def save(self) -> str:
+        keys, values, last_used = self.keys, self.values, self.last_used
+        if self._new_keys:
+            new_keys = np.concatenate(self._new_keys)
+            keys = np.concatenate([keys, new_keys])
+            values = np.concatenate([values, np.concatenate(self._new_values)])
+            last_used = np.concatenate([last_used, np.full(len(new_keys), self.run, dtype=np.int32)])
+            self._new_keys, self._new_values = [], []
+
+            # 같은 키는 마지막 값만 유지 (역순 unique → 첫 등장 = 가장 최근)
+            _, idx = np.unique(keys[::-1], return_index=True)
+            idx = len(keys) - 1 - idx
+            keys, values, last_used = keys[idx], values[idx], last_used[idx]
+
+        if len(keys) > self.max_entries:
+            # 최근 사용 순으로 max_entries개만 남김
+            keep = np.argpartition(-last_used.astype(np.int64), self.max_entries - 1)[: self.max_entries]
+            keep.sort()
+            keys, values, last_used = keys[keep], values[keep], last_used[keep]
+
+        self.keys, self.values, self.last_used = keys, values, last_used
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name("scores.tmp.npz")
+        np.savez(
+            tmp,
+            keys=keys,
+            values=values,
+            last_used=last_used,
+            run=np.array(self.run),
+            fingerprint=np.array(self.fingerprint),
+        )
+        os.replace(tmp, self.path)
+        return str(self.path)
@@ -0,0 +1,316 @@
+# app/utils/serving.py
+#
+# 로컬 스코어링 서비스 (asyncio + micro-batching)
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m app.utils.serving --model mlp_enhance --version baseline --type dl --input-dim 40
+#   python -m app.utils.serving --model lgbm --type ml --unix /tmp/churn.sock
+#
+# 요청:
+#   POST /score   {"features": [0.1, 2.0, ...]}           → {"score", "percentile_label", "risk_level"}
+#   POST /score   {"instances": [[...], [...]]}           → {"results": [...]}
+#   GET  /health  → 요청/배치 통계
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.utils.inference import (
+    RISK_LEVEL_LABELS,
+    interpret_percentiles_array,
+    load_score_percentiles,
+    percentile_labels,
+    predict_proba_dl,
+    predict_proba_ml,
+    prepare_percentile_table,
+)
+from app.utils.load_model import load_dl_model, load_ml_model, load_scaler
+
+
+class MicroBatcher:
+    """
+    동시에 들어온 단건 요청을 하나의 배치로 묶어 예측합니다.
+
+    첫 요청이 도착한 뒤 max_latency_ms 동안(또는 max_batch_size가 찰 때까지) 요청을 모으고,
+    predict_fn(X)는 이벤트 루프를 막지 않도록 전용 스레드에서 실행합니다.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 256, max_latency_ms: float = 5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = int(max_batch_size)
+        self.max_latency = max_latency_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.n_requests = 0
+        self.n_batches = 0
+
+    async def submit(self, x: np.ndarray) -> float:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((x, fut))
+        return await fut
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            items = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency
+
+            while len(items) < self.max_batch_size:
+                # 이미 대기 중인 요청은 바로 가져오기
+                while not self._queue.empty() and len(items) < self.max_batch_size:
+                    items.append(self._queue.get_nowait())
+                timeout = deadline - loop.time()
+                if len(items) >= self.max_batch_size or timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # 피처 길이별로 묶어서 예측 (input_dim을 모르는 ML 모델에서 길이가 다른 요청이 섞여도
+            # 그 요청만 실패하고 나머지 배치와 batcher 루프는 계속 동작)
+            groups: dict[tuple, list] = {}
+            for x, fut in items:
+                groups.setdefault(np.shape(x), []).append((x, fut))
+
+            for group in groups.values():
+                try:
+                    X = np.stack([x for x, _ in group]).astype(np.float32, copy=False)
+                    probs = await loop.run_in_executor(self._executor, self.predict_fn, X)
+                except Exception as e:  # 그룹 전체 실패 → 각 요청에 에러 전달
+                    for _, fut in group:
+                        if not fut.done():
+                            fut.set_exception(e)
+                    continue
+
+                self.n_batches += 1
+                for (_, fut), p in zip(group, probs):
+                    if not fut.done():
+                        fut.set_result(float(p))
+            self.n_requests += len(items)
+
+
+class ScoringService:
+    """
+    load_dl_model / load_ml_model / load_scaler로 모델을 한 번 불러와 두고
+    점수 + 백분위 라벨 + 위험 등급을 반환하는 서비스.
+    use_scaler=True여도 scaler.pkl이 없으면 scaler 없이 스코어링합니다.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        version: str | None = "baseline",
+        model_type: str = "dl",
+        input_dim: int | None = None,
+        device: str = "cpu",
+        use_scaler: bool = True,
+        max_batch_size: int = 256,
+        max_latency_ms: float = 5.0,
+    ):
+        assert model_type in {"ml", "dl"}, "model_type must be 'ml' or 'dl'"
+        self.model_name = model_name
+        self.model_type = model_type
+        self.device = device
+
+        if model_type == "dl":
+            if input_dim is None:
+                raise ValueError("DL 모델은 input_dim이 필요합니다.")
+            self.model, self.model_name, _ = load_dl_model(model_name, version, input_dim, device=device)
+        else:
+            self.model = load_ml_model(model_name, version)
+            input_dim = getattr(self.model, "n_features_in_", input_dim)
+        self.input_dim = input_dim
+
+        # scaler.pkl이 없는 모델(트리 계열 ML 등)은 export.py와 같이 scaler 없이 진행
+        self.scaler = None
+        if use_scaler:
+            try:
+                self.scaler = load_scaler(model_name, version)
+            except FileNotFoundError:
+                print(f"[INFO] scaler.pkl이 없어 scaler 없이 스코어링합니다: {model_name}/{version}")
+
+        try:
+            self.percentiles = prepare_percentile_table(load_score_percentiles(model_name))
+        except FileNotFoundError:
+            self.percentiles = prepare_percentile_table([])
+
+        self.batcher = MicroBatcher(self._predict, max_batch_size, max_latency_ms)
+
+    def _predict(self, X: np.ndarray) -> np.ndarray:
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        if self.model_type == "dl":
+            return predict_proba_dl(self.model, X, device=self.device)
+        return predict_proba_ml(self.model, X)
+
+    def _annotate(self, score: float) -> dict:
+        result = {"score": score, "percentile_label": None, "risk_level": None}
+        if len(self.percentiles["pct"]):
+            res = interpret_percentiles_array([score], self.percentiles)
+            result["percentile_label"] = percentile_labels(res)[0]
+            result["risk_level"] = RISK_LEVEL_LABELS[int(res["risk_tier"][0])]
+        return result
+
+    async def score(self, features) -> dict:
+        x = np.asarray(features, dtype=np.float32).reshape(-1)
+        if self.input_dim is not None and len(x) != self.input_dim:
+            raise ValueError(f"features 길이가 {len(x)}입니다 (필요: {self.input_dim}).")
+        return self._annotate(await self.batcher.submit(x))
+
+    async def handle(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if method == "GET" and path == "/health":
+            n_batches = self.batcher.n_batches
+            return 200, {
+                "model_name": self.model_name,
+                "model_type": self.model_type,
+                "input_dim": self.input_dim,
+                "n_requests": self.batcher.n_requests,
+                "n_batches": n_batches,
+                "mean_batch_size": self.batcher.n_requests / n_batches if n_batches else 0.0,
+            }
+
+        if method == "POST" and path == "/score":
+            try:
+                payload = json.loads(body or b"{}")
+                if "instances" in payload:
+                    results = await asyncio.gather(*(self.score(x) for x in payload["instances"]))
+                    return 200, {"results": list(results)}
+                return 200, await self.score(payload["features"])
+            except (KeyError, ValueError, TypeError) as e:
+                return 400, {"error": str(e)}
+
+        return 404, {"error": f"unknown route: {method} {path}"}
+
+
+#
+# HTTP (HTTP/1.1 keep-alive, JSON 본문만 지원하는 최소 구현)
+#
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+def _write_response(writer, status: int, payload: dict, keep_alive: bool) -> None:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        + data
+    )
+
+
+async def _handle_connection(service: ScoringService, reader, writer) -> None:
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            lines = head.decode("latin-1").split("\r\n")
+            request_line = lines[0].split(" ", 2)
+            if len(request_line) != 3:
+                _write_response(writer, 400, {"error": f"malformed request line: {lines[0]!r}"}, keep_alive=False)
+                await writer.drain()
+                break
+            method, path, _ = request_line
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    k, v = line.split(":", 1)
+                    headers[k.strip().lower()] = v.strip()
+
+            try:
+                content_length = int(headers.get("content-length", 0))
+            except ValueError:
+                _write_response(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                await writer.drain()
+                break
+            body = await reader.readexactly(content_length)
+
+            try:
+                status, payload = await service.handle(method, path, body)
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+
+            keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+            _write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(
+    service: ScoringService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: str | None = None,
+) -> None:
+    batcher_task = asyncio.create_task(service.batcher.run())
+
+    def handler(reader, writer):
+        return _handle_connection(service, reader, writer)
+
+    if unix_path:
+        server = await asyncio.start_unix_server(handler, path=unix_path)
+        where = f"unix:{unix_path}"
+    else:
+        server = await asyncio.start_server(handler, host=host, port=port)
+        where = f"http://{host}:{port}"
+
+    print(f"[serving] {service.model_name} ({service.model_type}) listening on {where}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher_task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local micro-batching churn scoring service")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--version", default="baseline")
+    parser.add_argument("--type", choices=["dl", "ml"], default="dl")
+    parser.add_argument("--input-dim", type=int, default=None)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--no-scaler", action="store_true")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Unix socket 경로 (지정 시 TCP 대신 사용)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    service = ScoringService(
+        args.model,
+        args.version,
+        model_type=args.type,
+        input_dim=args.input_dim,
+        device=args.device,
+        use_scaler=not args.no_scaler,
+        max_batch_size=args.max_batch_size,
+        max_latency_ms=args.max_latency_ms,
+    )
+    print(f"[serving] model loaded in {time.perf_counter() - t0:.2f}s")
+
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
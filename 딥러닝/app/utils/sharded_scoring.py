@@ -0,0 +1,169 @@
+# app/utils/sharded_scoring.py
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 워커 프로세스마다 한 번만 채워지는 상태 (모델 / 스케일러)
+_WORKER: dict = {}
+
+
+def shard_of(user_ids, n_shards: int) -> np.ndarray:
+    """
+    user_id → shard 번호 (0 ~ n_shards-1).
+
+    Python hash()는 프로세스마다 달라지므로 pandas hash_array(고정 시드)를 사용합니다.
+    같은 user_id는 실행/프로세스와 무관하게 항상 같은 shard로 갑니다.
+    """
+    ids = np.asarray(user_ids).astype(str).astype(object)
+    return (pd.util.hash_array(ids) % np.uint64(n_shards)).astype(np.int64)
+
+
+def _init_worker(spec: dict) -> None:
+    import torch
+
+    torch.set_num_threads(spec["torch_threads"])
+
+    model = spec.get("model")
+    scaler = spec.get("scaler")
+    if model is None:
+        from app.utils.load_model import load_dl_model, load_ml_model, load_scaler
+
+        if spec["model_type"] == "dl":
+            model, _, _ = load_dl_model(spec["model_name"], spec["version"], spec["input_dim"])
+        else:
+            model = load_ml_model(spec["model_name"], spec["version"])
+        if spec["use_scaler"]:
+            scaler = load_scaler(spec["model_name"], spec["version"])
+
+    if spec["model_type"] == "dl":
+        model.eval()
+
+    _WORKER.update(model=model, scaler=scaler, model_type=spec["model_type"], barrier=spec["barrier"])
+
+
+def _wait_all_workers(timeout: float) -> int:
+    # n_workers개가 모두 도착할 때까지 이 워커를 붙잡아 둠 → 같은 워커가 두 번 받을 수 없음
+    _WORKER["barrier"].wait(timeout)
+    return os.getpid()
+
+
+def _score_chunk(args) -> tuple[np.ndarray, np.ndarray]:
+    from app.utils.inference import predict_proba_dl, predict_proba_ml
+
+    positions, X = args
+    if _WORKER["scaler"] is not None:
+        X = _WORKER["scaler"].transform(X)
+    if _WORKER["model_type"] == "dl":
+        probs = predict_proba_dl(_WORKER["model"], X)
+    else:
+        probs = predict_proba_ml(_WORKER["model"], X)
+    return positions, probs
+
+
+class ShardedScorer:
+    """
+    user_id 해시로 입력을 샤드로 나눠 여러 프로세스에서 동시에 스코어링합니다.
+
+    워커 풀은 생성 시 한 번 띄우고(forkserver), 각 워커는 initializer에서
+    모델/스케일러를 한 번만 불러온 뒤 여러 score() 호출에 재사용합니다.
+    결과는 입력 순서대로 다시 모아 반환합니다.
+    워커마다 torch 스레드를 torch_threads(기본 1)로 제한해 코어를 나눠 씁니다.
+
+    모델은 이름/버전으로 각 워커가 직접 불러오거나(load_dl_model / load_ml_model / load_scaler),
+    model=, scaler=로 메모리의 객체를 넘길 수도 있습니다(워커 시작 시 1회 전달).
+
+    사용 예시:
+        >>> with ShardedScorer("mlp_enhance", "baseline", "dl", input_dim=40, n_workers=8) as scorer:
+        ...     y_prob = scorer.score(X, df["user_id"])
+    """
+
+    def __init__(
+        self,
+        model_name: str | None = None,
+        version: str | None = "baseline",
+        model_type: str = "dl",
+        input_dim: int | None = None,
+        n_workers: int | None = None,
+        use_scaler: bool = True,
+        model=None,
+        scaler=None,
+        torch_threads: int = 1,
+        chunk_size: int = 65_536,
+        start_method: str = "forkserver",
+    ):
+        assert model_type in {"ml", "dl"}, "model_type must be 'ml' or 'dl'"
+        if model is None and model_name is None:
+            raise ValueError("model_name 또는 model 중 하나는 필요합니다.")
+
+        self.n_workers = int(n_workers or os.cpu_count() or 1)
+        self.chunk_size = int(chunk_size)
+
+        if start_method not in mp.get_all_start_methods():  # Windows: spawn만 지원
+            start_method = "spawn"
+        ctx = mp.get_context(start_method)
+
+        spec = {
+            "model_name": model_name,
+            "version": version,
+            "model_type": model_type,
+            "input_dim": input_dim,
+            "use_scaler": use_scaler,
+            "model": model,
+            "scaler": scaler,
+            "torch_threads": int(torch_threads),
+            # warmup()용: 워커 생성 시 상속으로만 전달 가능하므로 initargs에 포함
+            "barrier": ctx.Barrier(self.n_workers),
+        }
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(spec,),
+        )
+
+    def warmup(self, timeout: float = 300.0) -> None:
+        """
+        워커를 모두 띄우고 모델 로드를 끝내 둡니다 (벤치마크/첫 요청 지연 제거용).
+
+        워커당 하나씩 n_workers개의 작업을 보내고, 각 작업은 n_workers개가 모두 도착할 때까지 barrier에서 기다립니다.
+        기다리는 워커는 다른 작업을 받을 수 없으므로 모든 워커가 _init_worker를 마쳐야 반환됩니다.
+        """
+        futures = [self._pool.submit(_wait_all_workers, timeout) for _ in range(self.n_workers)]
+        pids = {f.result() for f in futures}
+        if len(pids) != self.n_workers:
+            raise RuntimeError(f"warmup: {self.n_workers}개 중 {len(pids)}개 워커만 준비되었습니다.")
+
+    def score(self, X, user_ids) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        n = len(X)
+        shard = shard_of(user_ids, self.n_workers)
+
+        # shard별 위치 → chunk_size 단위로 나눠 워커에 전달
+        order = np.argsort(shard, kind="stable")
+        bounds = np.searchsorted(shard[order], np.arange(self.n_workers + 1))
+        tasks = []
+        for s in range(self.n_workers):
+            positions = order[bounds[s]:bounds[s + 1]]
+            for start in range(0, len(positions), self.chunk_size):
+                pos = positions[start:start + self.chunk_size]
+                tasks.append((pos, X[pos]))
+
+        out = np.empty(n, dtype=float)
+        for positions, probs in self._pool.map(_score_chunk, tasks):
+            out[positions] = probs
+        return out
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def __enter__(self) -> "ShardedScorer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
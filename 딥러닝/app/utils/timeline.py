@@ -0,0 +1,226 @@
+# app/utils/timeline.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import numbers
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from app.utils.metrics import EVAL_K_PCTS, ScoreHistogram, topk_metrics
+from app.utils.paths import PATHS
+from app.utils.save import _json_writer, _tmp_path
+
+
+def _anchor_file_key(anchor) -> str:
+    # 읽기 쉬운 접두어 + index 키(str(anchor))의 해시: 치환 후 같아지는 anchor("a/b", "a_b")도 파일이 겹치지 않음
+    key = str(anchor)
+    prefix = key.strip().replace(" ", "_")
+    for ch in ["/", "\\", ":", "*", "?", "\"", "<", ">", "|"]:
+        prefix = prefix.replace(ch, "_")
+    return f"{prefix[:40]}_{hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _anchor_sort_key(anchor) -> list:
+    """
+    anchor 정렬 키 (index.json에 함께 저장): [0, 숫자] < [1, ISO 시각] < [2, 문자열].
+    str(anchor)를 그대로 정렬하면 "10" < "9"가 되어 rolling 윈도우 순서가 틀어집니다.
+    """
+    if isinstance(anchor, str):
+        try:
+            return [0, float(anchor)]
+        except ValueError:
+            pass
+    elif isinstance(anchor, numbers.Real) and not isinstance(anchor, bool):
+        return [0, float(anchor)]
+    try:
+        return [1, pd.Timestamp(anchor).isoformat()]
+    except (TypeError, ValueError):
+        return [2, str(anchor)]
+
+
+class AnchorMetricsTimeline:
+    """
+    anchor_time별 PR-AUC / Top-K 지표 타임라인 (모델 성능 저하 모니터링용).
+
+    anchor마다 두 가지 부분 집계를 디스크에 캐시합니다.
+      - 정확한 요약(index.json): n, 양성 수, PR-AUC, EVAL_K_PCTS의 Top-K 지표
+      - ScoreHistogram(hist_<anchor>_<hash>.npz): 롤링 윈도우 병합용
+
+    update()는 캐시에 없는 anchor만 계산하므로, 새 anchor가 추가되면
+    그 anchor 데이터만 처리하면 됩니다. rolling()은 히스토그램을 더하고 빼는
+    방식으로 윈도우를 이동하므로 과거 데이터를 다시 읽지 않습니다.
+
+    저장 위치: models/metrics/{model_name}/{version}/timeline/
+
+    사용 예시:
+        >>> tl = AnchorMetricsTimeline("mlp_enhance", "baseline")
+        >>> tl.update(scored_df)                 # user_id, anchor_time, target, y_prob
+        >>> tl.per_anchor()
+        >>> tl.rolling(window=4)
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        version: str | None = "baseline",
+        cache_dir: str | Path | None = None,
+        n_bins: int = 100_000,
+    ):
+        v = (version or "baseline").strip() or "baseline"
+        if cache_dir is None:
+            cache_dir = Path(PATHS["models_metrics"]) / model_name / v / "timeline"
+        self.cache_dir = Path(cache_dir)
+        self.n_bins = int(n_bins)
+
+        self._index_path = self.cache_dir / "index.json"
+        self._index: dict[str, dict] = {}
+        if self._index_path.exists():
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+
+        self._hists: dict[str, ScoreHistogram] = {}
+
+    # ----------------------------
+    # 캐시 갱신
+    # ----------------------------
+    @property
+    def anchors(self) -> list[str]:
+        # 저장된 sort_key 순서 (이전 형식의 index.json은 key 문자열에서 다시 계산)
+        return sorted(self._index, key=lambda k: tuple(self._index[k].get("sort_key") or _anchor_sort_key(k)))
+
+    def update(
+        self,
+        df: pd.DataFrame,
+        anchor_col: str = "anchor_time",
+        label_col: str = "target",
+        score_col: str = "y_prob",
+        overwrite: bool = False,
+    ) -> list[str]:
+        """
+        df의 anchor 중 캐시에 없는 것만 집계해 저장합니다 (overwrite=True면 다시 계산).
+
+        Returns:
+            list[str]: 새로 계산한 anchor 목록.
+        """
+        from sklearn.metrics import average_precision_score
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        computed: list[str] = []
+        for anchor, g in df.groupby(anchor_col, sort=True):
+            key = str(anchor)
+            if key in self._index and not overwrite:
+                continue
+
+            y_true = g[label_col].to_numpy().astype(int)
+            y_prob = g[score_col].to_numpy().astype(float)
+
+            hist = ScoreHistogram(self.n_bins).update(y_true, y_prob)
+            hist_path = self.cache_dir / f"hist_{_anchor_file_key(anchor)}.npz"
+            tmp = _tmp_path(hist_path)
+            with open(tmp, "wb") as f:
+                hist.save(f)
+            os.replace(tmp, hist_path)
+            self._hists[key] = hist
+            old_file = self._index.get(key, {}).get("hist_file")
+            if old_file and old_file != hist_path.name:  # 이전 형식의 파일 이름으로 캐시된 anchor를 다시 계산한 경우
+                (self.cache_dir / old_file).unlink(missing_ok=True)
+
+            topk = topk_metrics(y_true, y_prob, EVAL_K_PCTS)
+            pr_auc = float(average_precision_score(y_true, y_prob)) if topk["n_positive"] > 0 else 0.0
+
+            self._index[key] = {
+                "sort_key": _anchor_sort_key(anchor),
+                "hist_file": hist_path.name,
+                "n_total": topk["n_total"],
+                "n_positive": topk["n_positive"],
+                "base_rate": topk["base_rate"],
+                "pr_auc": pr_auc,
+                "metrics_by_k": [
+                    {
+                        "k_pct": float(k),
+                        "precision_at_k": float(topk["precision"][i]),
+                        "recall_at_k": float(topk["recall"][i]),
+                        "lift_at_k": float(topk["lift"][i]),
+                        "t_k": float(topk["cutoff"][i]),
+                    }
+                    for i, k in enumerate(EVAL_K_PCTS)
+                ],
+            }
+            computed.append(key)
+
+        if computed:
+            # temp 파일 → os.replace: 중간에 중단돼도 index.json은 이전 내용 또는 완성된 새 내용
+            tmp = _tmp_path(self._index_path)
+            _json_writer(self._index)(tmp)
+            os.replace(tmp, self._index_path)
+
+        return computed
+
+    def _hist(self, key: str) -> ScoreHistogram:
+        if key not in self._hists:
+            self._hists[key] = ScoreHistogram.load(self.cache_dir / self._index[key]["hist_file"])
+        return self._hists[key]
+
+    # ----------------------------
+    # 조회
+    # ----------------------------
+    def per_anchor(self) -> pd.DataFrame:
+        """anchor별 정확한 지표 (update 시점에 계산해 둔 값)."""
+        rows = []
+        for key in self.anchors:
+            item = self._index[key]
+            row = {
+                "anchor_time": key,
+                "n_total": item["n_total"],
+                "base_rate": item["base_rate"],
+                "pr_auc": item["pr_auc"],
+            }
+            for m in item["metrics_by_k"]:
+                k = f"{m['k_pct']:g}"
+                row[f"precision@{k}%"] = m["precision_at_k"]
+                row[f"recall@{k}%"] = m["recall_at_k"]
+                row[f"lift@{k}%"] = m["lift_at_k"]
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def rolling(self, window: int = 4, k_pcts=EVAL_K_PCTS) -> pd.DataFrame:
+        """
+        최근 window개 anchor를 합친 지표 (히스토그램 근사, 오차는 ScoreHistogram 참고).
+
+        윈도우가 한 칸 이동할 때 들어오는 anchor는 더하고 나가는 anchor는 빼므로
+        anchor당 O(n_bins)입니다.
+        """
+        keys = self.anchors
+        acc = ScoreHistogram(self.n_bins)
+
+        rows = []
+        for i, key in enumerate(keys):
+            acc.merge(self._hist(key))
+            if i >= window:
+                old = self._hist(keys[i - window])
+                acc.pos -= old.pos
+                acc.neg -= old.neg
+
+            topk = acc.topk(k_pcts)
+            lo, hi = acc.pr_auc_bounds()
+            row = {
+                "anchor_time": key,
+                "window": min(i + 1, window),
+                "n_total": acc.n_total,
+                "base_rate": acc.base_rate,
+                "pr_auc": acc.pr_auc(),
+                "pr_auc_lo": lo,
+                "pr_auc_hi": hi,
+            }
+            for j, k in enumerate(topk["k_pct"]):
+                row[f"precision@{k:g}%"] = float(topk["precision"][j])
+                row[f"recall@{k:g}%"] = float(topk["recall"][j])
+                row[f"lift@{k:g}%"] = float(topk["lift"][j])
+            rows.append(row)
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,229 @@
+# app/utils/warmup.py
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from app.utils.model_registry import REGISTRY
+from app.utils.paths import PATHS
+
+# 선택 설정 파일: 없으면 저장된 모델 폴더를 스캔해서 대상 결정
+WARMUP_CONFIG_FILE = "warmup.json"
+
+
+def discover_warmup_specs() -> list[dict]:
+    """
+    워밍업 대상 목록을 만듭니다.
+
+    1) models/configs/warmup.json이 있으면 그대로 사용
+       {"models": [{"model_name": "mlp_enhance", "version": "baseline", "model_type": "dl", "input_dim": 40}]}
+    2) 없으면 저장된 모델을 스캔
+       - DL: models/dl/{name}/{version}/model.manifest.json (input_dim을 manifest에서 읽음, 가중치는 열지 않음)
+       - ML: models/ml/{name}/{version}/model.pkl
+       int8 양자화 버전({version}_int8)은 제외합니다.
+    """
+    config_path = Path(PATHS["models_configs"]) / WARMUP_CONFIG_FILE
+    if config_path.exists():
+        with open(config_path, "r", encoding="utf-8") as f:
+            return list(json.load(f).get("models", []))
+
+    specs = []
+    for manifest in sorted(Path(PATHS["models_dl"]).glob("*/*/model.manifest.json")):
+        version_dir = manifest.parent
+        if version_dir.name.endswith("_int8"):
+            continue
+        with open(manifest, "r", encoding="utf-8") as f:
+            input_dim = json.load(f).get("input_dim")
+        if input_dim:
+            specs.append({
+                "model_name": version_dir.parent.name,
+                "version": version_dir.name,
+                "model_type": "dl",
+                "input_dim": int(input_dim),
+            })
+    for pkl in sorted(Path(PATHS["models_ml"]).glob("*/*/model.pkl")):
+        specs.append({"model_name": pkl.parent.parent.name, "version": pkl.parent.name, "model_type": "ml"})
+    return specs
+
+
+class _Task:
+    __slots__ = ("spec", "status", "seconds", "steps", "error", "done")
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.status = "pending"  # pending → loading → ready / failed
+        self.seconds = None
+        self.steps: dict[str, float] = {}
+        self.error = None
+        self.done = threading.Event()
+
+
+class Warmup:
+    """
+    대시보드 시작 시 백그라운드 스레드에서 모델을 미리 준비합니다.
+
+    대상마다 (1) 모델 (2) scaler (3) percentile 테이블을 REGISTRY(프로세스 공용 캐시)에 올리고
+    (4) 더미 배치를 한 번 흘려 첫 forward 비용까지 치러 둡니다. 실패한 대상은 failed로 기록하고 다음으로 넘어갑니다.
+
+    페이지는 get_model()로 모델을 받습니다. REGISTRY의 키별 lock 덕분에
+    - 이미 준비된 모델: 바로 반환
+    - 워밍업 스레드가 로드 중인 모델: 그 로드가 끝날 때까지만 대기
+    - 아직 순서가 오지 않은 모델: 페이지에서 바로 로드 (이후 워밍업은 캐시 hit)
+    이므로 필요한 모델이 준비되지 않은 경우에만 기다립니다.
+
+    사용 예시:
+        >>> warmup = start_warmup()            # Home.py에서 한 번 (두 번째 호출부터는 같은 객체)
+        >>> warmup.status()["n_ready"]
+        >>> model, name, path = get_model("mlp_enhance", "baseline", "dl", input_dim=40)
+    """
+
+    def __init__(self, specs: list[dict], registry=REGISTRY, dummy_batch: int = 256):
+        self.registry = registry
+        self.dummy_batch = int(dummy_batch)
+        self.tasks = [_Task(dict(spec)) for spec in specs]
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> "Warmup":
+        with self._lock:
+            if self._thread is None:
+                self.started_at = time.time()
+                self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        for task in self.tasks:
+            task.status = "loading"
+            t0 = time.perf_counter()
+            try:
+                self._warm(task)
+                task.status = "ready"
+            except Exception as e:  # 한 모델 실패가 나머지 워밍업을 막지 않도록
+                task.status = "failed"
+                task.error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+            task.seconds = time.perf_counter() - t0
+            task.done.set()
+        self.finished_at = time.time()
+
+    def _warm(self, task: _Task) -> None:
+        import numpy as np
+
+        from app.utils.inference import predict_proba_dl, predict_proba_ml
+
+        spec = task.spec
+        name, version = spec["model_name"], spec.get("version", "baseline")
+
+        def step(label, fn):
+            t0 = time.perf_counter()
+            out = fn()
+            task.steps[label] = time.perf_counter() - t0
+            return out
+
+        if spec.get("model_type", "dl") == "dl":
+            input_dim = int(spec["input_dim"])
+            model, _, _ = step("model", lambda: self.registry.dl_model(name, version, input_dim=input_dim))
+        else:
+            model = step("model", lambda: self.registry.ml_model(name, version))
+            input_dim = int(getattr(model, "n_features_in_", 0) or spec.get("input_dim", 0))
+
+        if (Path(PATHS["models_preprocessing"]) / name / version / "scaler.pkl").exists():
+            step("scaler", lambda: self.registry.scaler(name, version))
+        if (Path(PATHS["models_metrics"]) / f"{name}_score_percentiles.json").exists():
+            step("percentiles", lambda: self.registry.percentiles(name))
+
+        if input_dim:
+            X = np.zeros((self.dummy_batch, input_dim), dtype=np.float32)
+            if spec.get("model_type", "dl") == "dl":
+                step("dummy_batch", lambda: predict_proba_dl(model, X))
+            else:
+                step("dummy_batch", lambda: predict_proba_ml(model, X))
+
+    # ----------------------------
+    # 조회
+    # ----------------------------
+    def find(self, model_name: str, version: str | None = "baseline") -> _Task | None:
+        v = (version or "baseline").strip() or "baseline"
+        for task in self.tasks:
+            if task.spec["model_name"] == model_name and task.spec.get("version", "baseline") == v:
+                return task
+        return None
+
+    def wait(self, model_name: str, version: str | None = "baseline", timeout: float | None = None) -> bool:
+        """해당 모델의 워밍업이 끝날 때까지 대기. 준비되면 True (대상이 아니면 바로 False)."""
+        task = self.find(model_name, version)
+        if task is None:
+            return False
+        task.done.wait(timeout)
+        return task.status == "ready"
+
+    @property
+    def done(self) -> bool:
+        return all(t.done.is_set() for t in self.tasks)
+
+    def status(self) -> dict:
+        now = self.finished_at or time.time()
+        return {
+            "n_total": len(self.tasks),
+            "n_ready": sum(t.status == "ready" for t in self.tasks),
+            "n_failed": sum(t.status == "failed" for t in self.tasks),
+            "done": self.done,
+            "elapsed_seconds": (now - self.started_at) if self.started_at else 0.0,
+            "tasks": [
+                {
+                    "model_name": t.spec["model_name"],
+                    "version": t.spec.get("version", "baseline"),
+                    "model_type": t.spec.get("model_type", "dl"),
+                    "status": t.status,
+                    "seconds": t.seconds,
+                    "steps": dict(t.steps),
+                    "error": t.error,
+                }
+                for t in self.tasks
+            ],
+        }
+
+    def summary(self) -> str:
+        s = self.status()
+        if s["n_total"] == 0:
+            return "모델 워밍업: 대상 없음"
+        state = "완료" if s["done"] else "진행 중"
+        failed = f", 실패 {s['n_failed']}" if s["n_failed"] else ""
+        return f"모델 워밍업 {state}: {s['n_ready']}/{s['n_total']} 준비{failed} ({s['elapsed_seconds']:.1f}s)"
+
+
+# 프로세스당 하나 (Streamlit rerun / 여러 세션이 공유)
+_WARMUP: Warmup | None = None
+_WARMUP_LOCK = threading.Lock()
+
+
+def start_warmup(specs: list[dict] | None = None, dummy_batch: int = 256) -> Warmup:
+    """워밍업을 시작하고 객체를 반환합니다. 이미 시작했으면 기존 객체를 그대로 반환합니다."""
+    global _WARMUP
+    with _WARMUP_LOCK:
+        if _WARMUP is None:
+            _WARMUP = Warmup(discover_warmup_specs() if specs is None else specs, dummy_batch=dummy_batch).start()
+        return _WARMUP
+
+
+def get_model(
+    model_name: str,
+    version: str | None = "baseline",
+    model_type: str = "dl",
+    input_dim: int | None = None,
+):
+    """
+    페이지용 모델 조회. REGISTRY에서 바로 가져오며, 워밍업 스레드가 같은 모델을 로드 중이면 그때까지만 대기합니다.
+    DL은 load_dl_model과 같은 (model, actual_name, weight_path), ML은 모델 객체를 반환합니다.
+    """
+    assert model_type in {"ml", "dl"}, "model_type must be 'ml' or 'dl'"
+    if model_type == "dl":
+        if input_dim is None:
+            raise ValueError("DL 모델은 input_dim이 필요합니다.")
+        return REGISTRY.dl_model(model_name, version, input_dim=input_dim)
+    return REGISTRY.ml_model(model_name, version)
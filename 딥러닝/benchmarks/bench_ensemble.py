@@ -0,0 +1,65 @@
+# benchmarks/bench_ensemble.py
+#
+# MLP_advanced 앙상블 추론 벤치마크: 구성원 루프(노트북 방식) vs StackedMLPEnsemble(한 번의 forward)
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m benchmarks.bench_ensemble --members 5 --hidden-dim 1024 --batch 1 32 256 4096
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import torch
+
+from models.model_definitions import MLP_enhance, StackedMLPEnsemble
+
+
+def _best_of(fn, repeat: int) -> float:
+    fn()  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ensemble member loop vs stacked single-pass forward")
+    parser.add_argument("--input-dim", type=int, default=40)
+    parser.add_argument("--hidden-dim", type=int, default=1024)
+    parser.add_argument("--members", type=int, default=5)
+    parser.add_argument("--activation", default="selu")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 32, 256, 4096])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    torch.manual_seed(42)
+    members = [
+        MLP_enhance(args.input_dim, args.hidden_dim, activation=args.activation).eval()
+        for _ in range(args.members)
+    ]
+    ensemble = StackedMLPEnsemble.from_members(members)
+
+    def loop(x):
+        probs = torch.zeros(x.size(0))
+        for m in members:
+            probs += torch.sigmoid(m(x).squeeze(-1))
+        return probs / len(members)
+
+    print(f"members = {args.members}, hidden_dim = {args.hidden_dim}  (best of {args.repeat})")
+    print(f"{'batch':>6} | {'loop':>10} | {'stacked':>10} | {'speedup':>7} | max diff")
+    print("-" * 56)
+
+    with torch.no_grad():
+        for bs in args.batch:
+            x = torch.randn(bs, args.input_dim)
+            t_loop = _best_of(lambda: loop(x), args.repeat)
+            t_stack = _best_of(lambda: ensemble.predict_proba_stats(x), args.repeat)
+            diff = (loop(x) - ensemble.predict_proba_stats(x)[0]).abs().max().item()
+            print(f"{bs:>6} | {t_loop * 1e3:>8.2f}ms | {t_stack * 1e3:>8.2f}ms | {t_loop / t_stack:>6.2f}x | {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# benchmarks/bench_import_time.py
+#
+# 대시보드 시작 시간(import) 벤치마크 + 회귀 예산 확인 (python -X importtime 기반)
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m benchmarks.bench_import_time            # 측정 + 예산 확인 (초과 시 exit 1)
+#   python -m benchmarks.bench_import_time --top 15   # 가장 무거운 top-level import 목록
+#
+# 예산은 benchmarks/import_budget.json에 있습니다.
+#   - pages: 페이지 파일의 import 문만 새 인터프리터에서 실행한 누적 시간(ms) 상한
+#   - forbidden: 해당 모듈을 import했을 때 딸려오면 안 되는 무거운 패키지 (torch, sklearn, matplotlib 등)
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # 딥러닝/
+BUDGET_PATH = Path(__file__).with_name("import_budget.json")
+
+
+def _page_imports(page: Path) -> str:
+    """
+    페이지 스크립트의 모듈 레벨 import 문만 뽑아 한 줄 코드로 (UI 코드는 실행하지 않음).
+    try/if/with 블록 안의 import는 포함하고, 함수 안의 지연 import는 제외합니다.
+    """
+    def collect(body):
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                yield ast.unparse(node)
+            elif isinstance(node, (ast.If, ast.Try, ast.With)):
+                for field in ("body", "orelse", "finalbody"):
+                    yield from collect(getattr(node, field, []))
+                for handler in getattr(node, "handlers", []):
+                    yield from collect(handler.body)
+
+    tree = ast.parse(page.read_text(encoding="utf-8"))
+    return "; ".join(collect(tree.body))
+
+
+def _importtime(code: str, sys_path: Path, repeat: int) -> tuple[float, dict[str, float]]:
+    """
+    새 인터프리터에서 code를 실행하고 -X importtime 출력을 파싱합니다.
+
+    Returns:
+        (총 누적 시간 ms, top-level 패키지별 누적 시간 ms) - repeat 중 가장 빠른 실행 기준
+    """
+    best_total, best_pkgs = float("inf"), {}
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {str(sys_path)!r}); {code}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise ImportError(proc.stderr.strip().splitlines()[-1])
+
+        pkgs: dict[str, float] = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+            name = name[1:]  # 구분자 뒤 공백 1칸 제거 → 남은 들여쓰기 = import 깊이
+            if not name.startswith(" "):  # top-level import만 합산 (누적값이라 하위 import 포함)
+                top = name.split(".")[0]
+                pkgs[top] = pkgs.get(top, 0.0) + int(cumulative) / 1000
+
+        total = sum(pkgs.values())
+        if total < best_total:
+            best_total, best_pkgs = total, pkgs
+    return best_total, best_pkgs
+
+
+def _imported_modules(code: str, sys_path: Path) -> set[str]:
+    out = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; sys.path.insert(0, {str(sys_path)!r}); {code}; "
+            "print('\\n'.join(sorted({m.split('.')[0] for m in sys.modules})))",
+        ],
+        cwd=ROOT,
+        text=True,
+    )
+    return set(out.split())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time benchmark with regression budget")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--budget", default=str(BUDGET_PATH))
+    args = parser.parse_args()
+
+    with open(args.budget, "r", encoding="utf-8") as f:
+        budget = json.load(f)
+
+    failures = []
+
+    print(f"[pages] import 누적 시간 (best of {args.repeat})")
+    for name, spec in budget["pages"].items():
+        page = ROOT / spec["path"]
+        try:
+            total, pkgs = _importtime(_page_imports(page), ROOT / "app", args.repeat)
+        except ImportError as e:  # 대시보드 의존성(streamlit 등)이 없는 환경
+            print(f"  {name:<10} SKIP ({e})")
+            continue
+        limit = spec["budget_ms"]
+        status = "OK" if total <= limit else "OVER"
+        print(f"  {name:<10} {total:8.1f}ms / budget {limit:.0f}ms  [{status}]")
+        for pkg, ms in sorted(pkgs.items(), key=lambda x: -x[1])[: args.top]:
+            print(f"      {pkg:<24} {ms:8.1f}ms")
+        if total > limit:
+            failures.append(f"{name}: {total:.0f}ms > {limit:.0f}ms")
+
+    print("\n[modules] import 시 불러오면 안 되는 패키지")
+    forbidden = set(budget["forbidden"]["packages"])
+    for module in budget["forbidden"]["modules"]:
+        leaked = sorted(_imported_modules(f"import {module}", ROOT) & forbidden)
+        print(f"  {module:<28} {'OK' if not leaked else 'LEAK: ' + ', '.join(leaked)}")
+        if leaked:
+            failures.append(f"{module} imports {', '.join(leaked)}")
+
+    if failures:
+        print("\n❌ import 예산 초과:\n  - " + "\n  - ".join(failures))
+        sys.exit(1)
+    print("\n✅ import 예산 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_numpy_backend.py
+#
+# NumPy 백엔드 벤치마크: import 시간(콜드 스타트)과 단건(batch=1) 지연 시간을 torch 경로와 비교
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m benchmarks.bench_numpy_backend
+#   python -m benchmarks.bench_numpy_backend --activation selu --hidden-dim 1024
+#
+# 학습 없이 통계를 채운 MLP_enhance(eval)와 임의 StandardScaler로 측정하며, 두 경로의 확률 차이도 함께 출력합니다.
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+_IMPORT_SNIPPETS = {
+    "numpy backend": "from app.utils.inference import load_numpy_model",
+    "torch backend": "import torch; from app.utils.load_model import load_dl_model",
+}
+
+
+def _import_seconds(snippet: str, repeat: int) -> float:
+    # 새 인터프리터에서 측정해야 모듈 캐시 없이 콜드 스타트 비용이 나옵니다
+    code = f"import time; t0 = time.perf_counter(); {snippet}; print(time.perf_counter() - t0)"
+    runs = [float(subprocess.check_output([sys.executable, "-c", code]).decode().strip()) for _ in range(repeat)]
+    return min(runs)
+
+
+def _per_call_us(fn, repeat: int) -> float:
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NumPy vs torch backend: import time and single-row latency")
+    parser.add_argument("--input-dim", type=int, default=40)
+    parser.add_argument("--hidden-dim", type=int, default=128)
+    parser.add_argument("--activation", default="relu")
+    parser.add_argument("--import-repeat", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("[import time] (fresh interpreter, best of", args.import_repeat, ")")
+    for name, snippet in _IMPORT_SNIPPETS.items():
+        print(f"  {name:<14}: {_import_seconds(snippet, args.import_repeat) * 1e3:8.1f}ms")
+
+    import torch
+    from sklearn.preprocessing import StandardScaler
+
+    from app.utils.export import fuse_for_inference
+    from app.utils.inference import NumpyMLP, predict_proba_dl
+    from models.model_definitions import MLP_enhance
+
+    rng = np.random.default_rng(42)
+    X = (rng.normal(size=(10_000, args.input_dim)) * 3 + 1).astype(np.float32)
+    scaler = StandardScaler().fit(X)
+
+    torch.manual_seed(42)
+    model = MLP_enhance(args.input_dim, args.hidden_dim, activation=args.activation)
+    model.train()
+    with torch.no_grad():
+        for _ in range(5):  # BatchNorm running 통계 채우기
+            model(torch.as_tensor(scaler.transform(X[:1024]), dtype=torch.float32) * 1.5)
+    model.eval()
+
+    fused = fuse_for_inference(model, scaler)
+    linears = [m for m in fused.net if isinstance(m, torch.nn.Linear)]
+    np_model = NumpyMLP(
+        [lin.weight.detach().numpy() for lin in linears],
+        [lin.bias.detach().numpy() for lin in linears],
+        fused.activation_name,
+    )
+
+    ref = predict_proba_dl(model, scaler.transform(X))
+    diff = np.max(np.abs(np_model.predict_proba(X) - ref))
+    print(f"\n[equivalence] max |p_numpy - p_torch| = {diff:.2e}  (n = {len(X):,})")
+
+    x1 = X[:1]
+    t_torch = _per_call_us(lambda: predict_proba_dl(model, scaler.transform(x1)), args.repeat)
+    t_numpy = _per_call_us(lambda: np_model.predict_proba(x1), args.repeat)
+    print("\n[single-row latency]")
+    print(f"  torch (scaler + model): {t_torch:8.1f}us")
+    print(f"  numpy (fused)         : {t_numpy:8.1f}us  ({t_torch / t_numpy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_sharded_scoring.py
+#
+# ShardedScorer 스케일링 벤치마크: 워커 1 ~ N개에서 처리량(rows/s)과 속도 향상 비율 측정
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m benchmarks.bench_sharded_scoring --rows 1000000 --workers 1 2 4 8
+#   python -m benchmarks.bench_sharded_scoring --model mlp_enhance --version baseline --input-dim 40
+#
+# --model을 주지 않으면 학습 없이 advanced 설정(hidden_dim=1024)의 MLP_enhance로 측정합니다.
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.utils.inference import predict_proba_dl
+from app.utils.sharded_scoring import ShardedScorer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded scoring scaling benchmark")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--input-dim", type=int, default=40)
+    parser.add_argument("--hidden-dim", type=int, default=1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--model", default=None, help="저장된 모델 이름 (없으면 데모 모델)")
+    parser.add_argument("--version", default="baseline")
+    parser.add_argument("--type", choices=["dl", "ml"], default="dl")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    n_cpu = os.cpu_count() or 1
+    workers = args.workers or sorted({1, 2, 4, 8, n_cpu} & set(range(1, n_cpu + 1)))
+
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(args.rows, args.input_dim)).astype(np.float32)
+    user_ids = np.arange(args.rows).astype(str)
+
+    if args.model:
+        kwargs = dict(model_name=args.model, version=args.version, model_type=args.type, input_dim=args.input_dim)
+        reference = None
+    else:
+        from models.model_definitions import MLP_enhance
+
+        model = MLP_enhance(args.input_dim, hidden_dim=args.hidden_dim).eval()
+        kwargs = dict(model=model, model_type="dl", use_scaler=False)
+        reference = predict_proba_dl(model, X[:10_000])
+
+    print(f"rows = {args.rows:,}, input_dim = {args.input_dim}, cpu = {n_cpu}")
+    print(f"{'workers':>7} | {'seconds':>8} | {'rows/s':>11} | {'speedup':>7}")
+    print("-" * 44)
+
+    base = None
+    for w in workers:
+        with ShardedScorer(n_workers=w, **kwargs) as scorer:
+            scorer.warmup()
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                y_prob = scorer.score(X, user_ids)
+                best = min(best, time.perf_counter() - t0)
+
+        if reference is not None:
+            assert np.allclose(y_prob[:10_000], reference, atol=1e-6), "sharded 결과가 단일 프로세스와 다릅니다"
+
+        base = base or best
+        print(f"{w:>7} | {best:>8.2f} | {args.rows / best:>11,.0f} | {base / best:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
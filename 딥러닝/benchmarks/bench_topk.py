@@ -0,0 +1,62 @@
+# benchmarks/bench_topk.py
+#
+# Top-K 선택 경로 벤치마크: 전체 정렬(argsort) vs 부분 선택(top_n_order)
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m benchmarks.bench_topk --n 1000000 --k 5 10 15 30 50
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from app.utils.metrics import top_n_order, topk_metrics
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Top-K full sort vs partial selection")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--k", type=float, nargs="+", default=[5, 10, 15, 30, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    y_true = (rng.random(args.n) < 0.18).astype(int)
+    # 저장 규칙(소수 5자리)처럼 동점이 생기도록 반올림
+    y_prob = np.round(rng.random(args.n), 5)
+
+    print(f"n = {args.n:,}  (best of {args.repeat})")
+    print(f"{'K%':>6} | {'full sort':>10} | {'partial':>10} | {'speedup':>7} | same")
+    print("-" * 52)
+
+    for k in args.k:
+        n_top = max(int(np.floor(args.n * k / 100)), 1)
+
+        t_full = _best_of(lambda: np.argsort(-y_prob, kind="stable")[:n_top], args.repeat)
+        t_part = _best_of(lambda: top_n_order(y_prob, n_top), args.repeat)
+
+        same = np.array_equal(
+            np.argsort(-y_prob, kind="stable")[:n_top],
+            top_n_order(y_prob, n_top),
+        )
+        print(f"{k:>6g} | {t_full * 1e3:>8.1f}ms | {t_part * 1e3:>8.1f}ms | {t_full / t_part:>6.2f}x | {same}")
+
+    # topk_metrics 전체 (자동 경로 선택 포함)
+    t_eval = _best_of(lambda: topk_metrics(y_true, y_prob, [5, 10, 15, 30]), args.repeat)
+    print(f"\ntopk_metrics(K = 5/10/15/30): {t_eval * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/load_test_serving.py
+#
+# app.utils.serving 부하 테스트: 동시 단건 요청을 보내고 p50/p99 지연시간과 처리량(RPS)을 측정
+#
+# 실행 (서비스를 먼저 띄운 뒤, 딥러닝/ 폴더에서):
+#   python -m benchmarks.load_test_serving --requests 5000 --concurrency 64
+#   python -m benchmarks.load_test_serving --unix /tmp/churn.sock
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+
+async def _open(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def _request(reader, writer, method: str, path: str, payload: dict | None = None) -> dict:
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1")
+        + body
+    )
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.decode("latin-1").split("\r\n")[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    return json.loads(await reader.readexactly(length))
+
+
+async def _worker(args, X: np.ndarray, counter: list[int], latencies: list[float], errors: list[int]):
+    reader, writer = await _open(args)
+    try:
+        while True:
+            i = counter[0]
+            if i >= args.requests:
+                break
+            counter[0] += 1
+
+            t0 = time.perf_counter()
+            res = await _request(reader, writer, "POST", "/score", {"features": X[i % len(X)].tolist()})
+            latencies.append(time.perf_counter() - t0)
+            if "score" not in res:
+                errors[0] += 1
+    finally:
+        writer.close()
+
+
+async def run(args) -> None:
+    reader, writer = await _open(args)
+    health = await _request(reader, writer, "GET", "/health")
+    writer.close()
+
+    input_dim = health.get("input_dim") or args.input_dim
+    if not input_dim:
+        raise SystemExit("input_dim을 알 수 없습니다 (--input-dim 지정).")
+
+    rng = np.random.default_rng(args.seed)
+    X = rng.normal(size=(1024, input_dim)).astype(np.float32)
+
+    counter, latencies, errors = [0], [], [0]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_worker(args, X, counter, latencies, errors) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    reader, writer = await _open(args)
+    health_after = await _request(reader, writer, "GET", "/health")
+    writer.close()
+
+    lat_ms = np.asarray(latencies) * 1000
+    print(f"model        : {health.get('model_name')} ({health.get('model_type')})")
+    print(f"requests     : {len(lat_ms):,} (errors {errors[0]}) / concurrency {args.concurrency}")
+    print(f"throughput   : {len(lat_ms) / elapsed:,.0f} req/s")
+    print(f"latency p50  : {np.percentile(lat_ms, 50):.2f} ms")
+    print(f"latency p99  : {np.percentile(lat_ms, 99):.2f} ms")
+    print(f"mean batch   : {health_after.get('mean_batch_size', 0):.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test for app.utils.serving")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--input-dim", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
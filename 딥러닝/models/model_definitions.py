@@ -87,3 +87,151 @@ class MLP_enhance(nn.Module):
 
     def forward(self, x):
         return self.net(x)
+
+
+# ========================================================================================
+# [3] 추론 전용 Fused 모델 (FusedMLP) - 서빙용
+# ========================================================================================
+class FusedMLP(nn.Module):
+    """
+    [추론 전용 모델]
+    BasicMLP / MLP_enhance에서 StandardScaler와 BatchNorm을 Linear 가중치에 접어 넣고
+    Dropout을 제거한 동등한(eval 모드 기준) 추론 전용 모델입니다.
+    생성은 app/utils/export.py의 fuse_for_inference()를 사용합니다.
+
+    구조 (Structure):
+        Raw Input -> [Linear -> Act] x (N-1) -> Linear(1)      (scaler 불필요)
+
+    인자 (Args):
+        layer_dims (list[int]): [input_dim, hidden_1, ..., 1]
+        activation (str): 활성화 함수 이름 ('relu', 'leaky_relu', 'elu', 'selu', 'tanh')
+    """
+
+    ACTIVATIONS = {
+        "relu": lambda: nn.ReLU(),
+        "leaky_relu": lambda: nn.LeakyReLU(0.01),
+        "tanh": lambda: nn.Tanh(),
+        "elu": lambda: nn.ELU(),
+        "selu": lambda: nn.SELU(),
+    }
+
+    def __init__(self, layer_dims, activation="relu"):
+        super(FusedMLP, self).__init__()
+        self.layer_dims = list(layer_dims)
+        self.activation_name = activation
+
+        layers = []
+        for i in range(len(self.layer_dims) - 1):
+            layers.append(nn.Linear(self.layer_dims[i], self.layer_dims[i + 1]))
+            if i < len(self.layer_dims) - 2:
+                layers.append(self.ACTIVATIONS.get(activation, self.ACTIVATIONS["relu"])())
+        self.net = nn.Sequential(*layers)
+
+    def forward(self, x):
+        return self.net(x)
+
+
+# ========================================================================================
+# [4] 앙상블 추론 모델 (StackedMLPEnsemble) - MLP_advanced 서빙용
+# ========================================================================================
+class StackedMLPEnsemble(nn.Module):
+    """
+    [앙상블 추론 모델]
+    MLP_advanced의 MLP_enhance 앙상블(N개)을 한 번의 forward로 계산하는 추론 전용 모델입니다.
+    구성원의 가중치를 쌓아(stack) 첫 층은 하나의 큰 행렬곱, 이후 층은 bmm으로 처리하므로
+    구성원마다 Python 루프를 돌며 sigmoid를 더하던 방식보다 커널 호출이 N배 적습니다.
+    BatchNorm은 eval 기준으로 Linear에 접어 넣고 Dropout은 제거합니다.
+    생성은 from_members(ensemble_models)를 사용합니다.
+
+    구조 (Structure):
+        Input -> Linear(N*H) -> Act -> bmm(H/2) -> Act -> bmm(1) -> N개 확률의 평균
+
+    forward()는 평균 확률의 logit을 반환하므로 predict_proba_dl 등 기존 DL 경로에 그대로 쓸 수 있고,
+    predict_proba_stats()는 구성원 확률의 평균과 표준편차를 함께 반환합니다.
+
+    인자 (Args):
+        input_dim (int): 입력 피처의 개수
+        n_members (int): 앙상블 구성원 수 (기본값: 5)
+        hidden_dim (int): 구성원의 첫 번째 은닉층 노드 수 (기본값: 128)
+        activation (str): 활성화 함수 이름 ('relu', 'leaky_relu', 'elu', 'selu', 'tanh')
+    """
+
+    def __init__(self, input_dim, n_members=5, hidden_dim=128, activation="relu"):
+        super(StackedMLPEnsemble, self).__init__()
+        self.n_members = n_members
+        self.hidden_dim = hidden_dim
+        self.activation_name = activation
+        self.activation = FusedMLP.ACTIVATIONS.get(activation, FusedMLP.ACTIVATIONS["relu"])()
+
+        h2 = hidden_dim // 2
+        self.stacked_w1 = nn.Parameter(torch.zeros(n_members, hidden_dim, input_dim))
+        self.stacked_b1 = nn.Parameter(torch.zeros(n_members, hidden_dim))
+        self.stacked_w2 = nn.Parameter(torch.zeros(n_members, h2, hidden_dim))
+        self.stacked_b2 = nn.Parameter(torch.zeros(n_members, h2))
+        self.stacked_w3 = nn.Parameter(torch.zeros(n_members, 1, h2))
+        self.stacked_b3 = nn.Parameter(torch.zeros(n_members, 1))
+
+    @staticmethod
+    def _fold(linear, bn=None):
+        w = linear.weight.detach()
+        b = linear.bias.detach()
+        if bn is not None:
+            scale = bn.weight.detach() / torch.sqrt(bn.running_var + bn.eps)
+            w = w * scale[:, None]
+            b = (b - bn.running_mean) * scale + bn.bias.detach()
+        return w, b
+
+    @classmethod
+    def from_members(cls, members):
+        """학습된 MLP_enhance 리스트 → StackedMLPEnsemble (eval 기준 BN 반영)"""
+        members = list(members)
+        first = members[0]
+        act = type(first.activation).__name__.lower()
+        act = {"leakyrelu": "leaky_relu"}.get(act, act)
+
+        fc1, fc2, fc3 = (first.net[i] for i in (0, 4, 8))
+        ens = cls(fc1.in_features, len(members), fc1.out_features, act)
+        assert fc2.out_features == ens.stacked_w2.shape[1], "MLP_enhance 구조가 아닙니다."
+
+        folded = [
+            (cls._fold(m.net[0], m.net[1]), cls._fold(m.net[4], m.net[5]), cls._fold(m.net[8]))
+            for m in members
+        ]
+        with torch.no_grad():
+            for j, (w_name, b_name) in enumerate(
+                [("stacked_w1", "stacked_b1"), ("stacked_w2", "stacked_b2"), ("stacked_w3", "stacked_b3")]
+            ):
+                getattr(ens, w_name).copy_(torch.stack([f[j][0] for f in folded]))
+                getattr(ens, b_name).copy_(torch.stack([f[j][1] for f in folded]))
+        return ens.to(fc1.weight.device).eval()
+
+    def get_extra_state(self):
+        # state_dict만 저장해도 활성화 함수가 함께 기록되도록
+        return {"activation": self.activation_name}
+
+    def set_extra_state(self, state):
+        self.activation_name = state.get("activation", self.activation_name)
+        self.activation = FusedMLP.ACTIVATIONS.get(self.activation_name, FusedMLP.ACTIVATIONS["relu"])()
+
+    def member_logits(self, x):
+        """구성원별 logit, shape (n_members, batch)"""
+        m, h, d = self.stacked_w1.shape
+        # [1] 첫 층: 입력이 공통이므로 (batch, N*H) 행렬곱 한 번
+        z = torch.addmm(self.stacked_b1.reshape(-1), x, self.stacked_w1.reshape(m * h, d).t())
+        z = self.activation(z.view(-1, m, h).transpose(0, 1))
+        # [2] 두 번째 층 / 출력층: 구성원별 bmm
+        z = self.activation(torch.baddbmm(self.stacked_b2.unsqueeze(1), z, self.stacked_w2.transpose(1, 2)))
+        z = torch.baddbmm(self.stacked_b3.unsqueeze(1), z, self.stacked_w3.transpose(1, 2))
+        return z.squeeze(-1)
+
+    def predict_proba_stats(self, x):
+        """구성원 확률의 (평균, 표준편차), 각각 shape (batch,)"""
+        probs = torch.sigmoid(self.member_logits(x))
+        return probs.mean(dim=0), probs.std(dim=0, unbiased=False)
+
+    def forward(self, x):
+        # logit(평균 확률) = log(mean p) - log(mean(1 - p))를 log-sum-exp로 계산 (1/N은 분자/분모에서 상쇄)
+        # torch.logit(mean)은 float32에서 평균이 0 또는 1로 포화되면 ±inf를 반환합니다.
+        z = self.member_logits(x)
+        logit = torch.logsumexp(F.logsigmoid(z), dim=0) - torch.logsumexp(F.logsigmoid(-z), dim=0)
+        return logit.unsqueeze(-1)
@@ -0,0 +1,199 @@
+# tests/test_artifact_store.py
+#
+# 저장 경로 테스트: ArtifactStore(내용 주소 blob / 포인터 / gc) · _ArtifactWriter(stage → commit, 실패 시 정리) ·
+# dir_lock(오래된 잠금 정리)
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m pytest -q tests
+
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.utils.artifact_store import POINTER_FILE, ArtifactStore, read_pointer, sha256_file
+from app.utils.file_lock import dir_lock
+from app.utils.save import _ArtifactWriter, _json_writer
+
+
+def _tmp_file(directory, data: bytes):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f".incoming.{time.perf_counter_ns()}.tmp"
+    path.write_bytes(data)
+    return path
+
+
+def _is_readonly(path) -> bool:
+    return stat.S_IMODE(os.stat(path).st_mode) & 0o222 == 0
+
+
+# ----------------------------
+# ArtifactStore
+# ----------------------------
+def test_commit_status_and_readonly_blob(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    v1, v2 = tmp_path / "models" / "m" / "v1", tmp_path / "models" / "m" / "v2"
+
+    first = store.commit(_tmp_file(tmp_path, b"weights"), v1 / "model.pt")
+    again = store.commit(_tmp_file(tmp_path, b"weights"), v1 / "model.pt")
+    other = store.commit(_tmp_file(tmp_path, b"weights"), v2 / "model.pt")
+
+    assert [first["status"], again["status"], other["status"]] == ["new", "unchanged", "dedup"]
+    blob = store.object_path(first["sha256"])
+    assert first["sha256"] == sha256_file(blob)
+    assert (v1 / "model.pt").read_bytes() == b"weights"
+    assert _is_readonly(blob)
+    assert read_pointer(v2) == {"model.pt": {"sha256": first["sha256"], "size": 7}}
+    assert len(list(store.iter_objects())) == 1
+    assert not list(tmp_path.glob(".incoming.*"))
+
+
+def test_recommit_replaces_link_and_gc_removes_old_blob(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    models = tmp_path / "models"
+    path = models / "m" / "v1" / "model.pt"
+
+    old = store.commit(_tmp_file(tmp_path, b"old"), path)
+    new = store.commit(_tmp_file(tmp_path, b"new"), path)
+
+    assert new["status"] == "new"
+    assert path.read_bytes() == b"new"
+    assert store.object_path(old["sha256"]).read_bytes() == b"old"  # 이전 blob은 그대로
+
+    dry = store.gc(dry_run=True, roots=[models])
+    assert dry["removed"] == [old["sha256"]] and store.object_path(old["sha256"]).exists()
+    store.gc(roots=[models])
+    assert not store.object_path(old["sha256"]).exists()
+    assert store.object_path(new["sha256"]).exists()
+
+
+def test_resolve_falls_back_to_blob(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    path = tmp_path / "models" / "m" / "v1" / "scaler.pkl"
+    sha = store.commit(_tmp_file(tmp_path, b"scaler"), path)["sha256"]
+
+    assert store.resolve(path) == path
+    path.unlink()
+    assert store.resolve(path) == store.object_path(sha)
+    missing = path.with_name("missing.pkl")
+    assert store.resolve(missing) == missing
+
+
+def _commit_many(args):
+    root, directory, worker, n = args
+    store = ArtifactStore(root)
+    for i in range(n):
+        tmp = directory.parent / f".w{worker}.{i}.tmp"
+        tmp.write_bytes(f"{worker}-{i}".encode())
+        store.commit(tmp, directory / f"w{worker}_{i}.bin")
+
+
+def test_concurrent_processes_keep_every_pointer_entry(tmp_path):
+    directory = tmp_path / "models" / "m" / "v1"
+    directory.mkdir(parents=True)
+    tasks = [(tmp_path / "store", directory, w, 10) for w in range(4)]
+    with ProcessPoolExecutor(max_workers=4) as ex:
+        list(ex.map(_commit_many, tasks))
+
+    pointer = json.loads((directory / POINTER_FILE).read_text(encoding="utf-8"))
+    assert len(pointer) == 40
+    assert all((directory / name).read_bytes() == name[1:-4].replace("_", "-").encode() for name in pointer)
+    assert not (tmp_path / "models" / "m" / "v1.lock").exists()
+
+
+# ----------------------------
+# _ArtifactWriter
+# ----------------------------
+def test_staged_files_appear_only_on_commit(tmp_path):
+    out = tmp_path / "eval"
+    out.mkdir()
+    (out / "pr.json").write_text("old", encoding="utf-8")
+    seen = {}
+
+    writer = _ArtifactWriter(max_workers=2)
+    writer.stage("pr", out / "pr.json", _json_writer({"pr_auc": 0.5}))
+    writer.stage("topk", out / "topk.json", _json_writer({"lift": [2.0]}))
+    writer.write("config", out / "config.json", _json_writer({"lr": 0.001}))
+    writer.results()
+
+    assert (out / "pr.json").read_text(encoding="utf-8") == "old"
+    assert not (out / "topk.json").exists()
+    assert json.loads((out / "config.json").read_text(encoding="utf-8")) == {"lr": 0.001}
+
+    def after():
+        seen["locked"] = (tmp_path / "eval.lock").exists()
+        seen["pr"] = json.loads((out / "pr.json").read_text(encoding="utf-8"))
+
+    writer.commit(out, after=after)
+
+    assert seen == {"locked": True, "pr": {"pr_auc": 0.5}}
+    assert json.loads((out / "topk.json").read_text(encoding="utf-8")) == {"lift": [2.0]}
+    assert not (tmp_path / "eval.lock").exists()
+    assert sorted(p.name for p in out.iterdir()) == ["config.json", "pr.json", "topk.json"]
+    assert set(writer.timings) == {"pr", "topk", "config"}
+
+
+def test_failed_write_removes_staged_temp_files(tmp_path):
+    def broken(path):
+        path.write_text("partial", encoding="utf-8")
+        raise RuntimeError("disk full")
+
+    writer = _ArtifactWriter(max_workers=2)
+    writer.stage("pr", tmp_path / "pr.json", _json_writer({"pr_auc": 0.5}))
+    writer.write("model", tmp_path / "model.pkl", broken)
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        writer.results()
+    assert list(tmp_path.iterdir()) == []
+
+
+# ----------------------------
+# dir_lock
+# ----------------------------
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows에서는 pid 생존 확인을 하지 않음")
+def test_lock_of_dead_process_is_broken_immediately(tmp_path):
+    lock = tmp_path / "eval.lock"
+    lock.write_text(f"{socket.gethostname()}:{_dead_pid()}", encoding="utf-8")
+
+    with dir_lock(tmp_path / "eval", timeout=1.0):
+        assert lock.read_text(encoding="utf-8") == f"{socket.gethostname()}:{os.getpid()}"
+    assert not lock.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_lock_of_live_process_is_kept(tmp_path):
+    lock = tmp_path / "eval.lock"
+    lock.write_text(f"{socket.gethostname()}:{os.getpid()}", encoding="utf-8")
+    os.utime(lock, (time.time() - 3600, time.time() - 3600))
+
+    if os.name != "nt":  # 살아 있는 프로세스의 잠금은 오래돼도 유지
+        with pytest.raises(TimeoutError):
+            with dir_lock(tmp_path / "eval", timeout=0.2, stale_after=60):
+                pass
+    assert lock.exists()
+
+
+def test_unknown_owner_lock_is_broken_after_stale_after(tmp_path):
+    lock = tmp_path / "eval.lock"
+    lock.write_text("other-host:123", encoding="utf-8")
+
+    with pytest.raises(TimeoutError):
+        with dir_lock(tmp_path / "eval", timeout=0.2, stale_after=60):
+            pass
+
+    os.utime(lock, (time.time() - 120, time.time() - 120))
+    with dir_lock(tmp_path / "eval", timeout=1.0, stale_after=60):
+        pass
+    assert list(tmp_path.iterdir()) == []
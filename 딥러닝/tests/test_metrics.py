@@ -0,0 +1,224 @@
+# tests/test_metrics.py
+#
+# 지표 테스트: ScoreHistogram PR-AUC 구간 / bootstrap replicate / segmented_topk_metrics 동점 처리를
+# 샘플 단위로 직접 계산한 기준값(brute force)과 비교
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m pytest -q tests
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import average_precision_score
+
+from app.utils.metrics import (
+    ScoreHistogram,
+    _bootstrap_weights,
+    bootstrap_ci,
+    segmented_topk_metrics,
+    topk_metrics,
+)
+
+K_PCTS = np.array([0.5, 5.0, 10.0, 33.3, 100.0])
+
+
+def _scores(n: int, seed: int, n_levels: int | None = None):
+    # 양성 점수가 약간 높은 이진 라벨 / 점수 (n_levels가 있으면 그 단계로 반올림 → 동점 다수)
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.2).astype(np.int64)
+    s = np.clip(rng.normal(0.35 + 0.3 * y, 0.15), 0, 1)
+    if n_levels:
+        s = np.round(s * n_levels) / n_levels
+    return y, s
+
+
+def _ap_in_order(y_ordered) -> float:
+    # 동점 없이 주어진 순서대로 나열했을 때의 AP
+    y = np.asarray(y_ordered, dtype=float)
+    precision = np.cumsum(y) / np.arange(1, len(y) + 1)
+    return float(np.sum(precision * y) / y.sum())
+
+
+# ----------------------------
+# ScoreHistogram
+# ----------------------------
+@pytest.mark.parametrize("n_bins", [1, 7, 50, 100_000])
+def test_histogram_pr_auc_is_binned_average_precision(n_bins):
+    y, s = _scores(3000, seed=0)
+    hist = ScoreHistogram(n_bins).update(y, s)
+
+    # bin 하나 = 동점 그룹
+    assert hist.pr_auc() == pytest.approx(average_precision_score(y, hist._bin_index(s)), abs=1e-12)
+
+
+@pytest.mark.parametrize("n_bins", [1, 7, 50, 1000])
+def test_histogram_pr_auc_bounds_contain_every_within_bin_order(n_bins):
+    y, s = _scores(2000, seed=1)
+    hist = ScoreHistogram(n_bins).update(y, s)
+    lo, hi = hist.pr_auc_bounds()
+    b = hist._bin_index(s)
+    rng = np.random.default_rng(2)
+
+    candidates = [
+        average_precision_score(y, s),            # 실제 점수 순서
+        _ap_in_order(y[np.lexsort((y, -b))]),     # bin 안에서 음성이 먼저 (최악)
+        _ap_in_order(y[np.lexsort((-y, -b))]),    # bin 안에서 양성이 먼저 (최선)
+        hist.pr_auc(),
+    ]
+    candidates += [_ap_in_order(y[np.lexsort((rng.random(len(y)), -b))]) for _ in range(20)]
+
+    for ap in candidates:
+        assert lo - 1e-12 <= ap <= hi + 1e-12
+
+
+def test_histogram_topk_tp_interval_contains_exact():
+    y, s = _scores(5000, seed=3, n_levels=200)
+    hist = ScoreHistogram(64).update(y, s)
+    approx = hist.topk(K_PCTS)
+    exact = topk_metrics(y, s, K_PCTS)
+
+    np.testing.assert_array_equal(approx["n_selected"], exact["n_selected"])
+    assert np.all(approx["tp_lo"] <= exact["tp"])
+    assert np.all(exact["tp"] <= approx["tp_hi"])
+    assert np.all((approx["tp_lo"] <= approx["tp"]) & (approx["tp"] <= approx["tp_hi"]))
+    # cutoff는 bin 하한 경계 → 정확한 cutoff보다 bin 폭 미만으로 낮음
+    assert np.all((exact["cutoff"] - approx["cutoff"] >= 0) & (exact["cutoff"] - approx["cutoff"] < hist.bin_width))
+
+
+def test_histogram_merge_equals_single_pass():
+    y, s = _scores(3000, seed=4)
+    whole = ScoreHistogram(100).update(y, s)
+    shards = [ScoreHistogram(100).update(y[i::3], s[i::3]) for i in range(3)]
+    merged = shards[0].merge(shards[1]).merge(shards[2])
+
+    np.testing.assert_array_equal(merged.pos, whole.pos)
+    np.testing.assert_array_equal(merged.neg, whole.neg)
+    with pytest.raises(ValueError):
+        merged.merge(ScoreHistogram(50))
+
+
+# ----------------------------
+# bootstrap
+# ----------------------------
+def _resampled_reference(y, s, w, k_pcts) -> dict:
+    # 가중치만큼 샘플을 실제로 복제한 표본에서 지표를 직접 계산
+    order = np.argsort(-s, kind="stable")
+    counts = w[0].astype(np.int64)
+    y_r = np.repeat(y[order], counts)
+    s_r = np.repeat(s[order], counts)
+    sample = np.repeat(np.arange(len(y)), counts)
+
+    out = {"pr_auc": average_precision_score(y_r, s_r), "precision": [], "recall": [], "lift": []}
+    for k in k_pcts:
+        n_sel = max(int(np.floor(len(y_r) * k / 100 + 1e-9)), 1)
+        # 경계 샘플의 복제본은 모두 함께 선택 (한 샘플을 나눠서 뽑지 않음)
+        end = np.flatnonzero(sample == sample[n_sel - 1])[-1] + 1
+        precision = y_r[:end].mean()
+        out["precision"].append(precision)
+        out["recall"].append(y_r[:end].sum() / y_r.sum())
+        out["lift"].append(precision / y_r.mean())
+    return out
+
+
+@pytest.mark.parametrize("method", ["poisson", "multinomial"])
+def test_bootstrap_replicate_matches_resampled_metrics(method):
+    y, s = _scores(400, seed=5, n_levels=40)
+    k = np.array([5.0, 10.0, 30.0])
+
+    for seed in range(8):
+        # n_boot=1 → CI 양 끝이 replicate 값 자체
+        ci = bootstrap_ci(y, s, k, n_boot=1, method=method, n_jobs=1, seed=seed)
+        rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+        ref = _resampled_reference(y, s, _bootstrap_weights(rng, method, 1, len(y)), k)
+
+        np.testing.assert_allclose(ci["pr_auc_ci"], ref["pr_auc"], rtol=1e-6)
+        np.testing.assert_allclose(ci["precision_at_k_ci"][:, 0], ref["precision"], rtol=1e-6)
+        np.testing.assert_allclose(ci["recall_at_k_ci"][:, 0], ref["recall"], rtol=1e-6)
+        np.testing.assert_allclose(ci["lift_at_k_ci"][:, 0], ref["lift"], rtol=1e-6)
+
+
+def test_bootstrap_weights_distribution():
+    rng = np.random.default_rng(0)
+    n = 500
+    multi = _bootstrap_weights(rng, "multinomial", 20, n)
+    np.testing.assert_array_equal(multi.sum(axis=1), n)
+
+    poisson = _bootstrap_weights(rng, "poisson", 200, n)
+    assert poisson.mean() == pytest.approx(1.0, abs=0.01)
+    assert poisson.var() == pytest.approx(1.0, abs=0.02)
+
+
+def test_bootstrap_ci_is_reproducible_and_covers_point_estimate():
+    y, s = _scores(1500, seed=6)
+    a = bootstrap_ci(y, s, n_boot=200, n_jobs=2, seed=7)
+    b = bootstrap_ci(y, s, n_boot=200, n_jobs=2, seed=7)
+
+    np.testing.assert_array_equal(a["pr_auc_ci"], b["pr_auc_ci"])
+    lo, hi = a["pr_auc_ci"]
+    assert lo <= average_precision_score(y, s) <= hi
+    with pytest.raises(ValueError):
+        bootstrap_ci(y, s, method="bayesian")
+
+
+# ----------------------------
+# segmented_topk_metrics
+# ----------------------------
+def _segment_reference(y, s, keys: list[tuple], k_pcts) -> pd.DataFrame:
+    # 세그먼트마다 부분 배열을 잘라 topk_metrics (입력 순서 유지 → 동점은 앞선 샘플부터)
+    rows = []
+    overall = y.mean()
+    for key in sorted(set(keys)):
+        m = np.array([kk == key for kk in keys])
+        r = topk_metrics(y[m], s[m], k_pcts)
+        for j, k in enumerate(r["k_pct"]):
+            rows.append({
+                "key": key,
+                "k_pct": k,
+                "n_total": r["n_total"],
+                "n_positive": r["n_positive"],
+                "n_selected": r["n_selected"][j],
+                "precision": r["precision"][j],
+                "recall": r["recall"][j],
+                "lift": r["lift"][j],
+                "lift_vs_overall": r["precision"][j] / overall,
+                "cutoff": r["cutoff"][j],
+            })
+    return pd.DataFrame(rows)
+
+
+def _assert_matches_reference(out: pd.DataFrame, ref: pd.DataFrame) -> None:
+    for col in ["k_pct", "n_total", "n_positive", "n_selected"]:
+        np.testing.assert_array_equal(out[col].to_numpy(), ref[col].to_numpy(), err_msg=col)
+    for col in ["precision", "recall", "lift", "lift_vs_overall", "cutoff"]:
+        np.testing.assert_allclose(out[col].to_numpy(), ref[col].to_numpy(), rtol=1e-12, err_msg=col)
+
+
+def test_segmented_topk_ties_match_per_segment_topk():
+    # 5단계 점수 → 거의 모든 경계가 동점 / 크기 1, 2인 세그먼트와 양성이 없는 세그먼트 포함
+    y, s = _scores(3000, seed=8, n_levels=5)
+    rng = np.random.default_rng(9)
+    seg = rng.choice(["a", "b", "c", "d"], size=len(y))
+    seg[17] = "single"
+    seg[[5, 900]] = "pair"
+    y[seg == "d"] = 0
+
+    out = segmented_topk_metrics(y, s, pd.Series(seg, name="device"), K_PCTS)
+    ref = _segment_reference(y, s, [(v,) for v in seg], K_PCTS)
+
+    assert out["device"].tolist() == [key[0] for key in ref["key"]]
+    _assert_matches_reference(out, ref)
+
+
+def test_segmented_topk_multi_column_segments():
+    y, s = _scores(2000, seed=10, n_levels=20)
+    rng = np.random.default_rng(11)
+    frame = pd.DataFrame({
+        "signup_month": rng.choice(["2024-01", "2024-02", "2024-03"], size=len(y)),
+        "device": rng.choice(["android", "ios"], size=len(y)),
+    })
+
+    out = segmented_topk_metrics(y, s, frame, K_PCTS)
+    ref = _segment_reference(y, s, list(frame.itertuples(index=False, name=None)), K_PCTS)
+
+    assert list(out[["signup_month", "device"]].itertuples(index=False, name=None)) == list(ref["key"])
+    _assert_matches_reference(out, ref)
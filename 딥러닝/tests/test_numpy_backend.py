@@ -0,0 +1,111 @@
+# tests/test_numpy_backend.py
+#
+# NumPy 백엔드 동등성 테스트: 임의 가중치 / BatchNorm 통계 / scaler로 torch 원본과 NumpyMLP(fused) 확률 비교
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m pytest -q tests
+
+import numpy as np
+import pytest
+import torch
+from sklearn.preprocessing import StandardScaler
+
+from app.utils.export import check_numpy_equivalence, fuse_for_inference, numpy_model_from_fused, save_numpy_model
+from app.utils.inference import NumpyMLP
+from app.utils.paths import PATHS
+from models.model_definitions import BasicMLP, MLP_enhance, StackedMLPEnsemble
+
+
+def _randomize(model: torch.nn.Module, seed: int) -> torch.nn.Module:
+    # 가중치와 BatchNorm running 통계를 모두 임의 값으로 (기본 초기값이면 BN 접기가 항등에 가까움)
+    g = torch.Generator().manual_seed(seed)
+    with torch.no_grad():
+        for m in model.modules():
+            if isinstance(m, torch.nn.Linear):
+                m.weight.copy_(torch.randn(m.weight.shape, generator=g) * 0.3)
+                m.bias.copy_(torch.randn(m.bias.shape, generator=g) * 0.1)
+            elif isinstance(m, torch.nn.BatchNorm1d):
+                m.weight.copy_(torch.rand(m.num_features, generator=g) + 0.5)
+                m.bias.copy_(torch.randn(m.num_features, generator=g) * 0.1)
+                m.running_mean.copy_(torch.randn(m.num_features, generator=g) * 0.5)
+                m.running_var.copy_(torch.rand(m.num_features, generator=g) + 0.5)
+    return model.eval()
+
+
+def _data(input_dim: int, n: int = 2048, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = (rng.normal(size=(n, input_dim)) * rng.uniform(0.5, 5, size=input_dim) + rng.normal(size=input_dim) * 3)
+    X = X.astype(np.float32)
+    return X, StandardScaler().fit(X)
+
+
+def _torch_proba(model, scaler, X) -> np.ndarray:
+    with torch.no_grad():
+        z = model(torch.as_tensor(scaler.transform(X), dtype=torch.float32)).view(-1)
+    return torch.sigmoid(z.double()).numpy()
+
+
+@pytest.mark.parametrize("activation", ["relu", "leaky_relu", "tanh", "elu", "selu"])
+def test_mlp_enhance_numpy_matches_torch(activation):
+    input_dim = 17
+    X, scaler = _data(input_dim, seed=1)
+    model = _randomize(MLP_enhance(input_dim, 64, activation=activation), seed=2)
+
+    np_model = numpy_model_from_fused(fuse_for_inference(model, scaler))
+
+    np.testing.assert_allclose(np_model.predict_proba(X), _torch_proba(model, scaler, X), rtol=0, atol=1e-5)
+    assert check_numpy_equivalence(model, np_model, scaler, X)["ok"]
+
+
+def test_basic_mlp_numpy_matches_torch_without_scaler():
+    input_dim = 9
+    X, _ = _data(input_dim, seed=3)
+    model = _randomize(BasicMLP(input_dim, 32), seed=4)
+
+    np_model = numpy_model_from_fused(fuse_for_inference(model, None))
+    with torch.no_grad():
+        ref = torch.sigmoid(model(torch.as_tensor(X)).view(-1).double()).numpy()
+
+    np.testing.assert_allclose(np_model.predict_proba(X), ref, rtol=0, atol=1e-5)
+
+
+def test_numpy_model_roundtrip_npz(tmp_path, monkeypatch):
+    monkeypatch.setitem(PATHS, "models_dl", str(tmp_path))
+    input_dim = 11
+    X, scaler = _data(input_dim, n=256, seed=5)
+    fused = fuse_for_inference(_randomize(MLP_enhance(input_dim, 16), seed=6), scaler)
+
+    path = save_numpy_model(fused, "mlp_test", "baseline")
+
+    np.testing.assert_array_equal(NumpyMLP.load(path).predict_proba(X), numpy_model_from_fused(fused).predict_proba(X))
+
+
+def test_equivalence_check_detects_mismatch():
+    input_dim = 8
+    X, scaler = _data(input_dim, n=512, seed=7)
+    model = _randomize(MLP_enhance(input_dim, 16), seed=8)
+    fused = fuse_for_inference(model, scaler)
+    with torch.no_grad():
+        fused.net[0].bias.add_(0.5)
+
+    assert not check_numpy_equivalence(model, numpy_model_from_fused(fused), scaler, X)["ok"]
+
+
+def test_fuse_rejects_stacked_ensemble():
+    with pytest.raises(ValueError, match="Linear"):
+        fuse_for_inference(StackedMLPEnsemble(8, hidden_dim=16, n_members=3))
+
+
+def test_stacked_ensemble_logit_stays_finite_when_saturated():
+    model = StackedMLPEnsemble(8, n_members=3, hidden_dim=16).eval()
+    g = torch.Generator().manual_seed(9)
+    with torch.no_grad():
+        for t in list(model.parameters()) + list(model.buffers()):
+            t.copy_(torch.randn(t.shape, generator=g) * 3)
+        x = torch.randn(2048, 8, generator=g) * 20
+        mean, _ = model.predict_proba_stats(x)
+        logit = model(x).view(-1)
+
+    assert ((mean == 0) | (mean == 1)).any()  # float32 평균 확률이 포화된 샘플 포함
+    assert torch.isfinite(logit).all()
+    torch.testing.assert_close(torch.sigmoid(logit), mean, rtol=0, atol=1e-6)
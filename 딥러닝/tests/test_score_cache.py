@@ -0,0 +1,104 @@
+# tests/test_score_cache.py
+#
+# ScoreCache 테스트: fingerprint 무효화 / 조회 / 용량 초과 시 LRU 제거를 dict 기반 기준 구현과 비교
+#
+# 실행 (딥러닝/ 폴더에서):
+#   python -m pytest -q tests
+
+import numpy as np
+
+from app.utils.score_cache import ScoreCache, file_fingerprint, hash_rows
+
+
+def test_lookup_after_reload(tmp_path):
+    keys = np.arange(10, dtype=np.uint64) * 7
+    cache = ScoreCache("m", fingerprint="f1", cache_dir=tmp_path)
+    cache.put(keys, keys * 0.1)
+    cache.save()
+
+    cache = ScoreCache("m", fingerprint="f1", cache_dir=tmp_path)
+    hit, values = cache.lookup(np.array([0, 7, 8, 63], dtype=np.uint64))
+
+    assert hit.tolist() == [True, True, False, True]
+    np.testing.assert_array_equal(values[hit], keys[[0, 1, 9]] * 0.1)
+    assert np.isnan(values[2])
+    assert cache.hit_rate == 0.75
+
+
+def test_fingerprint_change_invalidates(tmp_path):
+    cache = ScoreCache("m", fingerprint="f1", cache_dir=tmp_path)
+    cache.put(np.array([1, 2, 3], dtype=np.uint64), np.array([0.1, 0.2, 0.3]))
+    cache.save()
+
+    changed = ScoreCache("m", fingerprint="f2", cache_dir=tmp_path)
+    assert changed.invalidated and len(changed) == 0
+    assert not changed.lookup(np.array([1, 2, 3], dtype=np.uint64))[0].any()
+
+    # 새 fingerprint로 저장하면 이전 fingerprint 쪽에서도 무효
+    changed.put(np.array([4], dtype=np.uint64), np.array([0.4]))
+    changed.save()
+    assert ScoreCache("m", fingerprint="f1", cache_dir=tmp_path).invalidated
+    assert len(ScoreCache("m", fingerprint="f2", cache_dir=tmp_path)) == 1
+
+
+def test_file_fingerprint_tracks_model_and_scaler(tmp_path):
+    model, scaler = tmp_path / "model.pt", tmp_path / "scaler.pkl"
+    model.write_bytes(b"weights-v1")
+    no_scaler = file_fingerprint(model, scaler)
+
+    scaler.write_bytes(b"scaler")
+    v1 = file_fingerprint(model, scaler)
+    model.write_bytes(b"weights-v2")
+    v2 = file_fingerprint(model, scaler)
+    model.write_bytes(b"weights-v1")
+
+    assert len({no_scaler, v1, v2}) == 3
+    assert file_fingerprint(model, scaler) == v1
+
+
+def test_hash_rows_is_row_wise():
+    X = np.random.default_rng(0).normal(size=(50, 6))
+    h = hash_rows(X)
+
+    assert h.dtype == np.uint64 and len(np.unique(h)) == 50
+    np.testing.assert_array_equal(hash_rows(X[::-1]), h[::-1])
+    assert hash_rows(X[3]) == h[3]
+
+
+def test_eviction_matches_lru_reference(tmp_path):
+    # 기준 구현: key → (value, 마지막 사용 실행 번호)
+    rng = np.random.default_rng(0)
+    cap = 50
+    ref: dict[int, tuple[float, int]] = {}
+
+    for run in range(1, 10):
+        cache = ScoreCache("m", fingerprint="f", cache_dir=tmp_path, max_bytes=cap * ScoreCache.ENTRY_BYTES)
+        assert cache.run == run
+
+        query = rng.integers(0, 200, size=40).astype(np.uint64)
+        hit, values = cache.lookup(query)
+        for key, h, v in zip(query.tolist(), hit, values):
+            assert h == (key in ref)
+            if h:
+                assert v == ref[key][0]
+                ref[key] = (ref[key][0], run)
+
+        new_keys = np.unique(rng.integers(0, 200, size=30)).astype(np.uint64)
+        new_values = rng.random(len(new_keys))
+        cache.put(new_keys, new_values)
+        for key, v in zip(new_keys.tolist(), new_values):
+            ref[key] = (v, run)
+        cache.save()
+
+        kept = set(cache.keys.tolist())
+        if len(ref) > cap:
+            # 최근 사용 순으로 cap개 (경계 동점은 어느 쪽이 남아도 됨)
+            dropped = set(ref) - kept
+            assert len(kept) == cap and kept <= set(ref)
+            assert min(ref[key][1] for key in kept) >= max(ref[key][1] for key in dropped)
+            ref = {key: ref[key] for key in kept}
+
+        assert kept == set(ref)
+        assert np.all(np.diff(cache.keys.astype(np.float64)) > 0)
+        for key, v, used in zip(cache.keys.tolist(), cache.values, cache.last_used):
+            assert (v, used) == ref[key]